@@ -7,8 +7,9 @@ tool calls from markdown code blocks.
 import asyncio
 import logging
 from datetime import datetime
-from typing import AsyncIterator, Callable, Optional
+from typing import TYPE_CHECKING, AsyncIterator, Callable, Optional
 
+from blipshell.core.chat_session import ChatSession
 from blipshell.core.config import ConfigManager
 from blipshell.core.tools.base import ToolRegistry
 from blipshell.core.tools.filesystem import (
@@ -17,29 +18,27 @@ from blipshell.core.tools.filesystem import (
     ReadFileTool,
     WriteFileTool,
 )
-from blipshell.core.tools.memory_tools import (
-    GetSessionSummaryTool,
-    ListSessionsTool,
-    SaveCoreMemoryTool,
-    SearchMemoriesTool,
-)
+from blipshell.core.tools.fetch_cache import FetchCache
 from blipshell.core.tools.shell import ShellTool
-from blipshell.core.tools.web import WebFetchTool, WebSearchTool
-from blipshell.llm.client import LLMClient
+from blipshell.core.tools.web import WebFetchTool, WebSearchTool, create_http_client
 from blipshell.llm.endpoints import EndpointManager
 from blipshell.llm.job_queue import LLMJobQueue
-from blipshell.llm.prompts import summarize_session_chunk
+from blipshell.llm.response_cache import ResponseCache
 from blipshell.llm.router import LLMRouter, TaskType
-from blipshell.memory.chroma_store import ChromaStore
-from blipshell.memory.manager import MemoryManager, PoolItem, estimate_tokens
+from blipshell.memory.chroma_store import AsyncChromaStore, ChromaStore
+from blipshell.memory.ingest import IngestQueue
+from blipshell.memory.manager import MemoryManager
 from blipshell.memory.processor import MemoryProcessor
 from blipshell.memory.search import MemorySearch
 from blipshell.memory.sqlite_store import SQLiteStore
+from blipshell.memory.tokens import TokenCounter, set_token_counter
 from blipshell.models.config import BlipShellConfig
-from blipshell.models.session import MessageRole
-from blipshell.models.tools import ToolCall
+from blipshell.models.session import ChatEvent
 from blipshell.session.manager import SessionManager
 
+if TYPE_CHECKING:
+    import httpx
+
 logger = logging.getLogger(__name__)
 
 
@@ -54,7 +53,10 @@ class Agent:
     5. Send to Ollama with native tool calling
     6. Handle tool call loop (max N iterations)
     7. Update session + memory pools
-    8. Background: process memories (summarize, embed, tag, rank)
+    8. Queue messages for durable background memory processing (summarize, embed, tag, rank)
+
+    The agent owns the shared resources; per-conversation state lives in
+    ChatSession objects from create_session().
     """
 
     def __init__(self, config: BlipShellConfig, config_manager: ConfigManager):
@@ -63,21 +65,24 @@ class Agent:
 
         # Infrastructure
         self.sqlite: Optional[SQLiteStore] = None
-        self.chroma: Optional[ChromaStore] = None
+        self.chroma: Optional[AsyncChromaStore] = None
+        self.response_cache: Optional[ResponseCache] = None
         self.endpoint_manager: Optional[EndpointManager] = None
         self.router: Optional[LLMRouter] = None
         self.job_queue: Optional[LLMJobQueue] = None
 
         # Memory
-        self.memory_manager: Optional[MemoryManager] = None
         self.processor: Optional[MemoryProcessor] = None
+        self.ingest: Optional[IngestQueue] = None
         self.search: Optional[MemorySearch] = None
 
-        # Session
-        self.session_manager: Optional[SessionManager] = None
+        # Default session (CLI); other clients use create_session()
+        self.session: Optional[ChatSession] = None
 
         # Tools
         self.tool_registry = ToolRegistry()
+        self.http_client: Optional["httpx.AsyncClient"] = None
+        self.fetch_cache: Optional[FetchCache] = None
 
         self._initialized = False
 
@@ -86,34 +91,102 @@ class Agent:
         if self._initialized:
             return
 
+        # Token counting for context budgets, matched to the chat model's family
+        mem_cfg = self.config.memory
+        token_counter = TokenCounter.for_model(
+            self.config.models.reasoning,
+            encodings=mem_cfg.tokenizer_encodings or None,
+            cache_size=mem_cfg.token_cache_size,
+            load_timeout=mem_cfg.tokenizer_load_timeout,
+            cache_dir=mem_cfg.tokenizer_cache_dir,
+        )
+        await asyncio.to_thread(token_counter.load)
+        set_token_counter(token_counter)
+
         # Database
-        self.sqlite = SQLiteStore(self.config.database.path)
+        db_cfg = self.config.database
+        self.sqlite = SQLiteStore(
+            db_cfg.path,
+            read_pool_size=db_cfg.read_pool_size,
+            acquire_timeout=db_cfg.acquire_timeout,
+            mmap_size=db_cfg.mmap_size,
+            cache_size_kb=db_cfg.cache_size_kb,
+        )
         await self.sqlite.initialize()
 
-        # ChromaDB
-        self.chroma = ChromaStore(
-            persist_dir=self.config.database.chroma_path,
+        # ChromaDB (blocking client, driven through a bounded thread pool)
+        chroma_store = ChromaStore(
+            persist_dir=db_cfg.chroma_path,
             embedding_model=self.config.models.embedding,
             ollama_url=self.config.endpoints[0].url if self.config.endpoints else "http://localhost:11434",
+            cache_path=db_cfg.embedding_cache_path,
+            cache_max_entries=db_cfg.embedding_cache_max_entries,
+            embed_batch_size=db_cfg.embed_batch_size,
+            host=db_cfg.chroma_host,
+            port=db_cfg.chroma_port,
+        )
+        await asyncio.to_thread(chroma_store.initialize)
+        self.chroma = AsyncChromaStore(
+            chroma_store,
+            query_workers=db_cfg.chroma_query_workers,
+            write_workers=db_cfg.chroma_write_workers,
         )
-        self.chroma.initialize()
 
-        # Endpoint manager
-        self.endpoint_manager = EndpointManager(self.config.endpoints)
+        # LLM response cache (in-process LRU over a SQLite tier)
+        cache_cfg = self.config.llm_cache
+        self.response_cache = ResponseCache(
+            cache_cfg.path,
+            memory_max_bytes=cache_cfg.memory_max_bytes,
+            disk_max_bytes=cache_cfg.disk_max_bytes,
+        )
+        await asyncio.to_thread(self.response_cache.initialize)
 
-        # Router
-        self.router = LLMRouter(self.config.models, self.endpoint_manager)
+        # Endpoint manager
+        self.endpoint_manager = EndpointManager(
+            self.config.endpoints, self.response_cache,
+            aging_rate=self.config.agent.job_aging_rate,
+        )
 
-        # Job queue
-        self.job_queue = LLMJobQueue()
+        # Job queue: per-role worker pools sized by endpoint max_concurrent
+        self.job_queue = LLMJobQueue(self.endpoint_manager, roles=[
+            TaskType.REASONING,
+            TaskType.TOOL_CALLING,
+            TaskType.CODING,
+            TaskType.SUMMARIZATION,
+            TaskType.RANKING,
+        ], aging_rate=self.config.agent.job_aging_rate)
         self.job_queue.start()
 
-        # Memory manager
-        self.memory_manager = MemoryManager(self.config.memory)
-        self.memory_manager.set_summarize_callback(self._summarize_overflow)
+        # Router (schedules generate() calls through the job queue)
+        self.router = LLMRouter(
+            self.config.models, self.endpoint_manager, self.job_queue,
+            cache_ttls=cache_cfg.ttls,
+        )
 
         # Processor
-        self.processor = MemoryProcessor(self.sqlite, self.chroma, self.router)
+        self.processor = MemoryProcessor(
+            self.sqlite, self.chroma, self.router,
+            max_concurrent_messages=self.config.memory.processing_concurrency,
+            combined_analysis=self.config.memory.combined_analysis,
+        )
+
+        # One-time: vectors embedded before rank/archive state was mirrored
+        # into Chroma metadata would never pass the recall filter
+        if not await self.sqlite.get_meta("chroma_metadata_backfilled"):
+            updated = await self.processor.backfill_chroma_metadata()
+            await self.sqlite.set_meta("chroma_metadata_backfilled", "1")
+            if updated:
+                logger.info("Backfilled Chroma metadata for %d memories", updated)
+
+        # Durable ingest queue drained by background workers
+        self.ingest = IngestQueue(
+            self.sqlite, self.processor,
+            workers=mem_cfg.ingest_workers,
+            batch_size=mem_cfg.ingest_batch_size,
+            max_attempts=mem_cfg.ingest_max_attempts,
+            backoff_base=mem_cfg.ingest_backoff_base,
+        )
+        await self.ingest.start()
 
         # Search
         self.search = MemorySearch(
@@ -122,13 +195,18 @@ class Agent:
             search_limit=self.config.memory.recall_search_limit,
         )
 
-        # Session manager
-        self.session_manager = SessionManager(
-            self.sqlite, self.memory_manager, self.processor, self.router,
-            summary_chunk_size=self.config.session.summary_chunk_size,
+        # Pooled HTTP client and page cache shared by the web tools
+        web_cfg = self.config.tools.web
+        self.http_client = create_http_client(
+            timeout=web_cfg.timeout,
+            max_connections=web_cfg.max_connections,
+            http2=web_cfg.http2,
         )
+        if web_cfg.cache_path:
+            self.fetch_cache = FetchCache(web_cfg.cache_path, web_cfg.cache_max_entries)
+            await asyncio.to_thread(self.fetch_cache.initialize)
 
-        # Register tools
+        # Register shared tools (memory tools are bound per ChatSession)
         self._register_tools()
 
         self._initialized = True
@@ -153,298 +231,101 @@ class Agent:
         self.tool_registry.register(WebFetchTool(
             max_size=cfg.web.max_fetch_size,
             timeout=cfg.web.timeout,
+            client=self.http_client,
+            cache=self.fetch_cache,
         ))
 
-    def _register_memory_tools(self):
-        """Register memory tools (needs session_id, so called after session start)."""
-        session_id = self.session_manager.session_id if self.session_manager else None
+    async def create_session(
+        self,
+        project: Optional[str] = None,
+        resume_session_id: Optional[int] = None,
+    ) -> ChatSession:
+        """Start or resume a conversation with its own session-scoped state.
 
-        self.tool_registry.register(SearchMemoriesTool(self.search, session_id))
-        self.tool_registry.register(SaveCoreMemoryTool(self.processor, session_id))
-        self.tool_registry.register(ListSessionsTool(self.sqlite))
-        self.tool_registry.register(GetSessionSummaryTool(self.sqlite))
+        Each concurrent client (e.g. a websocket) should hold its own
+        ChatSession; they all share this agent's heavy resources.
+        """
+        await self.initialize()
+        chat_session = ChatSession(self)
+        await chat_session.start(project=project, resume_session_id=resume_session_id)
+        return chat_session
 
     async def start_session(
         self,
         project: Optional[str] = None,
         resume_session_id: Optional[int] = None,
     ) -> int:
-        """Start or resume a session."""
-        await self.initialize()
+        """Start or resume the agent's default session (used by the CLI)."""
+        self.session = await self.create_session(project, resume_session_id)
+        return self.session.session_id
 
-        session_id = await self.session_manager.start_session(
-            project=project,
-            resume_session_id=resume_session_id,
-        )
+    @property
+    def session_manager(self) -> Optional[SessionManager]:
+        return self.session.session_manager if self.session else None
 
-        # Register memory tools now that we have session_id
-        self._register_memory_tools()
-
-        # Load core memories into Core pool
-        await self._load_core_memories()
-
-        # Load lessons into Core pool
-        await self._load_lessons()
-
-        # Load recent session summaries into RecentHistory
-        await self._load_recent_sessions()
-
-        return session_id
-
-    async def _load_core_memories(self):
-        """Load active core memories into the Core pool."""
-        core_memories = await self.sqlite.get_active_core_memories()
-        for cm in core_memories:
-            self.memory_manager.add_memory("Core", PoolItem(
-                text=cm.content,
-                session_role="system",
-                priority_score=cm.importance + 1.0,  # boost core memories
-            ))
-        logger.info("Loaded %d core memories", len(core_memories))
-
-    async def _load_lessons(self):
-        """Load lessons into the Core pool."""
-        lessons = await self.sqlite.get_all_lessons()
-        for lesson in lessons:
-            self.memory_manager.add_memory("Core", PoolItem(
-                text=lesson.content,
-                session_role="system2",  # marks as lesson for pool labeling
-                priority_score=lesson.importance,
-            ))
-        logger.info("Loaded %d lessons", len(lessons))
-
-    async def _load_recent_sessions(self):
-        """Load recent session summaries into RecentHistory pool."""
-        sessions = await self.sqlite.list_sessions(limit=3)
-        current_id = self.session_manager.session_id
-        for s in sessions:
-            if s.id == current_id or not s.summary:
-                continue
-            self.memory_manager.add_memory("RecentHistory", PoolItem(
-                text=s.summary,
-                session_role="system",
-                priority_score=2.0,
-                session_id=s.id,
-            ))
+    @property
+    def memory_manager(self) -> Optional[MemoryManager]:
+        return self.session.memory_manager if self.session else None
 
     async def chat(
         self,
         user_message: str,
         on_token: Optional[Callable[[str], None]] = None,
     ) -> str:
-        """Process a user message through the full agent pipeline.
+        """Process a user message in the default session. See ChatSession.chat."""
+        return await self.session.chat(user_message, on_token=on_token)
 
-        Args:
-            user_message: The user's input
-            on_token: Optional callback for streaming tokens
-
-        Returns:
-            The assistant's complete response
-        """
-        # Add user message to session
-        self.session_manager.add_message(MessageRole.USER, user_message)
-
-        # Search relevant memories for recall
-        await self._search_relevant_memories(user_message)
-
-        # Build message list
-        messages = self._build_messages(user_message)
-
-        # Get model and client
-        model = self.router.get_model(TaskType.REASONING)
-        client = self.router.get_client(TaskType.REASONING)
-        if not client:
-            return "Error: No available LLM endpoint."
-
-        # Get tools
-        tools = self.tool_registry.get_all_ollama_tools()
-
-        # Tool call loop
-        max_iterations = self.config.agent.max_tool_iterations
-        full_response = ""
-
-        for iteration in range(max_iterations + 1):
-            endpoint = self.endpoint_manager.get_endpoint_for_role(TaskType.REASONING)
-            if endpoint:
-                endpoint.start_request()
-
-            try:
-                # Non-streaming call with tools to check for tool calls
-                response = await client.chat(
-                    messages=messages,
-                    model=model,
-                    tools=tools,
-                )
-
-                msg = response.get("message", {})
-                content = msg.get("content", "")
-                tool_calls = msg.get("tool_calls", None)
-
-                if tool_calls and iteration < max_iterations:
-                    # Process tool calls
-                    messages.append({"role": "assistant", "content": content, "tool_calls": tool_calls})
-
-                    for tc in tool_calls:
-                        fn = tc.get("function", {})
-                        tool_call = ToolCall(
-                            name=fn.get("name", ""),
-                            arguments=fn.get("arguments", {}),
-                        )
-
-                        if on_token:
-                            on_token(f"\n[Tool: {tool_call.name}]\n")
-
-                        result = await self.tool_registry.execute_tool_call(tool_call)
-                        messages.append(result.to_ollama_message())
-
-                        if on_token:
-                            on_token(f"[Result: {result.result[:200]}]\n\n")
-
-                    continue  # Loop back for LLM to process tool results
-                else:
-                    # No tool calls or max iterations — stream the final response
-                    if self.config.agent.stream and on_token:
-                        # Re-send as streaming for token-by-token output
-                        full_response = await self._stream_response(
-                            client, messages, model, None, on_token
-                        )
-                    else:
-                        full_response = content
-                    break
-
-                if endpoint:
-                    endpoint.record_success(0)
-            except Exception as e:
-                if endpoint:
-                    endpoint.record_failure()
-                logger.error("Chat error: %s", e)
-                full_response = f"Error: {e}"
-                break
-            finally:
-                if endpoint:
-                    endpoint.complete_request()
-
-        # Add assistant response to session
-        self.session_manager.add_message(MessageRole.ASSISTANT, full_response)
-
-        # Background: dump to memory periodically
-        asyncio.create_task(self._background_memory_processing())
-
-        return full_response
-
-    async def _stream_response(
+    def chat_stream(
         self,
-        client: LLMClient,
-        messages: list[dict],
-        model: str,
-        tools: list[dict] | None,
-        on_token: Callable[[str], None],
-    ) -> str:
-        """Stream a response, calling on_token for each chunk."""
-        full = []
-        async for chunk in client.chat_stream(messages=messages, model=model, tools=tools):
-            content = chunk.get("message", {}).get("content", "")
-            if content:
-                full.append(content)
-                on_token(content)
-        return "".join(full)
-
-    async def _search_relevant_memories(self, query: str):
-        """Search for relevant memories and add to Recall pool."""
-        try:
-            results = await self.search.search(
-                query=query,
-                current_session_id=self.session_manager.session_id,
-                n_results=10,
-            )
-            for r in results:
-                self.memory_manager.add_memory("Recall", PoolItem(
-                    text=r.summary,
-                    session_role="system",
-                    priority_score=r.boosted_score,
-                ))
-        except Exception as e:
-            logger.error("Memory search failed: %s", e)
-
-    def _build_messages(self, user_message: str) -> list[dict]:
-        """Build the full message list with memory context.
-
-        Port of OllamaChat.SendMessageToOllama message building.
-        """
-        user_tokens = estimate_tokens(user_message)
-        available = (
-            self.config.memory.total_context_tokens
-            - user_tokens
-            - MemoryManager.OVERHEAD_TOKENS
-        )
-
-        # Gather memory from all pools
-        memory_items = self.memory_manager.gather_memory(token_budget=available)
-
-        # Build memory context string organized by pool
-        context_parts = {}
-        for item in memory_items:
-            pool = item.pool_name
-            if pool not in context_parts:
-                label = {
-                    "Core": "CoreFoundation",
-                    "Lessons": "RelevantLessons",
-                    "Recall": "RelevantMemory",
-                    "RecentHistory": "RecentHistory",
-                    "Buffer": "RecentHistory",
-                    "ActiveSession": "ActiveSession",
-                }.get(pool, pool)
-                context_parts[pool] = (label, [])
-            context_parts[pool][1].append(f"   - {item.text}")
-
-        memory_text = ""
-        for pool_name, (label, items) in context_parts.items():
-            memory_text += f"{label}:\n" + "\n".join(items) + "\n\n"
-
-        # Build messages
-        messages = [
-            {"role": "system", "content": self.config.agent.system_prompt},
-        ]
-
-        if memory_text.strip():
-            messages.append({"role": "system", "content": memory_text})
-
-        # Add conversation history from ActiveSession (last messages)
-        for msg in self.session_manager.get_messages()[-20:]:
-            messages.append(msg.to_ollama_message())
-
-        return messages
-
-    async def _background_memory_processing(self):
-        """Background task to dump and process session memories."""
-        try:
-            if self.session_manager.message_count % 5 == 0:
-                await self.session_manager.dump_to_memory()
-        except Exception as e:
-            logger.error("Background memory processing error: %s", e)
-
-    async def _summarize_overflow(self, text: str) -> str:
-        """Callback for memory manager overflow summarization."""
-        return await self.router.generate(
-            TaskType.SUMMARIZATION,
-            summarize_session_chunk(text),
-        )
+        user_message: str,
+        stream: Optional[bool] = None,
+    ) -> AsyncIterator[ChatEvent]:
+        """Stream events for a message in the default session. See ChatSession.chat_stream."""
+        return self.session.chat_stream(user_message, stream=stream)
 
     async def end_session(self):
-        """End the current session and clean up."""
-        if self.session_manager:
-            await self.session_manager.end_session()
+        """End the default session and shut down shared resources."""
+        if self.session:
+            await self.session.end()
+        await self.close()
+
+    async def close(self):
+        """Stop background workers and close shared resources."""
+        if self.ingest:
+            await self.ingest.stop()
         if self.job_queue:
             await self.job_queue.stop()
-
-    def get_status(self) -> dict:
-        """Get agent status for display."""
+        if self.response_cache:
+            await asyncio.to_thread(self.response_cache.close)
+        if self.http_client:
+            await self.http_client.aclose()
+        if self.fetch_cache:
+            await asyncio.to_thread(self.fetch_cache.close)
+        # Last: the workers stopped above were still using the stores
+        if self.chroma:
+            # Waits for in-flight Chroma calls and closes the embedding cache
+            await asyncio.to_thread(self.chroma.close)
+        if self.sqlite:
+            await self.sqlite.close()
+
+    def get_status(self, chat_session: Optional[ChatSession] = None) -> dict:
+        """Get agent status for display.
+
+        Session fields describe ``chat_session`` (default: the default session).
+        """
+        chat_session = chat_session or self.session
+        session_status = chat_session.get_status() if chat_session else {
+            "session_id": None,
+            "project": None,
+            "message_count": 0,
+            "memory_usage": {},
+            "tools": self.tool_registry.get_tool_names(),
+            "prompt_cache": {},
+        }
         return {
-            "session_id": self.session_manager.session_id if self.session_manager else None,
-            "project": self.session_manager.project if self.session_manager else None,
-            "message_count": self.session_manager.message_count if self.session_manager else 0,
-            "memory_usage": self.memory_manager.get_usage() if self.memory_manager else {},
+            **session_status,
             "endpoints": self.endpoint_manager.get_status() if self.endpoint_manager else [],
-            "tools": self.tool_registry.get_tool_names(),
             "job_queue_pending": self.job_queue.pending_count if self.job_queue else 0,
+            "job_queue": self.job_queue.get_metrics() if self.job_queue else {},
+            "llm_cache": self.response_cache.get_stats() if self.response_cache else {},
         }
@@ -0,0 +1,454 @@
+"""Per-conversation state (session, memory pools, tool bindings).
+
+The Agent owns the heavy shared resources (SQLite pool, Chroma, endpoints,
+job queue, caches); each conversation gets its own ChatSession, so one
+process can serve many concurrent chats without them overwriting each
+other's session ID, memory pools or memory-tool bindings.
+"""
+
+import asyncio
+import logging
+import os
+from typing import TYPE_CHECKING, AsyncIterator, Callable, Optional
+
+from blipshell.core.tools.memory_tools import (
+    GetSessionSummaryTool,
+    ListSessionsTool,
+    SaveCoreMemoryTool,
+    SearchMemoriesTool,
+)
+from blipshell.llm.job_queue import PRIORITY_BACKGROUND, PRIORITY_INTERACTIVE
+from blipshell.llm.prompts import summarize_session_chunk
+from blipshell.llm.router import TaskType
+from blipshell.memory.manager import MemoryManager, PoolItem, estimate_tokens
+from blipshell.models.session import ChatEvent, ChatEventType, MessageRole
+from blipshell.models.tools import ToolCall
+from blipshell.session.manager import SessionManager
+
+if TYPE_CHECKING:
+    from blipshell.core.agent import Agent
+
+logger = logging.getLogger(__name__)
+
+
+# Memory block order: pools that change rarely go in the prompt prefix,
+# per-turn recall goes next to the new user message
+POOL_LABELS = {
+    "Core": "CoreFoundation",
+    "Lessons": "RelevantLessons",
+    "RecentHistory": "RecentHistory",
+    "ActiveSession": "ActiveSession",
+    "Recall": "RelevantMemory",
+    "Buffer": "RecentHistory",
+}
+STABLE_POOLS = ("Core", "Lessons", "RecentHistory", "ActiveSession")
+VOLATILE_POOLS = ("Recall", "Buffer")
+
+
+def _format_memory(by_pool: dict[str, list[PoolItem]], pools: tuple[str, ...]) -> str:
+    """Render the given pools' items as labelled bullet lists."""
+    memory_text = ""
+    for pool in pools:
+        items = by_pool.get(pool)
+        if items:
+            lines = "\n".join(f"   - {item.text}" for item in items)
+            memory_text += f"{POOL_LABELS[pool]}:\n{lines}\n\n"
+    return memory_text
+
+
+def _common_prefix_tokens(previous: list[dict], current: list[dict]) -> int:
+    """Estimated tokens at the start of ``current`` identical to ``previous``."""
+    tokens = 0
+    for old, new in zip(previous, current):
+        if old == new:
+            tokens += estimate_tokens(new.get("content") or "")
+            continue
+        if old.get("role") == new.get("role"):
+            shared = os.path.commonprefix([old.get("content") or "", new.get("content") or ""])
+            tokens += estimate_tokens(shared)
+        break
+    return tokens
+
+
+class ChatSession:
+    """One conversation served by a shared Agent.
+
+    Holds the session-scoped state: the SessionManager, a MemoryManager
+    with its own token pools, and a tool registry whose memory tools are
+    bound to this session's ID. Create one with Agent.create_session().
+    """
+
+    # Conversation turns replayed as messages; the window start advances in
+    # steps so the prompt prefix stays unchanged for several turns
+    HISTORY_WINDOW = 20
+    HISTORY_STEP = 10
+
+    def __init__(self, agent: "Agent"):
+        self.config = agent.config
+        self.sqlite = agent.sqlite
+        self.router = agent.router
+        self.endpoint_manager = agent.endpoint_manager
+        self.processor = agent.processor
+        self.search = agent.search
+
+        self.memory_manager = MemoryManager(self.config.memory)
+        self.memory_manager.set_summarize_callback(self._summarize_overflow)
+        self.session_manager = SessionManager(
+            agent.sqlite, self.memory_manager, agent.processor, agent.router, agent.ingest,
+            summary_chunk_size=self.config.session.summary_chunk_size,
+        )
+        # Shared stateless tools plus this session's memory tools
+        self.tool_registry = agent.tool_registry.copy()
+
+        self._last_prompt: list[dict] = []
+        self._prompt_stats = {
+            "turns": 0,
+            "prompt_tokens": 0,
+            "reused_tokens": 0,
+            "total_prompt_tokens": 0,
+            "total_reused_tokens": 0,
+        }
+
+    @property
+    def session_id(self) -> Optional[int]:
+        return self.session_manager.session_id
+
+    def _register_memory_tools(self):
+        """Register memory tools (needs session_id, so called after session start)."""
+        session_id = self.session_manager.session_id if self.session_manager else None
+
+        self.tool_registry.register(SearchMemoriesTool(self.search, session_id))
+        self.tool_registry.register(SaveCoreMemoryTool(self.processor, session_id))
+        self.tool_registry.register(ListSessionsTool(self.sqlite))
+        self.tool_registry.register(GetSessionSummaryTool(self.sqlite))
+
+    async def start(
+        self,
+        project: Optional[str] = None,
+        resume_session_id: Optional[int] = None,
+    ) -> int:
+        """Start or resume the session and load its memory pools."""
+        session_id = await self.session_manager.start_session(
+            project=project,
+            resume_session_id=resume_session_id,
+        )
+
+        # Register memory tools now that we have session_id
+        self._register_memory_tools()
+
+        # Load core memories into Core pool
+        await self._load_core_memories()
+
+        # Load lessons into Core pool
+        await self._load_lessons()
+
+        # Load recent session summaries into RecentHistory
+        await self._load_recent_sessions()
+
+        return session_id
+
+    async def _load_core_memories(self):
+        """Load active core memories into the Core pool."""
+        core_memories = await self.sqlite.get_active_core_memories()
+        for cm in core_memories:
+            self.memory_manager.add_memory("Core", PoolItem(
+                text=cm.content,
+                session_role="system",
+                priority_score=cm.importance + 1.0,  # boost core memories
+            ))
+        logger.info("Loaded %d core memories", len(core_memories))
+
+    async def _load_lessons(self):
+        """Load lessons into the Core pool."""
+        lessons = await self.sqlite.get_all_lessons()
+        for lesson in lessons:
+            self.memory_manager.add_memory("Core", PoolItem(
+                text=lesson.content,
+                session_role="system2",  # marks as lesson for pool labeling
+                priority_score=lesson.importance,
+            ))
+        logger.info("Loaded %d lessons", len(lessons))
+
+    async def _load_recent_sessions(self):
+        """Load recent session summaries into RecentHistory pool."""
+        sessions = await self.sqlite.list_sessions(limit=3)
+        current_id = self.session_manager.session_id
+        for s in sessions:
+            if s.id == current_id or not s.summary:
+                continue
+            self.memory_manager.add_memory("RecentHistory", PoolItem(
+                text=s.summary,
+                session_role="system",
+                priority_score=2.0,
+                session_id=s.id,
+            ))
+
+    async def chat(
+        self,
+        user_message: str,
+        on_token: Optional[Callable[[str], None]] = None,
+    ) -> str:
+        """Process a user message through the full agent pipeline.
+
+        Args:
+            user_message: The user's input
+            on_token: Optional callback for streaming tokens
+
+        Returns:
+            The assistant's complete response
+        """
+        stream = self.config.agent.stream and on_token is not None
+        full_response = ""
+        async for event in self.chat_stream(user_message, stream=stream):
+            if event.type == ChatEventType.DONE:
+                full_response = event.content
+            elif not on_token:
+                continue
+            elif event.type == ChatEventType.TOKEN:
+                on_token(event.content)
+            elif event.type == ChatEventType.TOOL_START:
+                on_token(f"\n[Tool: {event.tool_name}]\n")
+            elif event.type == ChatEventType.TOOL_RESULT:
+                on_token(f"[Result: {event.content[:200]}]\n\n")
+        return full_response
+
+    async def chat_stream(
+        self,
+        user_message: str,
+        stream: Optional[bool] = None,
+    ) -> AsyncIterator[ChatEvent]:
+        """Process a user message, yielding events as they are produced.
+
+        Yields token, tool_start and tool_result events, then one done event
+        carrying the complete response. Generation only advances as the
+        consumer pulls events; closing the iterator (or cancelling the task
+        consuming it) aborts the generation and keeps the partial reply.
+
+        Args:
+            user_message: The user's input
+            stream: Stream tokens from the model (defaults to agent.stream)
+        """
+        if stream is None:
+            stream = self.config.agent.stream
+
+        # Add user message to session and queue it for memory processing
+        self.session_manager.add_message(MessageRole.USER, user_message)
+        await self.session_manager.dump_to_memory()
+
+        # Search relevant memories for recall
+        await self._search_relevant_memories(user_message)
+
+        # Build message list
+        messages = self._build_messages(user_message)
+
+        model = self.router.get_model(TaskType.REASONING)
+        tools = self.tool_registry.get_all_ollama_tools()
+
+        # Tool call loop: one generation per iteration, streamed when possible
+        max_iterations = self.config.agent.max_tool_iterations
+        full_response = ""
+        parts: list[str] = []
+
+        try:
+            for iteration in range(max_iterations + 1):
+                # Ahead of any background job waiting for the same endpoints
+                endpoint = await self.endpoint_manager.acquire_endpoint_for_role(
+                    TaskType.REASONING, PRIORITY_INTERACTIVE,
+                )
+                if not endpoint:
+                    full_response = "Error: No available LLM endpoint."
+                    break
+
+                try:
+                    # The last iteration offers no tools so the model has to answer
+                    iteration_tools = tools if iteration < max_iterations else None
+                    parts = []
+                    tool_calls = []
+                    if stream:
+                        async for chunk in endpoint.client.chat_stream(
+                            messages=messages, model=model, tools=iteration_tools,
+                        ):
+                            msg = chunk.get("message", {})
+                            if msg.get("content"):
+                                parts.append(msg["content"])
+                                yield ChatEvent(type=ChatEventType.TOKEN, content=msg["content"])
+                            if msg.get("tool_calls"):
+                                tool_calls.extend(msg["tool_calls"])
+                    else:
+                        response = await endpoint.client.chat(
+                            messages=messages,
+                            model=model,
+                            tools=iteration_tools,
+                        )
+                        msg = response.get("message", {})
+                        parts.append(msg.get("content", ""))
+                        tool_calls = msg.get("tool_calls") or []
+                    endpoint.record_success(0)
+                except Exception as e:
+                    endpoint.record_failure()
+                    logger.error("Chat error: %s", e)
+                    full_response = f"Error: {e}"
+                    break
+                finally:
+                    endpoint.complete_request()
+
+                content = "".join(parts)
+                if not tool_calls:
+                    # No tool calls — this generation is the final response
+                    full_response = content
+                    break
+
+                # Process tool calls, then loop back for the LLM to use the results
+                messages.append({"role": "assistant", "content": content, "tool_calls": tool_calls})
+                batch = []
+                for tc in tool_calls:
+                    fn = tc.get("function", {})
+                    tool_call = ToolCall(
+                        name=fn.get("name", ""),
+                        arguments=fn.get("arguments", {}),
+                    )
+                    batch.append(tool_call)
+                    yield ChatEvent(type=ChatEventType.TOOL_START, tool_name=tool_call.name)
+
+                # Independent calls run concurrently; results keep the call order
+                results = await self.tool_registry.execute_tool_calls(batch)
+                for result in results:
+                    messages.append(result.to_ollama_message())
+                    yield ChatEvent(
+                        type=ChatEventType.TOOL_RESULT,
+                        tool_name=result.name,
+                        content=result.result,
+                    )
+        except (GeneratorExit, asyncio.CancelledError):
+            # Aborted by the consumer: keep whatever was generated so far
+            partial = "".join(parts)
+            if partial:
+                self.session_manager.add_message(MessageRole.ASSISTANT, partial)
+            raise
+
+        # Add assistant response to session; the ingest workers process it
+        self.session_manager.add_message(MessageRole.ASSISTANT, full_response)
+        await self.session_manager.dump_to_memory()
+
+        yield ChatEvent(type=ChatEventType.DONE, content=full_response)
+
+    async def _search_relevant_memories(self, query: str):
+        """Search for relevant memories and add to Recall pool."""
+        try:
+            results = await self.search.search(
+                query=query,
+                current_session_id=self.session_manager.session_id,
+                n_results=10,
+            )
+            for r in results:
+                self.memory_manager.add_memory("Recall", PoolItem(
+                    text=r.summary,
+                    session_role="system",
+                    priority_score=r.boosted_score,
+                ))
+        except Exception as e:
+            logger.error("Memory search failed: %s", e)
+
+    def _build_messages(self, user_message: str) -> list[dict]:
+        """Build the full message list with memory context.
+
+        Port of OllamaChat.SendMessageToOllama message building, laid out so
+        consecutive turns share as long a prompt prefix as possible (Ollama
+        only re-evaluates the prompt after the first changed token):
+
+        1. System prompt, then the slow-changing memory in a fixed pool order:
+           core memories, lessons, earlier-session summaries and turns of this
+           session older than the replayed window
+        2. Conversation turns, from a window start that only moves every
+           HISTORY_STEP messages
+        3. This turn's recalled memories, then the new user message
+        """
+        user_tokens = estimate_tokens(user_message)
+        available = (
+            self.config.memory.total_context_tokens
+            - user_tokens
+            - MemoryManager.OVERHEAD_TOKENS
+        )
+
+        # Gather memory from all pools
+        memory_items = self.memory_manager.gather_memory(token_budget=available)
+
+        session_messages = self.session_manager.get_messages()
+        history, current = session_messages[:-1], session_messages[-1:]
+        start = max(0, len(history) - self.HISTORY_WINDOW)
+        start -= start % self.HISTORY_STEP
+        window = history[start:]
+        # Turns sent as messages don't need repeating in the memory block
+        replayed = {f"{m.role.value}: {m.content}" for m in window + current}
+
+        by_pool: dict[str, list[PoolItem]] = {}
+        for item in memory_items:
+            if item.pool_name == "ActiveSession" and item.text in replayed:
+                continue
+            by_pool.setdefault(item.pool_name, []).append(item)
+        if "ActiveSession" in by_pool:
+            by_pool["ActiveSession"].sort(key=lambda item: item.timestamp)
+
+        # Build messages
+        messages = [
+            {"role": "system", "content": self.config.agent.system_prompt},
+        ]
+
+        stable_text = _format_memory(by_pool, STABLE_POOLS)
+        if stable_text:
+            messages.append({"role": "system", "content": stable_text})
+
+        for msg in window:
+            messages.append(msg.to_ollama_message())
+
+        recall_text = _format_memory(by_pool, VOLATILE_POOLS)
+        if recall_text:
+            messages.append({"role": "system", "content": recall_text})
+
+        for msg in current:
+            messages.append(msg.to_ollama_message())
+
+        self._record_prompt(messages)
+        return messages
+
+    def _record_prompt(self, messages: list[dict]):
+        """Track how much of this prompt repeats the previous one's prefix."""
+        prompt_tokens = sum(estimate_tokens(m.get("content") or "") for m in messages)
+        reused = _common_prefix_tokens(self._last_prompt, messages)
+        # Kept by reference: the tool loop appends to it, so at the next turn
+        # it holds the last prompt actually sent
+        self._last_prompt = messages
+
+        stats = self._prompt_stats
+        stats["turns"] += 1
+        stats["prompt_tokens"] = prompt_tokens
+        stats["reused_tokens"] = reused
+        stats["total_prompt_tokens"] += prompt_tokens
+        stats["total_reused_tokens"] += reused
+        logger.debug("Prompt prefix reuse: %d / %d tokens", reused, prompt_tokens)
+
+    async def _summarize_overflow(self, text: str) -> str:
+        """Callback for memory manager overflow summarization."""
+        # Stale overflow summaries are dropped rather than run late
+        return await self.router.generate(
+            TaskType.SUMMARIZATION,
+            summarize_session_chunk(text),
+            priority=PRIORITY_BACKGROUND,
+            expires_in=self.config.agent.overflow_summary_timeout,
+        )
+
+    async def end(self):
+        """End the session: flush its messages to memory and summarize it."""
+        await self.session_manager.end_session()
+
+    def get_status(self) -> dict:
+        """Session-scoped status for display."""
+        return {
+            "session_id": self.session_manager.session_id,
+            "project": self.session_manager.project,
+            "message_count": self.session_manager.message_count,
+            "memory_usage": self.memory_manager.get_usage(),
+            "tools": self.tool_registry.get_tool_names(),
+            "tool_cache": self.tool_registry.get_cache_stats(),
+            "prompt_cache": dict(self._prompt_stats),
+        }
@@ -1,21 +1,44 @@
 """Tool base class and registry for native Ollama tool calling."""
 
+import asyncio
+import json
 import logging
+import os
 import time
 from abc import ABC, abstractmethod
-from typing import Any
+from collections import Counter, OrderedDict
+from typing import Any, Optional
 
 from blipshell.models.tools import ToolCall, ToolDefinition, ToolParameter, ToolResult
 
 logger = logging.getLogger(__name__)
 
 
+class ToolError(Exception):
+    """Raised by a tool to report a failure; the message is shown to the model."""
+
+
 class Tool(ABC):
     """Abstract base class for tools.
 
-    Subclasses define their tool schema and implement execute().
+    Subclasses define their tool schema and implement execute(), raising
+    ToolError (or any exception) when the call fails.
+    Tools that change state outside the conversation set ``side_effects``
+    so they are never run alongside other calls; ``max_concurrency``
+    caps how many calls of one tool run at once.
+
+    Idempotent tools opt into result caching by setting ``cache_ttl``
+    (seconds). ``cache_key_args`` limits which arguments form the cache
+    key (default: all), and cache_dependencies() names files whose
+    modification invalidates a cached result. Only successful results are
+    cached.
     """
 
+    side_effects: bool = False
+    max_concurrency: Optional[int] = None
+    cache_ttl: Optional[float] = None
+    cache_key_args: Optional[tuple[str, ...]] = None
+
     @abstractmethod
     def definition(self) -> ToolDefinition:
         """Return the tool definition for Ollama."""
@@ -23,19 +46,43 @@ class Tool(ABC):
 
     @abstractmethod
     async def execute(self, **kwargs) -> str:
-        """Execute the tool with given arguments. Returns result string."""
+        """Execute the tool with given arguments. Returns result string.
+
+        Raises ToolError on failure.
+        """
         ...
 
     def to_ollama_tool(self) -> dict:
         """Convert to Ollama's native tool format."""
         return self.definition().to_ollama_tool()
 
+    def cache_dependencies(self, **kwargs) -> list[str]:
+        """Paths whose mtime change invalidates a cached result for these args."""
+        return []
+
+
+def _mtime(path: str) -> Optional[int]:
+    try:
+        return os.stat(path).st_mtime_ns
+    except OSError:
+        return None
+
 
 class ToolRegistry:
-    """Registry for dynamic tool registration and execution."""
+    """Registry for dynamic tool registration and execution.
+
+    Results of cacheable tools are kept per registry (i.e. per session) in
+    a small LRU, keyed by tool name and arguments.
+    """
+
+    CACHE_MAX_ENTRIES = 256
 
     def __init__(self):
         self._tools: dict[str, Tool] = {}
+        self._semaphores: dict[str, asyncio.Semaphore] = {}
+        # key -> (result, expires_at, {path: mtime})
+        self._cache: OrderedDict[str, tuple[str, float, dict[str, Optional[int]]]] = OrderedDict()
+        self._cache_stats: Counter[str] = Counter()
 
     def register(self, tool: Tool):
         """Register a tool."""
@@ -43,10 +90,26 @@ class ToolRegistry:
         self._tools[defn.name] = tool
         logger.debug("Registered tool: %s", defn.name)
 
+    def copy(self) -> "ToolRegistry":
+        """New registry sharing this one's tool instances."""
+        registry = ToolRegistry()
+        registry._tools = dict(self._tools)
+        # Per-tool limits apply across every registry sharing the tools
+        registry._semaphores = self._semaphores
+        return registry
+
     def unregister(self, name: str):
         """Unregister a tool by name."""
         self._tools.pop(name, None)
 
+    def get_cache_stats(self) -> dict[str, int]:
+        """Tool result cache hit/miss counts."""
+        return {
+            "hits": self._cache_stats["hits"],
+            "misses": self._cache_stats["misses"],
+            "entries": len(self._cache),
+        }
+
     def get_tool(self, name: str) -> Tool | None:
         """Get a tool by name."""
         return self._tools.get(name)
@@ -59,6 +122,26 @@ class ToolRegistry:
         """Get names of all registered tools."""
         return list(self._tools.keys())
 
+    async def execute_tool_calls(self, tool_calls: list[ToolCall]) -> list[ToolResult]:
+        """Execute a batch of tool calls, concurrently where safe.
+
+        Consecutive calls to side-effect-free tools run together; a call to
+        a tool with side effects waits for everything before it and runs
+        alone. Results are returned in the order of ``tool_calls``.
+        """
+        results: list[ToolResult] = []
+        group: list[ToolCall] = []
+        for tool_call in tool_calls:
+            tool = self._tools.get(tool_call.name)
+            if tool is not None and tool.side_effects:
+                results.extend(await asyncio.gather(*map(self.execute_tool_call, group)))
+                group = []
+                results.append(await self.execute_tool_call(tool_call))
+            else:
+                group.append(tool_call)
+        results.extend(await asyncio.gather(*map(self.execute_tool_call, group)))
+        return results
+
     async def execute_tool_call(self, tool_call: ToolCall) -> ToolResult:
         """Execute a tool call and return the result."""
         tool = self._tools.get(tool_call.name)
@@ -70,6 +153,57 @@ class ToolRegistry:
                 success=False,
             )
 
+        if tool.cache_ttl is None:
+            return await self._execute(tool, tool_call)
+
+        key = self._cache_key(tool, tool_call)
+        cached = self._cache.get(key)
+        if cached is not None:
+            result_str, expires_at, mtimes = cached
+            if expires_at > time.monotonic() and all(
+                _mtime(path) == mtime for path, mtime in mtimes.items()
+            ):
+                self._cache.move_to_end(key)
+                self._cache_stats["hits"] += 1
+                return ToolResult(
+                    tool_call_id=tool_call.id,
+                    name=tool_call.name,
+                    result=result_str,
+                    success=True,
+                    cached=True,
+                )
+            del self._cache[key]
+        self._cache_stats["misses"] += 1
+
+        # Snapshot mtimes before running so a concurrent change invalidates
+        mtimes = {
+            path: _mtime(path)
+            for path in tool.cache_dependencies(**tool_call.arguments)
+        }
+        result = await self._execute(tool, tool_call)
+        if result.success:
+            self._cache[key] = (result.result, time.monotonic() + tool.cache_ttl, mtimes)
+            if len(self._cache) > self.CACHE_MAX_ENTRIES:
+                self._cache.popitem(last=False)
+        return result
+
+    @staticmethod
+    def _cache_key(tool: Tool, tool_call: ToolCall) -> str:
+        args = tool_call.arguments
+        if tool.cache_key_args is not None:
+            args = {k: v for k, v in args.items() if k in tool.cache_key_args}
+        return f"{tool_call.name}:{json.dumps(args, sort_keys=True, default=str)}"
+
+    async def _execute(self, tool: Tool, tool_call: ToolCall) -> ToolResult:
+        if tool.max_concurrency:
+            semaphore = self._semaphores.setdefault(
+                tool_call.name, asyncio.Semaphore(tool.max_concurrency)
+            )
+            async with semaphore:
+                return await self._run(tool, tool_call)
+        return await self._run(tool, tool_call)
+
+    async def _run(self, tool: Tool, tool_call: ToolCall) -> ToolResult:
         start = time.monotonic()
         try:
             result_str = await tool.execute(**tool_call.arguments)
@@ -84,12 +218,17 @@ class ToolRegistry:
             )
         except Exception as e:
             elapsed = (time.monotonic() - start) * 1000
-            logger.error("Tool %s failed: %s", tool_call.name, e)
+            if isinstance(e, ToolError):
+                logger.info("Tool %s failed: %s", tool_call.name, e)
+                message = str(e)
+            else:
+                logger.error("Tool %s failed: %s", tool_call.name, e)
+                message = f"Error executing {tool_call.name}: {e}"
 
             return ToolResult(
                 tool_call_id=tool_call.id,
                 name=tool_call.name,
-                result=f"Error executing {tool_call.name}: {e}",
+                result=message,
                 success=False,
                 execution_time_ms=elapsed,
             )
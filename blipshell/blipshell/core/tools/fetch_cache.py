@@ -0,0 +1,85 @@
+"""Small on-disk cache of fetched pages for conditional requests.
+
+WebFetchTool stores the extracted text of each page with its ETag and
+Last-Modified validators; the next fetch of the URL sends them back and
+reuses the stored text when the server answers 304 Not Modified.
+"""
+
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Optional
+
+SCHEMA_SQL = """
+CREATE TABLE IF NOT EXISTS pages (
+    url TEXT PRIMARY KEY,
+    etag TEXT,
+    last_modified TEXT,
+    text TEXT NOT NULL,
+    fetched_at REAL NOT NULL
+) WITHOUT ROWID;
+
+CREATE INDEX IF NOT EXISTS idx_pages_fetched_at ON pages(fetched_at);
+"""
+
+
+class FetchCache:
+    """SQLite store of page text keyed by URL, evicting the oldest entries.
+
+    Blocking; callers run it in a thread. Safe to call from multiple threads.
+    """
+
+    def __init__(self, path: str, max_entries: int = 500):
+        self.path = path
+        self.max_entries = max_entries
+        self._conn: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+
+    def initialize(self):
+        """Open the cache database and create schema."""
+        Path(self.path).parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode = WAL")
+        self._conn.execute("PRAGMA synchronous = NORMAL")
+        self._conn.executescript(SCHEMA_SQL)
+        self._conn.commit()
+
+    def close(self):
+        """Close the cache database."""
+        if self._conn:
+            self._conn.close()
+            self._conn = None
+
+    def get(self, url: str) -> Optional[dict]:
+        """Stored validators and text for a URL, or None."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT etag, last_modified, text FROM pages WHERE url = ?", (url,)
+            ).fetchone()
+        if row is None:
+            return None
+        return {"etag": row[0], "last_modified": row[1], "text": row[2]}
+
+    def touch(self, url: str):
+        """Mark a cached page as revalidated."""
+        with self._lock:
+            self._conn.execute(
+                "UPDATE pages SET fetched_at = ? WHERE url = ?", (time.time(), url)
+            )
+            self._conn.commit()
+
+    def put(self, url: str, etag: Optional[str], last_modified: Optional[str], text: str):
+        """Store a page, evicting the oldest beyond max_entries."""
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO pages (url, etag, last_modified, text, fetched_at) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (url, etag, last_modified, text, time.time()),
+            )
+            self._conn.execute(
+                "DELETE FROM pages WHERE url IN ("
+                "SELECT url FROM pages ORDER BY fetched_at DESC LIMIT -1 OFFSET ?)",
+                (self.max_entries,),
+            )
+            self._conn.commit()
@@ -3,15 +3,20 @@
 import os
 from pathlib import Path
 
-from blipshell.core.tools.base import Tool
+from blipshell.core.tools.base import Tool, ToolError
 from blipshell.models.tools import ToolDefinition, ToolParameter, ToolParameterType
 
 
 class ReadFileTool(Tool):
+    cache_ttl = 300.0
+
     def __init__(self, max_file_size: int = 1048576, blocked_paths: list[str] | None = None):
         self.max_file_size = max_file_size
         self.blocked_paths = blocked_paths or []
 
+    def cache_dependencies(self, path: str = "", **kwargs) -> list[str]:
+        return [str(Path(path).resolve())]
+
     def definition(self) -> ToolDefinition:
         return ToolDefinition(
             name="read_file",
@@ -27,11 +32,11 @@ class ReadFileTool(Tool):
     async def execute(self, path: str, max_lines: int = 0, **kwargs) -> str:
         resolved = Path(path).resolve()
         if self._is_blocked(str(resolved)):
-            return f"Error: Access to '{path}' is blocked."
+            raise ToolError(f"Error: Access to '{path}' is blocked.")
         if not resolved.is_file():
-            return f"Error: File '{path}' not found."
+            raise ToolError(f"Error: File '{path}' not found.")
         if resolved.stat().st_size > self.max_file_size:
-            return f"Error: File '{path}' exceeds max size ({self.max_file_size} bytes)."
+            raise ToolError(f"Error: File '{path}' exceeds max size ({self.max_file_size} bytes).")
 
         content = resolved.read_text(encoding="utf-8", errors="replace")
         if max_lines > 0:
@@ -44,6 +49,8 @@ class ReadFileTool(Tool):
 
 
 class WriteFileTool(Tool):
+    side_effects = True
+
     def __init__(self, blocked_paths: list[str] | None = None):
         self.blocked_paths = blocked_paths or []
 
@@ -62,7 +69,7 @@ class WriteFileTool(Tool):
     async def execute(self, path: str, content: str, **kwargs) -> str:
         resolved = Path(path).resolve()
         if any(blocked in str(resolved) for blocked in self.blocked_paths):
-            return f"Error: Access to '{path}' is blocked."
+            raise ToolError(f"Error: Access to '{path}' is blocked.")
 
         resolved.parent.mkdir(parents=True, exist_ok=True)
         resolved.write_text(content, encoding="utf-8")
@@ -70,6 +77,8 @@ class WriteFileTool(Tool):
 
 
 class EditFileTool(Tool):
+    side_effects = True
+
     def definition(self) -> ToolDefinition:
         return ToolDefinition(
             name="edit_file",
@@ -87,11 +96,11 @@ class EditFileTool(Tool):
     async def execute(self, path: str, old_text: str, new_text: str, **kwargs) -> str:
         resolved = Path(path).resolve()
         if not resolved.is_file():
-            return f"Error: File '{path}' not found."
+            raise ToolError(f"Error: File '{path}' not found.")
 
         content = resolved.read_text(encoding="utf-8")
         if old_text not in content:
-            return f"Error: Text to replace not found in '{path}'."
+            raise ToolError(f"Error: Text to replace not found in '{path}'.")
 
         new_content = content.replace(old_text, new_text, 1)
         resolved.write_text(new_content, encoding="utf-8")
@@ -99,6 +108,12 @@ class EditFileTool(Tool):
 
 
 class ListDirectoryTool(Tool):
+    cache_ttl = 60.0
+
+    def cache_dependencies(self, path: str = ".", **kwargs) -> list[str]:
+        # A directory's mtime changes when entries are added or removed
+        return [str(Path(path).resolve())]
+
     def definition(self) -> ToolDefinition:
         return ToolDefinition(
             name="list_directory",
@@ -112,7 +127,7 @@ class ListDirectoryTool(Tool):
     async def execute(self, path: str = ".", **kwargs) -> str:
         resolved = Path(path).resolve()
         if not resolved.is_dir():
-            return f"Error: '{path}' is not a directory."
+            raise ToolError(f"Error: '{path}' is not a directory.")
 
         entries = []
         try:
@@ -120,7 +135,7 @@ class ListDirectoryTool(Tool):
                 prefix = "[DIR] " if entry.is_dir() else "      "
                 entries.append(f"{prefix}{entry.name}")
         except PermissionError:
-            return f"Error: Permission denied for '{path}'."
+            raise ToolError(f"Error: Permission denied for '{path}'.")
 
         if not entries:
             return f"Directory '{path}' is empty."
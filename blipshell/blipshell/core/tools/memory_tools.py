@@ -11,6 +11,8 @@ from blipshell.models.tools import ToolDefinition, ToolParameter, ToolParameterT
 
 
 class SearchMemoriesTool(Tool):
+    cache_ttl = 60.0
+
     def __init__(self, search: MemorySearch, current_session_id: int | None = None):
         self.search = search
         self.current_session_id = current_session_id
@@ -52,6 +54,8 @@ class SaveCoreMemoryTool(Tool):
     Replaces the C# FRAMEWORK_MEMORY_ENTRY parsing from SystemFunctionCall.cs.
     """
 
+    side_effects = True
+
     def __init__(self, processor: MemoryProcessor, session_id: int | None = None):
         self.processor = processor
         self.session_id = session_id
@@ -4,11 +4,13 @@ import asyncio
 import shlex
 import sys
 
-from blipshell.core.tools.base import Tool
+from blipshell.core.tools.base import Tool, ToolError
 from blipshell.models.tools import ToolDefinition, ToolParameter, ToolParameterType
 
 
 class ShellTool(Tool):
+    side_effects = True
+
     def __init__(self, timeout: int = 30, allowed_commands: list[str] | None = None):
         self.timeout = timeout
         self.allowed_commands = allowed_commands
@@ -33,7 +35,7 @@ class ShellTool(Tool):
         if self.allowed_commands:
             base_cmd = self._extract_base_command(command)
             if base_cmd not in self.allowed_commands:
-                return (
+                raise ToolError(
                     f"Error: Command '{base_cmd}' is not in the allowed list. "
                     f"Allowed: {', '.join(self.allowed_commands)}"
                 )
@@ -58,7 +60,7 @@ class ShellTool(Tool):
                 )
             except asyncio.TimeoutError:
                 process.kill()
-                return f"Error: Command timed out after {timeout} seconds."
+                raise ToolError(f"Error: Command timed out after {timeout} seconds.")
 
             output = stdout.decode("utf-8", errors="replace").strip()
             errors = stderr.decode("utf-8", errors="replace").strip()
@@ -73,8 +75,10 @@ class ShellTool(Tool):
 
             return "\n".join(result_parts) if result_parts else "(no output)"
 
+        except ToolError:
+            raise
         except Exception as e:
-            return f"Error executing command: {e}"
+            raise ToolError(f"Error executing command: {e}") from e
 
     @staticmethod
     def _extract_base_command(command: str) -> str:
@@ -1,14 +1,24 @@
 """Web tools: search and fetch."""
 
+import asyncio
+import importlib.util
 import logging
+from typing import TYPE_CHECKING, Optional
 
-from blipshell.core.tools.base import Tool
+from blipshell.core.tools.base import Tool, ToolError
+from blipshell.core.tools.fetch_cache import FetchCache
 from blipshell.models.tools import ToolDefinition, ToolParameter, ToolParameterType
 
+if TYPE_CHECKING:
+    import httpx
+
 logger = logging.getLogger(__name__)
 
 
 class WebSearchTool(Tool):
+    max_concurrency = 2
+    cache_ttl = 300.0
+
     def definition(self) -> ToolDefinition:
         return ToolDefinition(
             name="web_search",
@@ -25,24 +35,90 @@ class WebSearchTool(Tool):
         try:
             from duckduckgo_search import DDGS
 
-            results = []
-            with DDGS() as ddgs:
-                for r in ddgs.text(query, max_results=max_results):
-                    results.append(f"**{r['title']}**\n{r['href']}\n{r['body']}\n")
+            def search() -> list[str]:
+                with DDGS() as ddgs:
+                    return [
+                        f"**{r['title']}**\n{r['href']}\n{r['body']}\n"
+                        for r in ddgs.text(query, max_results=max_results)
+                    ]
+
+            # DDGS is blocking; keep it off the event loop so calls overlap
+            results = await asyncio.to_thread(search)
 
             if not results:
                 return f"No results found for: {query}"
             return "\n---\n".join(results)
         except ImportError:
-            return "Error: duckduckgo-search package not installed."
+            raise ToolError("Error: duckduckgo-search package not installed.")
         except Exception as e:
-            return f"Search error: {e}"
+            raise ToolError(f"Search error: {e}") from e
+
+
+def create_http_client(
+    timeout: float = 15,
+    max_connections: int = 10,
+    http2: bool = True,
+) -> "httpx.AsyncClient":
+    """Long-lived pooled client for web tools (HTTP/2 when h2 is installed)."""
+    import httpx
+
+    if http2 and importlib.util.find_spec("h2") is None:
+        logger.info("h2 not installed; web fetches use HTTP/1.1 keep-alive")
+        http2 = False
+
+    return httpx.AsyncClient(
+        follow_redirects=True,
+        timeout=timeout,
+        http2=http2,
+        limits=httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_connections,
+        ),
+        headers={"User-Agent": "BlipShell/0.1"},
+    )
+
+
+def _extract_text(body: str, content_type: str) -> str:
+    if "text/html" not in content_type:
+        return body
+
+    from bs4 import BeautifulSoup
+
+    soup = BeautifulSoup(body, "html.parser")
+
+    # Remove scripts and styles
+    for element in soup(["script", "style", "nav", "footer", "header"]):
+        element.decompose()
+
+    return soup.get_text(separator="\n", strip=True)
 
 
 class WebFetchTool(Tool):
-    def __init__(self, max_size: int = 524288, timeout: int = 15):
+    """Fetch a page through a shared pooled client.
+
+    Without an injected client each call opens and closes its own, so
+    standalone use leaves no connections behind.
+
+    The body is streamed and reading stops at ``max_size`` bytes. With a
+    FetchCache, pages are revalidated with ETag/Last-Modified and reused
+    on 304 Not Modified.
+    """
+
+    max_concurrency = 4
+    cache_ttl = 300.0
+    cache_key_args = ("url",)
+
+    def __init__(
+        self,
+        max_size: int = 524288,
+        timeout: int = 15,
+        client: Optional["httpx.AsyncClient"] = None,
+        cache: Optional[FetchCache] = None,
+    ):
         self.max_size = max_size
         self.timeout = timeout
+        self.client = client
+        self.cache = cache
 
     def definition(self) -> ToolDefinition:
         return ToolDefinition(
@@ -56,35 +132,56 @@ class WebFetchTool(Tool):
 
     async def execute(self, url: str, **kwargs) -> str:
         try:
-            import httpx
-            from bs4 import BeautifulSoup
-
-            async with httpx.AsyncClient(
-                follow_redirects=True,
-                timeout=self.timeout,
-            ) as client:
-                response = await client.get(url)
-                response.raise_for_status()
-
-                content_type = response.headers.get("content-type", "")
-                if "text/html" in content_type:
-                    soup = BeautifulSoup(response.text, "html.parser")
-
-                    # Remove scripts and styles
-                    for element in soup(["script", "style", "nav", "footer", "header"]):
-                        element.decompose()
-
-                    text = soup.get_text(separator="\n", strip=True)
-                else:
-                    text = response.text
-
-                # Truncate if too large
-                if len(text) > self.max_size:
-                    text = text[:self.max_size] + "\n\n[Content truncated]"
-
-                return text
-
+            if self.client is not None:
+                return await self._fetch(self.client, url)
+            # Standalone use: a client for this call only, closed when it ends
+            async with create_http_client(timeout=self.timeout) as client:
+                return await self._fetch(client, url)
         except ImportError:
-            return "Error: httpx and/or beautifulsoup4 packages not installed."
+            raise ToolError("Error: httpx and/or beautifulsoup4 packages not installed.")
         except Exception as e:
-            return f"Fetch error: {e}"
+            raise ToolError(f"Fetch error: {e}") from e
+
+    async def _fetch(self, client: "httpx.AsyncClient", url: str) -> str:
+        cached = await asyncio.to_thread(self.cache.get, url) if self.cache else None
+        headers = {}
+        if cached:
+            if cached["etag"]:
+                headers["If-None-Match"] = cached["etag"]
+            if cached["last_modified"]:
+                headers["If-Modified-Since"] = cached["last_modified"]
+
+        async with client.stream("GET", url, headers=headers) as response:
+            if response.status_code == 304 and cached:
+                await asyncio.to_thread(self.cache.touch, url)
+                return cached["text"]
+            response.raise_for_status()
+
+            # Stop reading once max_size bytes have arrived
+            chunks = []
+            received = 0
+            truncated = False
+            async for chunk in response.aiter_bytes():
+                chunks.append(chunk)
+                received += len(chunk)
+                if received >= self.max_size:
+                    truncated = True
+                    break
+
+            body = b"".join(chunks)[:self.max_size].decode(
+                response.encoding or "utf-8", errors="replace"
+            )
+            content_type = response.headers.get("content-type", "")
+            etag = response.headers.get("etag")
+            last_modified = response.headers.get("last-modified")
+
+        # Parsing large pages is CPU-bound; keep it off the event loop
+        text = await asyncio.to_thread(_extract_text, body, content_type)
+
+        # Truncate if too large
+        if truncated or len(text) > self.max_size:
+            text = text[:self.max_size] + "\n\n[Content truncated]"
+
+        if self.cache and (etag or last_modified):
+            await asyncio.to_thread(self.cache.put, url, etag, last_modified, text)
+        return text
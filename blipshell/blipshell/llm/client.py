@@ -4,24 +4,71 @@ Uses the official `ollama` Python package for native tool calling,
 streaming, and structured responses.
 """
 
+import asyncio
 import logging
-from collections import OrderedDict
-from typing import Any, AsyncIterator, Optional
+from typing import Any, AsyncIterator, Callable, Optional
 
 import ollama
 
+from blipshell.llm.response_cache import ResponseCache, cache_key
+
 logger = logging.getLogger(__name__)
 
-# Simple LRU-style response cache
-_response_cache: OrderedDict[str, str] = OrderedDict()
-_CACHE_MAX_SIZE = 200
+# Memory-only cache for clients created without one
+_default_cache = ResponseCache()
+
+
+class _Flight:
+    """One in-flight generate request shared by identical concurrent calls.
+
+    Counts its waiters; when the last one is cancelled the request itself
+    is cancelled, so abandoned work doesn't keep running on the server.
+    """
+
+    def __init__(self, key: str, task: asyncio.Task):
+        self.key = key
+        self.task = task
+        self.waiters = 0
+        task.add_done_callback(lambda t: self._forget())
+
+    def _forget(self):
+        if _in_flight.get(self.key) is self:
+            del _in_flight[self.key]
+
+    async def wait(self) -> str:
+        self.waiters += 1
+        try:
+            # Shielded so one caller being cancelled doesn't fail the others
+            return await asyncio.shield(self.task)
+        finally:
+            self.waiters -= 1
+            if not self.waiters and not self.task.done():
+                # Stop new callers joining a request that is being cancelled
+                self._forget()
+                self.task.cancel()
+
+
+# Single-flight: identical concurrent generate calls share one request
+_in_flight: dict[str, _Flight] = {}
+
+
+def _noop(succeeded: Optional[bool]):
+    pass
+
+
+def _request_outcome(task: asyncio.Task) -> Optional[bool]:
+    """True/False for a finished request task, None if it was cancelled."""
+    if task.cancelled():
+        return None
+    return task.exception() is None
 
 
 class LLMClient:
     """Async wrapper around ollama.AsyncClient."""
 
-    def __init__(self, host: str = "http://localhost:11434"):
+    def __init__(self, host: str = "http://localhost:11434", cache: Optional[ResponseCache] = None):
         self.host = host
+        self.cache = cache or _default_cache
         self._client = ollama.AsyncClient(host=host)
 
     async def chat(
@@ -79,18 +126,81 @@ class LLMClient:
         model: str,
         system: Optional[str] = None,
         use_cache: bool = True,
+        cache_ttl: Optional[float] = None,
+        on_request_done: Optional[Callable[[Optional[bool]], None]] = None,
         **kwargs,
     ) -> str:
         """Simple generate (non-chat) with optional caching.
 
         Used for utility tasks like summarization, ranking, etc.
+        ``cache_ttl`` is how long a cached response stays valid
+        (None = until evicted). ``on_request_done`` is called exactly once,
+        when the request this call started on the server has finished, with
+        True if it succeeded and False if it failed. A call answered from
+        cache or joining an identical request already in flight starts
+        none, so it is called straight away with None, as it is for a
+        request that was cancelled; only the caller that actually sent a
+        request learns how the server handled it.
         """
-        cache_key = f"{model}:{system or ''}:{prompt}"
+        request_done = on_request_done or _noop
+        if not use_cache:
+            try:
+                result = await self._generate_uncached(prompt, model, system, **kwargs)
+            except asyncio.CancelledError:
+                request_done(None)
+                raise
+            except Exception:
+                request_done(False)
+                raise
+            request_done(True)
+            return result
+
+        # Options such as a structured-output format change the answer
+        key = cache_key(model, system, prompt, kwargs)
+        flight = _in_flight.get(key)
+        if flight is None:
+            try:
+                cached = await self.cache.get(key)
+            except BaseException:
+                request_done(None)
+                raise
+            if cached is not None:
+                request_done(None)
+                return cached
+            flight = _in_flight.get(key)
+        if flight is None:
+            task = asyncio.create_task(
+                self._generate_and_cache(key, cache_ttl, prompt, model, system, **kwargs)
+            )
+            task.add_done_callback(lambda t: request_done(_request_outcome(t)))
+            flight = _in_flight[key] = _Flight(key, task)
+        else:
+            request_done(None)
+        return await flight.wait()
 
-        if use_cache and cache_key in _response_cache:
-            _response_cache.move_to_end(cache_key)
-            return _response_cache[cache_key]
+    async def _generate_and_cache(
+        self,
+        key: str,
+        ttl: Optional[float],
+        prompt: str,
+        model: str,
+        system: Optional[str],
+        **kwargs,
+    ) -> str:
+        result = await self._generate_uncached(prompt, model, system, **kwargs)
+        try:
+            await self.cache.put(key, result, ttl)
+        except Exception as e:
+            logger.warning("Failed to cache response: %s", e)
+        return result
 
+    async def _generate_uncached(
+        self,
+        prompt: str,
+        model: str,
+        system: Optional[str],
+        **kwargs,
+    ) -> str:
         messages = []
         if system:
             messages.append({"role": "system", "content": system})
@@ -104,12 +214,6 @@ class LLMClient:
                 **kwargs,
             )
             result = response.get("message", {}).get("content", "")
-
-            if use_cache:
-                _response_cache[cache_key] = result
-                if len(_response_cache) > _CACHE_MAX_SIZE:
-                    _response_cache.popitem(last=False)
-
             return result.strip()
         except Exception as e:
             logger.error("Generate request failed: %s", e)
@@ -5,12 +5,16 @@ and load balancing by active requests.
 """
 
 import asyncio
+import heapq
+import itertools
 import logging
 import time
 from dataclasses import dataclass, field
-from typing import Optional
+from typing import Callable, Optional
 
 from blipshell.llm.client import LLMClient
+from blipshell.llm.job_queue import PRIORITY_DEFAULT
+from blipshell.llm.response_cache import ResponseCache
 from blipshell.models.config import EndpointConfig
 
 logger = logging.getLogger(__name__)
@@ -31,6 +35,7 @@ class Endpoint:
     last_used: float = field(default_factory=time.time)
     last_response_time: float = 1.0  # seconds
     client: Optional[LLMClient] = field(default=None, repr=False)
+    on_complete: Optional[Callable[[], None]] = field(default=None, repr=False)
 
     @property
     def can_accept_request(self) -> bool:
@@ -42,6 +47,8 @@ class Endpoint:
 
     def complete_request(self):
         self.active_requests = max(0, self.active_requests - 1)
+        if self.on_complete:
+            self.on_complete()
 
     def record_success(self, response_time: float):
         self.failure_count = 0
@@ -62,10 +69,23 @@ class EndpointManager:
     - Config-driven endpoints
     - Role-based selection (reasoning, summarization, etc.)
     - Async health polling
+    - One response cache shared by every endpoint's client
+    - Callers waiting for a busy role are served by priority, so an
+      interactive request takes the next free slot ahead of background work;
+      waiters age like queued jobs, so background work still gets a turn
     """
 
-    def __init__(self, configs: list[EndpointConfig]):
+    def __init__(
+        self,
+        configs: list[EndpointConfig],
+        response_cache: Optional[ResponseCache] = None,
+        aging_rate: float = 1.0,
+    ):
         self._lock = asyncio.Lock()
+        self.aging_rate = aging_rate
+        # Heap of (aged priority, seq, role, future) for callers waiting on a slot
+        self._waiters: list[tuple[float, int, str, asyncio.Future]] = []
+        self._seq = itertools.count()
         self._endpoints: list[Endpoint] = []
         for cfg in configs:
             ep = Endpoint(
@@ -75,7 +95,8 @@ class EndpointManager:
                 priority=cfg.priority,
                 max_concurrent=cfg.max_concurrent,
                 enabled=cfg.enabled,
-                client=LLMClient(host=cfg.url),
+                client=LLMClient(host=cfg.url, cache=response_cache),
+                on_complete=self._dispatch,
             )
             self._endpoints.append(ep)
 
@@ -87,14 +108,14 @@ class EndpointManager:
         2. Enabled and can accept requests
         3. Highest priority value
         4. Fewest active requests (load balancing)
+
+        Other endpoints are used only when no enabled endpoint serves the
+        role at all; when the serving endpoints are just busy this returns
+        None, so a role never spills onto endpoints meant for other work.
         """
         candidates = [
-            ep for ep in self._endpoints
-            if role in ep.roles and ep.can_accept_request
+            ep for ep in self._serving_endpoints(role) if ep.can_accept_request
         ]
-        if not candidates:
-            # Fallback: any enabled endpoint
-            candidates = [ep for ep in self._endpoints if ep.can_accept_request]
         if not candidates:
             return None
 
@@ -103,6 +124,71 @@ class EndpointManager:
             key=lambda e: (-e.priority, e.active_requests),
         )[0]
 
+    def _serving_endpoints(self, role: str) -> list[Endpoint]:
+        """Enabled endpoints for a role, or every enabled endpoint if none list it."""
+        serving = [ep for ep in self._endpoints if ep.enabled and role in ep.roles]
+        return serving or [ep for ep in self._endpoints if ep.enabled]
+
+    def capacity_for_role(self, role: str) -> int:
+        """Total max_concurrent of the enabled endpoints that would serve a role."""
+        return max(1, sum(ep.max_concurrent for ep in self._serving_endpoints(role)))
+
+    async def acquire_endpoint_for_role(
+        self, role: str, priority: int = PRIORITY_DEFAULT,
+    ) -> Optional[Endpoint]:
+        """Wait for a free endpoint for the role and start a request on it.
+
+        Concurrency per role is therefore bounded by the max_concurrent of the
+        endpoints serving it. When every serving endpoint is busy, freed slots
+        go to waiters by ``priority`` (lower first), then in arrival order.
+        Like LLMJobQueue jobs, waiters gain ``aging_rate`` priority points per
+        second spent waiting, so a steady stream of interactive callers can't
+        starve background ones.
+        Returns None only if no endpoint is enabled.
+        The caller must call complete_request() on the returned endpoint.
+        """
+        ep = self.get_endpoint_for_role(role)
+        if ep:
+            ep.start_request()
+            return ep
+        if not any(e.enabled for e in self._endpoints):
+            return None
+
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        sort_key = priority + self.aging_rate * loop.time()
+        heapq.heappush(self._waiters, (sort_key, next(self._seq), role, future))
+        try:
+            return await future
+        except asyncio.CancelledError:
+            # Handed a slot just as we were cancelled: give it back
+            if future.done() and not future.cancelled() and future.result():
+                future.result().complete_request()
+            raise
+
+    def _dispatch(self):
+        """Hand free slots to waiting callers in priority order."""
+        if not self._waiters:
+            return
+        any_enabled = any(ep.enabled for ep in self._endpoints)
+        waiting = []
+        while self._waiters:
+            entry = heapq.heappop(self._waiters)
+            future = entry[3]
+            if future.done():
+                continue
+            if not any_enabled:
+                future.set_result(None)
+                continue
+            ep = self.get_endpoint_for_role(entry[2])
+            if ep:
+                ep.start_request()
+                future.set_result(ep)
+            else:
+                waiting.append(entry)
+        # Popped in order, so the sorted remainder is already a valid heap
+        self._waiters = waiting
+
     def get_client_for_role(self, role: str) -> Optional[LLMClient]:
         """Get the LLMClient for the best endpoint matching a role."""
         ep = self.get_endpoint_for_role(role)
@@ -128,6 +214,8 @@ class EndpointManager:
         for ep in self._endpoints:
             tasks.append(self._check_endpoint(ep))
         await asyncio.gather(*tasks)
+        # Re-enabled endpoints can take waiting requests
+        self._dispatch()
 
     async def _check_endpoint(self, ep: Endpoint):
         """Check a single endpoint's health."""
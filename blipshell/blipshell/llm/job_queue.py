@@ -1,108 +1,225 @@
 """Priority async job queue (port of LLMJobQueue.cs).
 
-Sequential processing with priority buckets.
-Lower priority number = higher priority (processed first).
+One priority queue per endpoint role, each drained by a pool of workers
+sized to the combined max_concurrent of the endpoints serving that role.
+Lower priority number = higher priority (processed first); equal
+priorities run in submission order.
+
+Waiting jobs age: every second in the queue lowers a job's effective
+priority by ``aging_rate``, so background work cannot starve behind a
+steady stream of interactive jobs. Since all jobs age at the same rate,
+the effective order is fixed at enqueue time (priority + aging_rate *
+enqueue time) and a plain heap suffices.
 """
 
 import asyncio
+import itertools
 import logging
+from collections import Counter
 from dataclasses import dataclass, field
-from typing import Any, Callable, Coroutine
+from typing import TYPE_CHECKING, Any, Callable, Coroutine, Optional
+
+if TYPE_CHECKING:
+    from blipshell.llm.endpoints import EndpointManager
 
 logger = logging.getLogger(__name__)
 
+# Priority classes
+PRIORITY_INTERACTIVE = 0
+PRIORITY_DEFAULT = 10
+PRIORITY_BACKGROUND = 50
+
+
+def priority_class(priority: int) -> str:
+    """Name of the metrics bucket a priority falls into."""
+    if priority <= PRIORITY_INTERACTIVE:
+        return "interactive"
+    if priority < PRIORITY_BACKGROUND:
+        return "default"
+    return "background"
+
+
+class JobExpiredError(Exception):
+    """Raised for a job whose deadline passed before a worker picked it up."""
+
 
 @dataclass(order=True)
 class LLMJob:
-    """A queued LLM job with priority ordering."""
-    priority: int
+    """A queued LLM job ordered by aged priority (FIFO within a priority)."""
+    sort_key: float
+    seq: int
+    priority: int = field(compare=False)
     job_fn: Callable[[], Coroutine] = field(compare=False)
     future: asyncio.Future = field(compare=False)
+    deadline: Optional[float] = field(default=None, compare=False)
 
 
 class LLMJobQueue:
     """Priority-based async job queue for LLM operations.
 
     Port of LLMJobQueue.cs:
-    - Priority buckets (lower number = higher priority)
-    - Sequential processing (one job at a time to avoid overwhelming Ollama)
-    - Future-based result waiting
+    - Priority buckets (lower number = higher priority), FIFO tie-breaking
+    - Priority aging so low-priority jobs always make progress
+    - Per-role worker pools sized by endpoint max_concurrent, so every
+      configured GPU is kept busy without overwhelming any one of them
+    - Future-based result waiting; cancelling the future cancels the job,
+      even while it is running
+    - Optional per-job deadlines that expire stale work
     """
 
-    def __init__(self):
-        self._queue: asyncio.PriorityQueue[LLMJob] = asyncio.PriorityQueue()
+    def __init__(
+        self,
+        endpoint_manager: "EndpointManager",
+        roles: list[str],
+        aging_rate: float = 1.0,
+    ):
+        self._endpoint_manager = endpoint_manager
+        self.aging_rate = aging_rate
+        self._roles = list(roles)
+        self._queues: dict[str, asyncio.PriorityQueue[LLMJob]] = {
+            role: asyncio.PriorityQueue() for role in self._roles
+        }
+        self._seq = itertools.count()
+        self._pending: Counter[str] = Counter()
+        self._stats: dict[str, Counter[str]] = {}
         self._running = False
-        self._task: asyncio.Task | None = None
+        self._tasks: list[asyncio.Task] = []
 
     def start(self):
-        """Start the background queue processor."""
-        if not self._running:
-            self._running = True
-            self._task = asyncio.create_task(self._process_queue())
+        """Start the background worker pools."""
+        if self._running:
+            return
+        self._running = True
+        for role in self._roles:
+            workers = self._endpoint_manager.capacity_for_role(role)
+            for _ in range(workers):
+                self._tasks.append(asyncio.create_task(self._worker(role)))
 
     async def stop(self):
-        """Stop the queue processor."""
+        """Stop all workers and cancel jobs still waiting in the queues."""
         self._running = False
-        if self._task:
-            self._task.cancel()
-            try:
-                await self._task
-            except asyncio.CancelledError:
-                pass
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        for queue in self._queues.values():
+            while not queue.empty():
+                job = queue.get_nowait()
+                self._pending[priority_class(job.priority)] -= 1
+                job.future.cancel()
+                self._record(job, "cancelled")
+
+    def _put(
+        self,
+        role: str,
+        job_fn: Callable[[], Coroutine],
+        priority: int,
+        expires_in: Optional[float],
+    ) -> asyncio.Future:
+        if role not in self._queues:
+            raise ValueError(f"Unknown job role: {role}")
+        loop = asyncio.get_running_loop()
+        now = loop.time()
+        job = LLMJob(
+            sort_key=priority + self.aging_rate * now,
+            seq=next(self._seq),
+            priority=priority,
+            job_fn=job_fn,
+            future=loop.create_future(),
+            deadline=now + expires_in if expires_in is not None else None,
+        )
+        self._queues[role].put_nowait(job)
+        self._pending[priority_class(priority)] += 1
+        return job.future
 
     async def enqueue_and_wait(
         self,
         job_fn: Callable[[], Coroutine],
-        priority: int = 10,
+        priority: int = PRIORITY_DEFAULT,
+        role: str = "reasoning",
+        expires_in: Optional[float] = None,
     ) -> Any:
         """Enqueue a job and wait for its result.
 
         Args:
             job_fn: Async callable that returns the result
             priority: Lower = higher priority (processed first)
+            role: Endpoint role whose worker pool runs the job
+            expires_in: Seconds the job may wait before it is dropped with
+                JobExpiredError instead of being run
 
         Returns:
             The result from job_fn
         """
-        loop = asyncio.get_running_loop()
-        future = loop.create_future()
-
-        job = LLMJob(priority=priority, job_fn=job_fn, future=future)
-        await self._queue.put(job)
-
-        return await future
+        return await self._put(role, job_fn, priority, expires_in)
 
     def enqueue_fire_and_forget(
         self,
         job_fn: Callable[[], Coroutine],
-        priority: int = 50,
-    ):
-        """Enqueue a job without waiting for the result."""
-        loop = asyncio.get_running_loop()
-        future = loop.create_future()
+        priority: int = PRIORITY_BACKGROUND,
+        role: str = "reasoning",
+        expires_in: Optional[float] = None,
+    ) -> asyncio.Future:
+        """Enqueue a job without waiting for the result.
+
+        Returns the job's future; cancel it to drop or abort the job.
+        """
+        future = self._put(role, job_fn, priority, expires_in)
+        # Nobody awaits this future; consume its exception so asyncio doesn't warn
+        future.add_done_callback(lambda f: f.cancelled() or f.exception())
+        return future
 
-        job = LLMJob(priority=priority, job_fn=job_fn, future=future)
-        self._queue.put_nowait(job)
+    def _record(self, job: LLMJob, outcome: str):
+        self._stats.setdefault(priority_class(job.priority), Counter())[outcome] += 1
 
-    async def _process_queue(self):
-        """Process jobs sequentially by priority."""
+    async def _worker(self, role: str):
+        """Process jobs for one role by priority."""
+        queue = self._queues[role]
         while self._running:
             try:
-                job = await asyncio.wait_for(self._queue.get(), timeout=1.0)
-            except asyncio.TimeoutError:
-                continue
+                job = await queue.get()
             except asyncio.CancelledError:
                 break
+            self._pending[priority_class(job.priority)] -= 1
+
+            if job.future.done():
+                self._record(job, "cancelled")
+                continue
+            if job.deadline is not None and asyncio.get_running_loop().time() > job.deadline:
+                job.future.set_exception(JobExpiredError("Job expired before it could run"))
+                self._record(job, "expired")
+                continue
 
+            # Run as a task so cancelling the job's future aborts it mid-flight
+            task = asyncio.create_task(job.job_fn())
+            job.future.add_done_callback(lambda f, t=task: f.cancelled() and t.cancel())
             try:
-                result = await job.job_fn()
+                result = await task
                 if not job.future.done():
                     job.future.set_result(result)
+                self._record(job, "completed")
+            except asyncio.CancelledError:
+                if task.cancelled() and job.future.cancelled():
+                    self._record(job, "cancelled")
+                    continue
+                task.cancel()
+                if not job.future.done():
+                    job.future.cancel()
+                raise
             except Exception as e:
-                logger.error("Job queue error: %s", e)
+                logger.error("Job queue error (%s): %s", role, e)
                 if not job.future.done():
                     job.future.set_exception(e)
+                self._record(job, "failed")
 
     @property
     def pending_count(self) -> int:
-        return self._queue.qsize()
+        return sum(q.qsize() for q in self._queues.values())
+
+    def get_metrics(self) -> dict[str, dict[str, int]]:
+        """Queue depth and outcome counts per priority class."""
+        classes = set(self._pending) | set(self._stats)
+        return {
+            name: {"pending": self._pending[name], **self._stats.get(name, {})}
+            for name in sorted(classes)
+        }
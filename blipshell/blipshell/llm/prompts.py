@@ -106,6 +106,28 @@ def ask_importance(text: str) -> str:
     )
 
 
+def analyze_memory(text: str) -> str:
+    """Prompt for summary, rank and importance in one structured (JSON) response."""
+    return (
+        "Analyze the following memory and respond with a JSON object containing:\n"
+        '- "summary": the memory in 1 concise, factual sentence, focused on core details\n'
+        '- "rank": how informative or meaningful it is, an integer from 1 to 5:\n'
+        "  1 - Noise / Fluff: Boilerplate, repetitive, off-topic, or lacking meaningful content.\n"
+        "  2 - Minor: Light emotional context or vague thought, lacks depth or specificity.\n"
+        "  3 - Useful: Contains at least one clear idea, insight, or point worth keeping.\n"
+        "  4 - Important: Clear relevance, meaningful insight, decision, realization, or reflective moment.\n"
+        "  5 - Critical: Core to identity, evolution, or decision-making. Key turning points.\n"
+        '- "importance": a number from 0.0 to 1.0:\n'
+        "  1.0 = Deeply personal, emotionally significant, critical fact, or core belief\n"
+        "  0.7 = Important context or recurring theme\n"
+        "  0.4 = Useful but minor detail\n"
+        "  0.1 = Casual, generic, or low-impact\n"
+        '- "lesson_candidate": a short lesson the assistant should learn from this memory, '
+        "or null if there is none\n\n"
+        f"Memory: {text}"
+    )
+
+
 def extract_lesson(text: str) -> str:
     """Prompt for extracting lessons from a conversation."""
     return (
@@ -0,0 +1,194 @@
+"""Two-tier cache for LLM generate responses.
+
+An in-process LRU sits in front of an optional SQLite tier, so
+deterministic utility prompts (rank, summarize, title) are answered from
+cache across restarts. Both tiers are bounded in bytes and entries carry
+an expiry chosen per task type by the router.
+"""
+
+import asyncio
+import hashlib
+import json
+import logging
+import sqlite3
+import threading
+import time
+from collections import Counter, OrderedDict
+from pathlib import Path
+from typing import Any, Optional
+
+logger = logging.getLogger(__name__)
+
+SCHEMA_SQL = """
+CREATE TABLE IF NOT EXISTS responses (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    expires_at REAL,
+    last_used REAL NOT NULL
+) WITHOUT ROWID;
+
+CREATE INDEX IF NOT EXISTS idx_responses_last_used ON responses(last_used);
+"""
+
+
+def cache_key(model: str, system: Optional[str], prompt: str, options: dict[str, Any]) -> str:
+    """Stable key covering everything that changes a generate response."""
+    payload = json.dumps(
+        [model, system or "", prompt, options], sort_keys=True, default=str,
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class ResponseCache:
+    """In-process LRU over an optional SQLite tier.
+
+    ``put`` takes a TTL in seconds (None = never expires). Entries found
+    only on disk are promoted into memory. Each tier evicts least recently
+    used entries once its total size passes its byte bound.
+    """
+
+    def __init__(
+        self,
+        path: Optional[str] = None,
+        memory_max_bytes: int = 4 * 1024 * 1024,
+        disk_max_bytes: int = 64 * 1024 * 1024,
+    ):
+        self.path = path
+        self.memory_max_bytes = memory_max_bytes
+        self.disk_max_bytes = disk_max_bytes
+        self._memory: OrderedDict[str, tuple[str, Optional[float]]] = OrderedDict()
+        self._memory_bytes = 0
+        self._conn: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+        self._disk_bytes = 0
+        self._stats: Counter[str] = Counter()
+
+    def initialize(self):
+        """Open the disk tier (if configured) and drop expired entries."""
+        if not self.path:
+            return
+        Path(self.path).parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode = WAL")
+        self._conn.execute("PRAGMA synchronous = NORMAL")
+        self._conn.executescript(SCHEMA_SQL)
+        self._conn.execute("DELETE FROM responses WHERE expires_at < ?", (time.time(),))
+        self._conn.commit()
+        self._disk_bytes = self._conn.execute(
+            "SELECT COALESCE(SUM(size), 0) FROM responses"
+        ).fetchone()[0]
+
+    def close(self):
+        """Close the disk tier."""
+        if self._conn:
+            self._conn.close()
+            self._conn = None
+
+    async def get(self, key: str) -> Optional[str]:
+        """Look up a response; returns None on a miss or an expired entry."""
+        entry = self._memory.get(key)
+        if entry is not None:
+            value, expires_at = entry
+            if expires_at is None or expires_at > time.time():
+                self._memory.move_to_end(key)
+                self._stats["hits"] += 1
+                self._stats["memory_hits"] += 1
+                return value
+            self._drop_memory(key)
+
+        if self._conn:
+            row = await asyncio.to_thread(self._disk_get, key)
+            if row is not None:
+                value, expires_at = row
+                self._put_memory(key, value, expires_at)
+                self._stats["hits"] += 1
+                self._stats["disk_hits"] += 1
+                return value
+
+        self._stats["misses"] += 1
+        return None
+
+    async def put(self, key: str, value: str, ttl: Optional[float] = None):
+        """Store a response in both tiers."""
+        expires_at = time.time() + ttl if ttl is not None else None
+        self._put_memory(key, value, expires_at)
+        if self._conn:
+            await asyncio.to_thread(self._disk_put, key, value, expires_at)
+
+    def get_stats(self) -> dict[str, int]:
+        """Hit/miss/eviction counters and current tier sizes."""
+        return {
+            "hits": self._stats["hits"],
+            "memory_hits": self._stats["memory_hits"],
+            "disk_hits": self._stats["disk_hits"],
+            "misses": self._stats["misses"],
+            "evictions": self._stats["evictions"],
+            "memory_entries": len(self._memory),
+            "memory_bytes": self._memory_bytes,
+            "disk_bytes": self._disk_bytes,
+        }
+
+    @staticmethod
+    def _size(key: str, value: str) -> int:
+        return len(key) + len(value.encode("utf-8"))
+
+    def _drop_memory(self, key: str):
+        value, _ = self._memory.pop(key)
+        self._memory_bytes -= self._size(key, value)
+
+    def _put_memory(self, key: str, value: str, expires_at: Optional[float]):
+        if key in self._memory:
+            self._drop_memory(key)
+        size = self._size(key, value)
+        if size > self.memory_max_bytes:
+            return
+        self._memory[key] = (value, expires_at)
+        self._memory_bytes += size
+        while self._memory_bytes > self.memory_max_bytes:
+            self._drop_memory(next(iter(self._memory)))
+            self._stats["evictions"] += 1
+
+    def _disk_get(self, key: str) -> Optional[tuple[str, Optional[float]]]:
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value, expires_at FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            if row[1] is not None and row[1] <= now:
+                self._disk_bytes -= self._conn.execute(
+                    "DELETE FROM responses WHERE key = ? RETURNING size", (key,)
+                ).fetchone()[0]
+                self._conn.commit()
+                return None
+            self._conn.execute("UPDATE responses SET last_used = ? WHERE key = ?", (now, key))
+            self._conn.commit()
+        return row[0], row[1]
+
+    def _disk_put(self, key: str, value: str, expires_at: Optional[float]):
+        size = self._size(key, value)
+        with self._lock:
+            old = self._conn.execute(
+                "SELECT size FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+            self._conn.execute(
+                "INSERT OR REPLACE INTO responses (key, value, size, expires_at, last_used) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (key, value, size, expires_at, time.time()),
+            )
+            self._disk_bytes += size - (old[0] if old else 0)
+
+            if self._disk_bytes > self.disk_max_bytes:
+                # Keep the most recently used entries that fit within the bound
+                freed = self._conn.execute(
+                    "DELETE FROM responses WHERE key IN ("
+                    "SELECT key FROM (SELECT key, SUM(size) OVER "
+                    "(ORDER BY last_used DESC, key) AS running FROM responses) "
+                    "WHERE running > ?) RETURNING size",
+                    (self.disk_max_bytes,),
+                ).fetchall()
+                self._disk_bytes -= sum(s for s, in freed)
+                self._stats["evictions"] += len(freed)
+            self._conn.commit()
@@ -5,10 +5,12 @@ to the appropriate model and endpoint based on configuration.
 """
 
 import logging
+import time
 from typing import Optional
 
 from blipshell.llm.client import LLMClient
 from blipshell.llm.endpoints import EndpointManager
+from blipshell.llm.job_queue import PRIORITY_DEFAULT, LLMJobQueue
 from blipshell.models.config import ModelsConfig
 
 logger = logging.getLogger(__name__)
@@ -29,11 +31,23 @@ class LLMRouter:
 
     Uses config to determine which model handles each task type,
     and EndpointManager to select the best endpoint for the role.
+    When a job queue is attached, generate() requests are scheduled
+    through it so all background LLM work shares one priority order.
+    ``cache_ttls`` sets how long generate() responses are cached per task
+    type: None caches until evicted, 0 disables caching.
     """
 
-    def __init__(self, models_config: ModelsConfig, endpoint_manager: EndpointManager):
+    def __init__(
+        self,
+        models_config: ModelsConfig,
+        endpoint_manager: EndpointManager,
+        job_queue: Optional[LLMJobQueue] = None,
+        cache_ttls: Optional[dict[str, Optional[float]]] = None,
+    ):
         self._models = models_config
         self._endpoint_manager = endpoint_manager
+        self._job_queue = job_queue
+        self._cache_ttls = cache_ttls or {}
 
     def get_model(self, task_type: str) -> str:
         """Get the configured model name for a task type."""
@@ -55,21 +69,63 @@ class LLMRouter:
         """Get both model name and client for a task type."""
         return self.get_model(task_type), self.get_client(task_type)
 
-    async def generate(self, task_type: str, prompt: str, system: Optional[str] = None) -> str:
-        """Route a generate request to the appropriate model/endpoint."""
+    async def generate(
+        self,
+        task_type: str,
+        prompt: str,
+        system: Optional[str] = None,
+        format: Optional[str | dict] = None,
+        priority: int = PRIORITY_DEFAULT,
+        expires_in: Optional[float] = None,
+    ) -> str:
+        """Route a generate request to the appropriate model/endpoint.
+
+        Safe to call concurrently: requests beyond the endpoints' capacity
+        wait for a free slot instead of failing. ``format`` is passed to
+        Ollama for structured output ("json" or a JSON schema). ``priority``
+        orders the request in the job queue (lower runs first); a request
+        still queued after ``expires_in`` seconds fails with JobExpiredError.
+        """
+        if self._job_queue:
+            return await self._job_queue.enqueue_and_wait(
+                lambda: self._generate_now(task_type, prompt, system, format, priority),
+                priority=priority,
+                role=task_type,
+                expires_in=expires_in,
+            )
+        return await self._generate_now(task_type, prompt, system, format, priority)
+
+    async def _generate_now(
+        self,
+        task_type: str,
+        prompt: str,
+        system: Optional[str],
+        format: Optional[str | dict],
+        priority: int,
+    ) -> str:
         model = self.get_model(task_type)
-        client = self.get_client(task_type)
-        if not client:
+        # Waits (by priority) while every endpoint for this role is at max_concurrent
+        endpoint = await self._endpoint_manager.acquire_endpoint_for_role(task_type, priority)
+        if not endpoint:
             raise RuntimeError(f"No available endpoint for task type: {task_type}")
 
-        endpoint = self._endpoint_manager.get_endpoint_for_role(task_type)
-        endpoint.start_request()
-        try:
-            result = await client.generate(prompt=prompt, model=model, system=system)
-            endpoint.record_success(0)
-            return result
-        except Exception:
-            endpoint.record_failure()
-            raise
-        finally:
+        ttl = self._cache_ttls.get(task_type)
+        kwargs = {"format": format} if format else {}
+        started = time.monotonic()
+
+        def request_done(succeeded: Optional[bool]):
+            # Only the call that sent the request reports endpoint health, so
+            # a shared request failing counts once, against the endpoint that
+            # served it. The slot is held until that request ends, not until
+            # this caller stops waiting; a shared request may outlive its caller
+            if succeeded:
+                endpoint.record_success(time.monotonic() - started)
+            elif succeeded is False:
+                endpoint.record_failure()
             endpoint.complete_request()
+
+        return await endpoint.client.generate(
+            prompt=prompt, model=model, system=system,
+            use_cache=ttl != 0, cache_ttl=ttl,
+            on_request_done=request_done, **kwargs
+        )
@@ -4,13 +4,21 @@ Replaces the manual OllamaEmbedder + MemoryBlobs + cosine similarity code from C
 ChromaDB handles embedding generation, HNSW indexing, and similarity search.
 """
 
+import asyncio
+import functools
 import logging
+from concurrent.futures import Executor, ThreadPoolExecutor
+from datetime import timezone
 from pathlib import Path
-from typing import Optional
+from typing import Any, Callable, Optional
 
 import chromadb
+import ollama
 from chromadb.config import Settings
 
+from blipshell.memory.embedding_cache import EmbeddingCache
+from blipshell.models.memory import Memory
+
 logger = logging.getLogger(__name__)
 
 # Collection names
@@ -20,28 +28,56 @@ LESSONS_COLLECTION = "lessons"
 
 
 class ChromaStore:
-    """ChromaDB vector storage for semantic memory search."""
+    """ChromaDB vector storage for semantic memory search.
+
+    Embeddings are computed here (through the embedding cache when one is
+    configured) and passed to ChromaDB explicitly, so repeated texts are
+    never re-embedded by Ollama.
+    """
 
     def __init__(self, persist_dir: str, embedding_model: str = "nomic-embed-text",
-                 ollama_url: str = "http://localhost:11434"):
+                 ollama_url: str = "http://localhost:11434",
+                 cache_path: Optional[str] = None, cache_max_entries: int = 100_000,
+                 embed_batch_size: int = 64,
+                 host: Optional[str] = None, port: int = 8000):
         self.persist_dir = persist_dir
+        self.host = host
+        self.port = port
         self.embedding_model = embedding_model
         self.ollama_url = ollama_url
+        self.embed_batch_size = embed_batch_size
+        self._cache = EmbeddingCache(cache_path, cache_max_entries) if cache_path else None
+        self._embedder: Optional[ollama.Client] = None
         self._client: Optional[chromadb.ClientAPI] = None
         self._memories: Optional[chromadb.Collection] = None
         self._core_memories: Optional[chromadb.Collection] = None
         self._lessons: Optional[chromadb.Collection] = None
 
     def initialize(self):
-        """Initialize ChromaDB client and collections."""
-        Path(self.persist_dir).mkdir(parents=True, exist_ok=True)
+        """Initialize ChromaDB client and collections.
 
-        self._client = chromadb.PersistentClient(
-            path=self.persist_dir,
-            settings=Settings(anonymized_telemetry=False),
-        )
+        Uses a remote Chroma server when ``host`` is set, otherwise an
+        embedded persistent client under ``persist_dir``.
+        """
+        if self.host:
+            self._client = chromadb.HttpClient(
+                host=self.host,
+                port=self.port,
+                settings=Settings(anonymized_telemetry=False),
+            )
+        else:
+            Path(self.persist_dir).mkdir(parents=True, exist_ok=True)
+            self._client = chromadb.PersistentClient(
+                path=self.persist_dir,
+                settings=Settings(anonymized_telemetry=False),
+            )
 
-        # Use Ollama for embedding generation
+        self._embedder = ollama.Client(host=self.ollama_url)
+        if self._cache:
+            self._cache.initialize()
+
+        # Collections keep the Ollama embedding function so their stored config
+        # stays stable; add/search pass precomputed embeddings via _embed()
         embedding_fn = chromadb.utils.embedding_functions.OllamaEmbeddingFunction(
             url=self.ollama_url,
             model_name=self.embedding_model,
@@ -72,22 +108,124 @@ class ChromaStore:
             self._lessons.count(),
         )
 
+    def close(self):
+        """Release the embedding cache."""
+        if self._cache:
+            self._cache.close()
+
+    def _embed(self, texts: list[str]) -> list[list[float]]:
+        """Embed texts, serving repeats from the cache and embedding only misses."""
+        if not self._cache:
+            return self._embed_uncached(texts)
+
+        vectors = self._cache.get_many(self.embedding_model, texts)
+        misses = list(dict.fromkeys(t for t, v in zip(texts, vectors) if v is None))
+        if misses:
+            embedded = self._embed_uncached(misses)
+            self._cache.put_many(self.embedding_model, misses, embedded)
+            fresh = dict(zip(misses, embedded))
+            vectors = [v if v is not None else fresh[t] for t, v in zip(texts, vectors)]
+        return vectors
+
+    def _embed_uncached(self, texts: list[str]) -> list[list[float]]:
+        """Call Ollama's embed endpoint with up to embed_batch_size texts per request."""
+        vectors = []
+        for start in range(0, len(texts), self.embed_batch_size):
+            batch = texts[start:start + self.embed_batch_size]
+            response = self._embedder.embed(model=self.embedding_model, input=batch)
+            vectors.extend(response["embeddings"])
+        return vectors
+
+    def _upsert_many(
+        self,
+        collection: chromadb.Collection,
+        source: str,
+        ids: list[int],
+        texts: list[str],
+        metadatas: Optional[list[dict]] = None,
+    ):
+        """Upsert many documents, embedding them in batched requests."""
+        if not ids:
+            return
+        metas = [dict(m) for m in metadatas] if metadatas else [{} for _ in ids]
+        for meta in metas:
+            meta["source"] = source
+        collection.upsert(
+            ids=[str(i) for i in ids],
+            embeddings=self._embed(texts),
+            documents=texts,
+            metadatas=metas,
+        )
+
+    def add_memories(self, ids: list[int], texts: list[str],
+                     metadatas: Optional[list[dict]] = None):
+        """Add many memory embeddings to ChromaDB."""
+        self._upsert_many(self._memories, "memory", ids, texts, metadatas)
+
+    def add_core_memories(self, ids: list[int], texts: list[str],
+                          metadatas: Optional[list[dict]] = None):
+        """Add many core memory embeddings to ChromaDB."""
+        self._upsert_many(self._core_memories, "core_memory", ids, texts, metadatas)
+
+    def add_lessons(self, ids: list[int], texts: list[str],
+                    metadatas: Optional[list[dict]] = None):
+        """Add many lesson embeddings to ChromaDB."""
+        self._upsert_many(self._lessons, "lesson", ids, texts, metadatas)
+
     def add_memory(self, memory_id: int, text: str, metadata: Optional[dict] = None):
         """Add a memory embedding to ChromaDB."""
         meta = metadata or {}
         meta["source"] = "memory"
         self._memories.upsert(
             ids=[str(memory_id)],
+            embeddings=self._embed([text]),
             documents=[text],
             metadatas=[meta],
         )
 
+    @staticmethod
+    def memory_metadata(memory: Memory) -> dict:
+        """Metadata mirrored from SQLite so searches can filter inside ChromaDB."""
+        # Timestamps are naive UTC (utcnow, or read back from SQLite); an
+        # unqualified .timestamp() would shift them by the host's UTC offset
+        timestamp = memory.timestamp
+        if timestamp.tzinfo is None:
+            timestamp = timestamp.replace(tzinfo=timezone.utc)
+        return {
+            "session_id": str(memory.session_id or 0),
+            "role": memory.role,
+            "rank": memory.rank,
+            "importance": memory.importance,
+            "timestamp": timestamp.timestamp(),
+            "is_archived": memory.is_archived,
+        }
+
+    def update_memories_metadata(self, ids: list[int], metadatas: list[dict]):
+        """Merge fields into existing memories' metadata without re-embedding."""
+        if ids:
+            self._memories.update(ids=[str(i) for i in ids], metadatas=metadatas)
+
+    def memory_ids_missing_metadata(self, page_size: int = 1000) -> list[int]:
+        """IDs of memory vectors written before memory_metadata() was mirrored."""
+        missing = []
+        offset = 0
+        while True:
+            page = self._memories.get(include=["metadatas"], limit=page_size, offset=offset)
+            if not page["ids"]:
+                return missing
+            missing.extend(
+                int(doc_id) for doc_id, meta in zip(page["ids"], page["metadatas"])
+                if not meta or "is_archived" not in meta
+            )
+            offset += len(page["ids"])
+
     def add_core_memory(self, core_memory_id: int, text: str, metadata: Optional[dict] = None):
         """Add a core memory embedding to ChromaDB."""
         meta = metadata or {}
         meta["source"] = "core_memory"
         self._core_memories.upsert(
             ids=[str(core_memory_id)],
+            embeddings=self._embed([text]),
             documents=[text],
             metadatas=[meta],
         )
@@ -98,6 +236,7 @@ class ChromaStore:
         meta["source"] = "lesson"
         self._lessons.upsert(
             ids=[str(lesson_id)],
+            embeddings=self._embed([text]),
             documents=[text],
             metadatas=[meta],
         )
@@ -113,12 +252,14 @@ class ChromaStore:
         Returns list of {id, document, distance, metadata} dicts.
         Distance is cosine distance (lower = more similar).
         Similarity = 1 - distance.
-        """
-        kwargs = {"query_texts": [query], "n_results": n_results}
-        if where:
-            kwargs["where"] = where
 
+        ``where`` is a ChromaDB metadata filter over the fields written by
+        memory_metadata(), e.g. ``{"rank": {"$gte": 3}}``.
+        """
         try:
+            kwargs = {"query_embeddings": self._embed([query]), "n_results": n_results}
+            if where:
+                kwargs["where"] = where
             results = self._memories.query(**kwargs)
         except Exception as e:
             logger.error("ChromaDB memory search failed: %s", e)
@@ -130,7 +271,7 @@ class ChromaStore:
         """Search core memories by semantic similarity."""
         try:
             results = self._core_memories.query(
-                query_texts=[query], n_results=n_results
+                query_embeddings=self._embed([query]), n_results=n_results
             )
         except Exception as e:
             logger.error("ChromaDB core memory search failed: %s", e)
@@ -142,7 +283,7 @@ class ChromaStore:
         """Search lessons by semantic similarity."""
         try:
             results = self._lessons.query(
-                query_texts=[query], n_results=n_results
+                query_embeddings=self._embed([query]), n_results=n_results
             )
         except Exception as e:
             logger.error("ChromaDB lesson search failed: %s", e)
@@ -181,3 +322,102 @@ class ChromaStore:
             "core_memories": self._core_memories.count(),
             "lessons": self._lessons.count(),
         }
+
+
+class AsyncChromaStore:
+    """Async facade over ChromaStore for use from the event loop.
+
+    Embedding, upsert, query and HNSW persistence all block, so every call
+    runs in an executor. Queries and writes have separate concurrency limits
+    so a burst of background embeds cannot starve recall searches. Pass a
+    custom ``executor`` to change where calls run; to move Chroma work out of
+    process entirely, configure the wrapped store with a remote ``host``.
+    """
+
+    def __init__(
+        self,
+        store: ChromaStore,
+        query_workers: int = 4,
+        write_workers: int = 1,
+        executor: Optional[Executor] = None,
+    ):
+        self.store = store
+        self._owns_executor = executor is None
+        self._executor = executor or ThreadPoolExecutor(
+            max_workers=query_workers + write_workers,
+            thread_name_prefix="chroma",
+        )
+        self._query_slots = asyncio.Semaphore(query_workers)
+        self._write_slots = asyncio.Semaphore(write_workers)
+
+    memory_metadata = staticmethod(ChromaStore.memory_metadata)
+
+    async def _run(self, slots: asyncio.Semaphore, fn: Callable[..., Any], *args) -> Any:
+        async with slots:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self._executor, functools.partial(fn, *args))
+
+    def close(self):
+        """Wait for in-flight calls, then release the wrapped store."""
+        if self._owns_executor:
+            self._executor.shutdown(wait=True)
+        self.store.close()
+
+    # --- Writes ---
+
+    async def add_memory(self, memory_id: int, text: str, metadata: Optional[dict] = None):
+        await self._run(self._write_slots, self.store.add_memory, memory_id, text, metadata)
+
+    async def add_memories(self, ids: list[int], texts: list[str],
+                           metadatas: Optional[list[dict]] = None):
+        await self._run(self._write_slots, self.store.add_memories, ids, texts, metadatas)
+
+    async def add_core_memory(self, core_memory_id: int, text: str,
+                              metadata: Optional[dict] = None):
+        await self._run(
+            self._write_slots, self.store.add_core_memory, core_memory_id, text, metadata
+        )
+
+    async def add_core_memories(self, ids: list[int], texts: list[str],
+                                metadatas: Optional[list[dict]] = None):
+        await self._run(self._write_slots, self.store.add_core_memories, ids, texts, metadatas)
+
+    async def add_lesson(self, lesson_id: int, text: str, metadata: Optional[dict] = None):
+        await self._run(self._write_slots, self.store.add_lesson, lesson_id, text, metadata)
+
+    async def add_lessons(self, ids: list[int], texts: list[str],
+                          metadatas: Optional[list[dict]] = None):
+        await self._run(self._write_slots, self.store.add_lessons, ids, texts, metadatas)
+
+    async def update_memories_metadata(self, ids: list[int], metadatas: list[dict]):
+        await self._run(self._write_slots, self.store.update_memories_metadata, ids, metadatas)
+
+    async def delete_memory(self, memory_id: int):
+        await self._run(self._write_slots, self.store.delete_memory, memory_id)
+
+    async def delete_core_memory(self, core_memory_id: int):
+        await self._run(self._write_slots, self.store.delete_core_memory, core_memory_id)
+
+    # --- Queries ---
+
+    async def search_memories(
+        self,
+        query: str,
+        n_results: int = 20,
+        where: Optional[dict] = None,
+    ) -> list[dict]:
+        return await self._run(
+            self._query_slots, self.store.search_memories, query, n_results, where
+        )
+
+    async def search_core_memories(self, query: str, n_results: int = 10) -> list[dict]:
+        return await self._run(self._query_slots, self.store.search_core_memories, query, n_results)
+
+    async def search_lessons(self, query: str, n_results: int = 10) -> list[dict]:
+        return await self._run(self._query_slots, self.store.search_lessons, query, n_results)
+
+    async def memory_ids_missing_metadata(self) -> list[int]:
+        return await self._run(self._query_slots, self.store.memory_ids_missing_metadata)
+
+    async def get_counts(self) -> dict[str, int]:
+        return await self._run(self._query_slots, self.store.get_counts)
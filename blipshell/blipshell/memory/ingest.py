@@ -0,0 +1,182 @@
+"""Durable background ingest queue for memory processing.
+
+Chat turns persist each message to the ``ingest_queue`` table and return
+immediately. A small worker pool claims due items and runs them through
+MemoryProcessor in two tracked stages: the memory row is written in the
+same transaction that records it on the queue item (status ``stored``),
+and the item is removed only once the memory is embedded. Nothing is lost
+if the process stops or a stage fails mid-way: items left in-flight resume
+on the next start, and items that were already stored only redo the embed.
+"""
+
+import asyncio
+import logging
+import time
+from collections import defaultdict
+from typing import Optional
+
+from blipshell.memory.processor import MemoryProcessor
+from blipshell.memory.sqlite_store import SQLiteStore
+from blipshell.models.memory import Memory
+
+logger = logging.getLogger(__name__)
+
+
+class IngestQueue:
+    """SQLite-backed queue drained by workers.
+
+    Item lifecycle: pending → in_flight → stored → in_flight → removed, or
+    failed once out of attempts. Failed batches are retried with exponential backoff
+    (``backoff_base * 2 ** (attempts - 1)`` seconds) up to ``max_attempts``.
+    """
+
+    def __init__(
+        self,
+        sqlite: SQLiteStore,
+        processor: MemoryProcessor,
+        workers: int = 2,
+        batch_size: int = 8,
+        max_attempts: int = 5,
+        backoff_base: float = 2.0,
+        poll_interval: float = 5.0,
+    ):
+        self.sqlite = sqlite
+        self.processor = processor
+        self.workers = workers
+        self.batch_size = batch_size
+        self.max_attempts = max_attempts
+        self.backoff_base = backoff_base
+        self.poll_interval = poll_interval
+        self._wake = asyncio.Event()
+        self._running = False
+        self._tasks: list[asyncio.Task] = []
+
+    async def start(self):
+        """Recover items left in-flight and start the worker pool."""
+        if self._running:
+            return
+        recovered = await self.sqlite.requeue_in_flight_ingest()
+        if recovered:
+            logger.info("Requeued %d in-flight ingest items", recovered)
+        self._running = True
+        self._tasks = [asyncio.create_task(self._worker()) for _ in range(self.workers)]
+        self._wake.set()
+
+    async def stop(self):
+        """Stop the workers after their current batch."""
+        self._running = False
+        self._wake.set()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+    async def enqueue(self, session_id: Optional[int], role: str, content: str) -> int:
+        """Persist a message for processing and wake a worker. Returns the queue ID."""
+        ingest_id = await self.sqlite.enqueue_ingest(session_id, role, content)
+        self._wake.set()
+        return ingest_id
+
+    async def drain(self, ingest_ids: list[int]):
+        """Process the given items if due and wait for any in-flight ones.
+
+        Only these items are waited for, so one session ending doesn't block
+        on another's backlog. Items waiting out a retry backoff are left for
+        the workers.
+        """
+        while True:
+            if await self._run_once(ingest_ids):
+                continue
+            if not await self.sqlite.count_active_ingest(ingest_ids):
+                return
+            await asyncio.sleep(0.1)
+
+    async def _worker(self):
+        while self._running:
+            # Clear before claiming so an enqueue during the claim still wakes us
+            self._wake.clear()
+            try:
+                if await self._run_once():
+                    continue
+            except Exception as e:
+                logger.error("Ingest worker error: %s", e)
+
+            try:
+                await asyncio.wait_for(self._wake.wait(), timeout=self.poll_interval)
+            except asyncio.TimeoutError:
+                pass
+
+    async def _run_once(self, ingest_ids: Optional[list[int]] = None) -> bool:
+        """Claim and process one batch. Returns False if nothing was due."""
+        items = await self.sqlite.claim_ingest(self.batch_size, ingest_ids)
+        if not items:
+            return False
+        await self._process_batch(items)
+        return True
+
+    async def _process_batch(self, items: list[dict]):
+        to_store = [item for item in items if item["memory_id"] is None]
+        to_embed = [item for item in items if item["memory_id"] is not None]
+        if to_store:
+            to_embed.extend(await self._store(to_store))
+        if to_embed:
+            await self._embed(to_embed)
+
+    async def _store(self, items: list[dict]) -> list[dict]:
+        """Prepare and store memories for new items. Returns the items to embed."""
+        by_session: dict[Optional[int], list[dict]] = defaultdict(list)
+        for item in items:
+            by_session[item["session_id"]].append(item)
+
+        try:
+            groups = await asyncio.gather(*(
+                self.processor.prepare_memories(
+                    [(item["content"], item["role"]) for item in group],
+                    session_id=session_id,
+                )
+                for session_id, group in by_session.items()
+            ))
+            prepared: list[tuple[dict, Memory]] = []
+            noise: list[int] = []
+            for group, memories in zip(by_session.values(), groups):
+                for item, memory in zip(group, memories):
+                    if memory is None:
+                        noise.append(item["id"])
+                    else:
+                        prepared.append((item, memory))
+
+            async with self.sqlite.transaction():
+                await self.processor.store_memories([memory for _, memory in prepared])
+                await self.sqlite.set_ingest_memories(
+                    {item["id"]: memory.id for item, memory in prepared}
+                )
+                await self.sqlite.complete_ingest(noise)
+        except Exception as e:
+            logger.error("Ingest batch of %d failed: %s", len(items), e)
+            for item in items:
+                await self._retry(item, str(e))
+            return []
+
+        for item, memory in prepared:
+            item["memory_id"] = memory.id
+        return [item for item, _ in prepared]
+
+    async def _embed(self, items: list[dict]):
+        """Embed the stored memories of these items, then remove them from the queue."""
+        try:
+            memories = await self.sqlite.get_memories_by_ids(
+                [item["memory_id"] for item in items]
+            )
+            await self.processor.embed_memories(list(memories.values()))
+            await self.sqlite.complete_ingest([item["id"] for item in items])
+        except Exception as e:
+            logger.error("Embedding %d ingested memories failed: %s", len(items), e)
+            for item in items:
+                await self._retry(item, str(e))
+
+    async def _retry(self, item: dict, error: str):
+        attempts = item["attempts"] + 1  # claim_ingest already counted this attempt
+        if attempts >= self.max_attempts:
+            logger.warning("Ingest item %d failed after %d attempts", item["id"], attempts)
+            await self.sqlite.fail_ingest(item["id"], error, None)
+        else:
+            retry_at = time.time() + self.backoff_base * 2 ** (attempts - 1)
+            await self.sqlite.fail_ingest(item["id"], error, retry_at)
@@ -4,20 +4,21 @@
 Recall (30%/cap 8192), Buffer (10%).
 """
 
+import itertools
 import logging
+from bisect import bisect_left, insort
 from dataclasses import dataclass, field
 from datetime import datetime
 
+from blipshell.memory.tokens import count_tokens
 from blipshell.models.config import MemoryConfig
 
 logger = logging.getLogger(__name__)
 
 
 def estimate_tokens(text: str) -> int:
-    """Rough token estimate (text.length / 4). Port of TokenEstimator.cs."""
-    if not text:
-        return 0
-    return len(text) // 4
+    """Token count of text using the configured tokenizer (see memory.tokens)."""
+    return count_tokens(text)
 
 
 @dataclass
@@ -37,28 +38,43 @@ class PoolItem:
 
 
 class Pool:
-    """A single memory token budget pool."""
+    """A single memory token budget pool.
+
+    Keeps a running token total, a text index for duplicate checks and two
+    sorted indexes (priority, age), so adding, trimming and reading a pool
+    never rescans or re-sorts every item.
+    """
 
     def __init__(self, name: str, max_tokens: int, hard_cap: int | None = None):
         self.name = name
         self.max_tokens = max_tokens
         self.hard_cap = hard_cap
-        self._items: list[PoolItem] = []
+        # text -> (seq, priority key, age key, item); seq keeps ties in insertion order
+        self._by_text: dict[str, tuple[int, tuple, tuple, PoolItem]] = {}
+        self._by_priority: list[tuple[float, int, PoolItem]] = []  # highest priority first
+        self._by_age: list[tuple[datetime, int, PoolItem]] = []  # oldest first
+        self._seq = itertools.count()
+        self._used_tokens = 0
 
     @property
     def used_tokens(self) -> int:
-        return sum(item.estimated_tokens for item in self._items)
+        return self._used_tokens
 
     @property
     def item_count(self) -> int:
-        return len(self._items)
+        return len(self._by_text)
 
     def add(self, item: PoolItem):
         """Add item, avoiding duplicates by text content."""
-        if any(existing.text == item.text for existing in self._items):
+        if item.text in self._by_text:
             return
-        self._items.append(item)
-        self._items.sort(key=lambda x: x.priority_score, reverse=True)
+        seq = next(self._seq)
+        priority_key = (-item.priority_score, seq)
+        age_key = (item.timestamp, seq)
+        self._by_text[item.text] = (seq, priority_key, age_key, item)
+        insort(self._by_priority, (*priority_key, item))
+        insort(self._by_age, (*age_key, item))
+        self._used_tokens += item.estimated_tokens
 
     def get_top_entries(self, available_tokens: int) -> list[PoolItem]:
         """Get top entries that fit within available tokens."""
@@ -66,7 +82,7 @@ class Pool:
         used = 0
         effective_cap = min(available_tokens, self.hard_cap or self.max_tokens)
 
-        for item in self._items:
+        for _, _, item in self._by_priority:
             if used + item.estimated_tokens <= effective_cap:
                 selected.append(item)
                 used += item.estimated_tokens
@@ -76,16 +92,26 @@ class Pool:
 
     def get_oldest_items(self, count: int) -> list[PoolItem]:
         """Get the oldest N items."""
-        return sorted(self._items, key=lambda x: x.timestamp)[:count]
+        return [item for _, _, item in self._by_age[:count]]
 
     def remove_items(self, items_to_remove: list[PoolItem]):
         """Remove specified items from the pool."""
-        remove_set = {id(item) for item in items_to_remove}
-        self._items = [item for item in self._items if id(item) not in remove_set]
+        for item in items_to_remove:
+            entry = self._by_text.get(item.text)
+            if entry is None or entry[3] is not item:
+                continue
+            _, priority_key, age_key, _ = self._by_text.pop(item.text)
+            # (key, seq) sorts just before (key, seq, item), so bisect lands on it
+            del self._by_priority[bisect_left(self._by_priority, priority_key)]
+            del self._by_age[bisect_left(self._by_age, age_key)]
+            self._used_tokens -= item.estimated_tokens
 
     def clear(self):
         """Remove all items."""
-        self._items.clear()
+        self._by_text.clear()
+        self._by_priority.clear()
+        self._by_age.clear()
+        self._used_tokens = 0
 
 
 class MemoryManager:
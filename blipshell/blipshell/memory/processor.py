@@ -1,24 +1,33 @@
 """Background memory processing pipeline.
 
 Port of MemoryDB.CreateMemoryAsync pipeline:
-noise check → LLM summarize → SQLite insert → ChromaDB embed → tag → LLM rank → LLM importance
+noise check → tag → LLM analysis (summary + rank + importance) → SQLite insert → ChromaDB embed
+
+The analysis is one structured-output call; if its JSON fails validation
+the separate summarize ∥ rank ∥ importance prompts run instead.
+All LLM work happens before the first write, so the memory row, its final
+rank/importance and its tag links are written in a single SQLite transaction.
 """
 
+import asyncio
+import json
 import logging
 from datetime import datetime, timedelta
 
+from blipshell.llm.job_queue import PRIORITY_BACKGROUND
 from blipshell.llm.prompts import (
+    analyze_memory,
     ask_importance,
     extract_lesson,
     rank_memory,
     summarize_memory,
 )
 from blipshell.llm.router import LLMRouter, TaskType
-from blipshell.memory.chroma_store import ChromaStore
+from blipshell.memory.chroma_store import AsyncChromaStore
 from blipshell.memory.noise import should_skip_memory
 from blipshell.memory.sqlite_store import SQLiteStore
 from blipshell.memory.tagger import tag_message
-from blipshell.models.memory import CoreMemory, Lesson, Memory, MemoryType
+from blipshell.models.memory import CoreMemory, Lesson, Memory, MemoryAnalysis, MemoryType
 
 logger = logging.getLogger(__name__)
 
@@ -29,17 +38,34 @@ class MemoryProcessor:
     Pipeline steps:
     1. Noise check (skip low-value messages)
     2. LLM summarize (generate concise summary)
-    3. SQLite insert (persist structured data)
-    4. ChromaDB embed (store vector for semantic search)
-    5. Tag (extract topic/behavior tags)
-    6. LLM rank (quality 1-5)
-    7. LLM importance (0.0-1.0 with recency/tag bonuses)
+    3. Tag (extract topic/behavior tags)
+    4. LLM rank (quality 1-5)
+    5. LLM importance (0.0-1.0 with recency/tag bonuses)
+    6. SQLite insert (memory + tag links in one transaction)
+    7. ChromaDB embed (store vector for semantic search)
+
+    Steps 2, 4 and 5 come from one structured-output (JSON) call when
+    combined_analysis is on, falling back to three concurrent prompts.
+
+    Steps 1-5 are exposed as prepare_memory() (prepare_memories() for many
+    messages at once), step 6 as store_memories()
+    and step 7 as embed_memories(), so callers dumping many messages can
+    persist all of them with a single commit.
     """
 
-    def __init__(self, sqlite: SQLiteStore, chroma: ChromaStore, router: LLMRouter):
+    def __init__(
+        self,
+        sqlite: SQLiteStore,
+        chroma: AsyncChromaStore,
+        router: LLMRouter,
+        max_concurrent_messages: int = 4,
+        combined_analysis: bool = True,
+    ):
         self.sqlite = sqlite
         self.chroma = chroma
         self.router = router
+        self.combined_analysis = combined_analysis
+        self._message_slots = asyncio.Semaphore(max_concurrent_messages)
 
     async def process_message(
         self,
@@ -52,68 +78,174 @@ class MemoryProcessor:
 
         Returns the memory ID, or None if filtered as noise.
         """
+        memory = await self.prepare_memory(text, role, session_id)
+        if memory is None:
+            return None
+
+        [memory_id] = await self.store_memories([memory])
+        try:
+            await self.embed_memories([memory])
+        except Exception as e:
+            logger.error("ChromaDB embed failed: %s", e)
+        return memory_id
+
+    async def prepare_memory(self, text: str, role: str, session_id: int) -> Memory | None:
+        """Run the LLM/tagging steps for a message without touching SQLite.
+
+        Summarize, rank and importance depend only on the raw text, so they
+        run concurrently. Returns an unsaved Memory with summary, tags, rank
+        and importance filled in, or None if filtered as noise.
+        """
         # Step 1: Noise check
         if should_skip_memory(text):
             logger.debug("Skipping noise: %s", text[:50])
             return None
 
-        # Step 2: Summarize
+        # Step 3: Tag (cheap and local; importance needs the tags)
         try:
-            summary = await self.router.generate(
-                TaskType.SUMMARIZATION,
-                summarize_memory(text),
-            )
+            tags = tag_message(text)
         except Exception as e:
-            logger.error("Summarization failed, using raw text: %s", e)
-            summary = text
+            logger.error("Tagging failed: %s", e)
+            tags = []
 
-        # Step 3: SQLite insert
-        memory = Memory(
+        # Steps 2, 4, 5: one structured call, or summarize ∥ rank ∥ importance
+        analysis = await self._analyze(text) if self.combined_analysis else None
+        metadata_json = None
+        if analysis:
+            summary = analysis.summary
+            rank = analysis.rank
+            importance = self._apply_importance_bonuses(analysis.importance, tags)
+            if analysis.lesson_candidate:
+                metadata_json = json.dumps({"lesson_candidate": analysis.lesson_candidate})
+        else:
+            summary, rank, importance = await asyncio.gather(
+                self._summarize(text),
+                self._rank(text),
+                self._importance(text, tags),
+            )
+
+        return Memory(
             session_id=session_id,
             role=role,
             content=text,
             summary=summary,
             timestamp=datetime.utcnow(),
+            rank=rank,
+            importance=importance,
+            tags=tags,
             memory_type=MemoryType.CONVERSATION,
+            metadata_json=metadata_json,
         )
-        memory_id = await self.sqlite.create_memory(memory)
 
-        # Step 4: ChromaDB embed (use summary for better semantic matching)
+    async def prepare_memories(
+        self, messages: list[tuple[str, str]], session_id: int
+    ) -> list[Memory | None]:
+        """Prepare many (text, role) messages concurrently.
+
+        At most ``max_concurrent_messages`` messages are in flight; LLM calls
+        beyond endpoint capacity wait in the router. Results keep input order.
+        """
+        async def prepare(text: str, role: str) -> Memory | None:
+            async with self._message_slots:
+                return await self.prepare_memory(text, role, session_id)
+
+        return await asyncio.gather(*(prepare(text, role) for text, role in messages))
+
+    async def _analyze(self, text: str) -> MemoryAnalysis | None:
+        """Summary, rank and importance from a single structured-output call.
+
+        Returns None if the call fails or the JSON doesn't validate, so the
+        caller can fall back to the separate prompts.
+        """
         try:
-            self.chroma.add_memory(memory_id, summary, {
-                "session_id": str(session_id),
-                "role": role,
-            })
+            raw = await self.router.generate(
+                TaskType.SUMMARIZATION,
+                analyze_memory(text),
+                format=MemoryAnalysis.model_json_schema(),
+                priority=PRIORITY_BACKGROUND,
+            )
+            return MemoryAnalysis.model_validate_json(raw)
         except Exception as e:
-            logger.error("ChromaDB embed failed: %s", e)
+            logger.warning("Combined memory analysis failed, using separate prompts: %s", e)
+            return None
 
-        # Step 5: Tag
+    async def _summarize(self, text: str) -> str:
         try:
-            tags = tag_message(text)
-            await self.sqlite.tag_memory(memory_id, tags)
+            return await self.router.generate(
+                TaskType.SUMMARIZATION,
+                summarize_memory(text),
+                priority=PRIORITY_BACKGROUND,
+            )
         except Exception as e:
-            logger.error("Tagging failed: %s", e)
-            tags = []
+            logger.error("Summarization failed, using raw text: %s", e)
+            return text
 
-        # Step 6: Rank (1-5)
+    async def _rank(self, text: str) -> int:
         try:
             rank_text = await self.router.generate(
                 TaskType.RANKING,
                 rank_memory(text),
+                priority=PRIORITY_BACKGROUND,
             )
-            rank = self._parse_rank(rank_text)
-            await self.sqlite.update_memory(memory_id, rank=rank)
+            return self._parse_rank(rank_text)
         except Exception as e:
             logger.error("Ranking failed: %s", e)
+            return 0
 
-        # Step 7: Importance (0.0-1.0)
+    async def _importance(self, text: str, tags: list[str]) -> float:
         try:
-            importance = await self._calculate_importance(memory_id, text, tags)
-            await self.sqlite.update_memory(memory_id, importance=importance)
+            return await self._calculate_importance(text, tags)
         except Exception as e:
             logger.error("Importance calculation failed: %s", e)
+            return 0.0
 
-        return memory_id
+    async def store_memories(self, memories: list[Memory]) -> list[int]:
+        """Insert prepared memories and their tag links in one transaction.
+
+        Sets ``memory.id`` on each item and returns the new IDs in order.
+        Joins the caller's transaction if one is already open.
+        """
+        async with self.sqlite.transaction():
+            for memory in memories:
+                memory.id = await self.sqlite.create_memory(memory)
+            await self.sqlite.tag_memories(
+                [(memory.id, memory.tags) for memory in memories if memory.tags]
+            )
+        return [memory.id for memory in memories]
+
+    async def embed_memories(self, memories: list[Memory]):
+        """Embed stored memories in ChromaDB (uses summary for better semantic matching).
+
+        Rank, importance and archive state are final by now, so they are
+        mirrored into the vector metadata in the same upsert. All memories
+        are embedded in batched requests. Raises if embedding fails, so the
+        ingest queue can retry it.
+        """
+        if not memories:
+            return
+        await self.chroma.add_memories(
+            [memory.id for memory in memories],
+            [memory.summary or memory.content for memory in memories],
+            [self.chroma.memory_metadata(memory) for memory in memories],
+        )
+
+    async def backfill_chroma_metadata(self, batch_size: int = 500) -> int:
+        """Mirror SQLite rank/importance/archive state onto vectors that lack it.
+
+        Vectors embedded before the metadata was mirrored never match the
+        filtered recall search; this fixes them up without re-embedding.
+        Returns the number of vectors updated.
+        """
+        missing = await self.chroma.memory_ids_missing_metadata()
+        updated = 0
+        for start in range(0, len(missing), batch_size):
+            memories = await self.sqlite.get_memories_by_ids(missing[start:start + batch_size])
+            ids = list(memories)
+            await self.chroma.update_memories_metadata(
+                ids, [self.chroma.memory_metadata(memories[i]) for i in ids],
+            )
+            updated += len(ids)
+        return updated
 
     async def process_core_memory(
         self, text: str, session_id: int | None = None
@@ -123,20 +255,24 @@ class MemoryProcessor:
             content=text,
             source_session_id=session_id,
         )
-        mem_id = await self.sqlite.create_core_memory(core_memory)
 
-        # Embed
         try:
-            self.chroma.add_core_memory(mem_id, text)
+            tags = tag_message(text)
         except Exception as e:
-            logger.error("Core memory embed failed: %s", e)
+            logger.error("Core memory tagging failed: %s", e)
+            tags = []
 
-        # Tag
+        # Insert + tag in one transaction
+        async with self.sqlite.transaction():
+            mem_id = await self.sqlite.create_core_memory(core_memory)
+            if tags:
+                await self.sqlite.tag_core_memory(mem_id, tags)
+
+        # Embed
         try:
-            tags = tag_message(text)
-            await self.sqlite.tag_core_memory(mem_id, tags)
+            await self.chroma.add_core_memory(mem_id, text)
         except Exception as e:
-            logger.error("Core memory tagging failed: %s", e)
+            logger.error("Core memory embed failed: %s", e)
 
         return mem_id
 
@@ -147,6 +283,7 @@ class MemoryProcessor:
             lesson_text = await self.router.generate(
                 TaskType.SUMMARIZATION,
                 extract_lesson(conversation_text),
+                priority=PRIORITY_BACKGROUND,
             )
         except Exception as e:
             logger.error("Lesson extraction failed: %s", e)
@@ -156,26 +293,28 @@ class MemoryProcessor:
             content=lesson_text,
             source_session_id=session_id,
         )
-        lesson_id = await self.sqlite.create_lesson(lesson)
 
-        # Embed
         try:
-            self.chroma.add_lesson(lesson_id, lesson_text)
+            tags = tag_message(lesson_text)
         except Exception as e:
-            logger.error("Lesson embed failed: %s", e)
+            logger.error("Lesson tagging failed: %s", e)
+            tags = []
+
+        # Insert + tag in one transaction
+        async with self.sqlite.transaction():
+            lesson_id = await self.sqlite.create_lesson(lesson)
+            if tags:
+                await self.sqlite.tag_lesson(lesson_id, tags)
 
-        # Tag
+        # Embed
         try:
-            tags = tag_message(lesson_text)
-            await self.sqlite.tag_lesson(lesson_id, tags)
+            await self.chroma.add_lesson(lesson_id, lesson_text)
         except Exception as e:
-            logger.error("Lesson tagging failed: %s", e)
+            logger.error("Lesson embed failed: %s", e)
 
         return lesson_id
 
-    async def _calculate_importance(
-        self, memory_id: int, text: str, tags: list[str]
-    ) -> float:
+    async def _calculate_importance(self, text: str, tags: list[str]) -> float:
         """Calculate importance score with recency and tag bonuses.
 
         Port of MemoryDB.CalculateImportance().
@@ -185,17 +324,22 @@ class MemoryProcessor:
             importance_text = await self.router.generate(
                 TaskType.RANKING,
                 ask_importance(text),
+                priority=PRIORITY_BACKGROUND,
             )
             importance = self._parse_float(importance_text, default=0.3)
         except Exception:
             importance = 0.3
 
+        return self._apply_importance_bonuses(importance, tags)
+
+    @staticmethod
+    def _apply_importance_bonuses(importance: float, tags: list[str]) -> float:
+        """Add recency and tag bonuses to a base importance."""
         # Recency bonus: +0.1 if within 7 days
         importance += 0.1  # always recent at creation time
 
-        # Tag bonus: +0.2 if many tags (>6)
-        tag_count = await self.sqlite.get_tag_count_for_memory(memory_id)
-        if tag_count > 6:
+        # Tag bonus: +0.2 if many tags (>6); tags are linked one row per unique name
+        if len(set(tags)) > 6:
             importance += 0.2
 
         return min(importance, 1.0)
@@ -1,14 +1,15 @@
 """Semantic memory search (port of MemoryDB.SearchMemoriesAsync).
 
-Pipeline: noise filter → rephrase query → ChromaDB search → filter by rank → importance boost → sort.
+Pipeline: noise filter → rephrase query → filtered ChromaDB search → bulk hydrate → importance boost → sort.
 """
 
 import logging
 from dataclasses import dataclass
 
+from blipshell.llm.job_queue import PRIORITY_INTERACTIVE
 from blipshell.llm.prompts import rephrase_as_memory_style
 from blipshell.llm.router import LLMRouter, TaskType
-from blipshell.memory.chroma_store import ChromaStore
+from blipshell.memory.chroma_store import AsyncChromaStore
 from blipshell.memory.noise import contains_signal_words, should_skip_memory
 from blipshell.memory.sqlite_store import SQLiteStore
 from blipshell.memory.tagger import tag_topics
@@ -35,8 +36,8 @@ class MemorySearch:
     Port of MemoryDB.SearchMemoriesAsync:
     1. Noise filter (skip noise queries)
     2. Rephrase query as memory-style declarative sentence
-    3. ChromaDB semantic search
-    4. Filter by rank >= min_threshold
+    3. ChromaDB semantic search filtered by rank >= min_threshold, archived and session
+    4. Bulk-load the surviving candidates from SQLite
     5. Importance boost based on rank
     6. Sort by boosted score
     """
@@ -44,7 +45,7 @@ class MemorySearch:
     def __init__(
         self,
         sqlite: SQLiteStore,
-        chroma: ChromaStore,
+        chroma: AsyncChromaStore,
         router: LLMRouter,
         min_rank: int = 3,
         search_limit: int = 20,
@@ -85,44 +86,47 @@ class MemorySearch:
             memory_query = await self.router.generate(
                 TaskType.SUMMARIZATION,
                 rephrase_as_memory_style(query),
+                priority=PRIORITY_INTERACTIVE,
             )
         except Exception as e:
             logger.warning("Query rephrase failed, using original: %s", e)
             memory_query = query
 
-        # Step 3: ChromaDB semantic search
-        chroma_results = self.chroma.search_memories(
+        # Step 3: ChromaDB semantic search, filtering rank/archive/session in the index
+        filters = [
+            {"rank": {"$gte": self.min_rank}},
+            {"is_archived": False},
+        ]
+        if current_session_id:
+            filters.append({"session_id": {"$ne": str(current_session_id)}})
+        chroma_results = await self.chroma.search_memories(
             query=memory_query,
-            n_results=n_results * 2,  # fetch extra for post-filtering
+            n_results=n_results,
+            where={"$and": filters},
         )
 
         if not chroma_results:
             return []
 
-        # Step 4+5: Filter and boost
+        # Skip if similarity too low
+        candidates = [cr for cr in chroma_results if cr["similarity"] >= 0.5]
+
+        # Step 4: Hydrate all candidates at once (rank/archive re-checked against SQLite)
+        memories = await self.sqlite.get_memories_by_ids(
+            [cr["id"] for cr in candidates],
+            min_rank=self.min_rank,
+            include_archived=False,
+        )
+
+        # Step 5: Importance boost
         results = []
-        for cr in chroma_results:
+        for cr in candidates:
             memory_id = cr["id"]
             similarity = cr["similarity"]
-
-            # Skip if similarity too low
-            if similarity < 0.5:
-                continue
-
-            # Skip current session memories
-            metadata = cr.get("metadata", {})
-            if current_session_id and metadata.get("session_id") == str(current_session_id):
-                continue
-
-            # Load full memory from SQLite for rank check
-            memory = await self.sqlite.get_memory(memory_id)
+            memory = memories.get(memory_id)
             if not memory:
                 continue
 
-            # Filter by rank
-            if memory.rank < self.min_rank:
-                continue
-
             # Importance boost based on rank (port of C# logic)
             normalized_importance = (memory.rank - 1) / 4.0  # 1→0.0, 5→1.0
             importance_boost = normalized_importance * 0.2
@@ -144,8 +148,8 @@ class MemorySearch:
 
     async def search_core_memories(self, query: str, n_results: int = 10) -> list[dict]:
         """Search core memories by semantic similarity."""
-        return self.chroma.search_core_memories(query, n_results)
+        return await self.chroma.search_core_memories(query, n_results)
 
     async def search_lessons(self, query: str, n_results: int = 10) -> list[dict]:
         """Search lessons by semantic similarity."""
-        return self.chroma.search_lessons(query, n_results)
+        return await self.chroma.search_lessons(query, n_results)
@@ -1,10 +1,13 @@
 """SQLite storage for structured data (port of MemoryDB.cs schema)."""
 
+import asyncio
 import json
 import logging
+import time
+from contextlib import asynccontextmanager
 from datetime import datetime
 from pathlib import Path
-from typing import Optional
+from typing import AsyncIterator, Iterable, Optional
 
 import aiosqlite
 
@@ -111,6 +114,25 @@ CREATE TABLE IF NOT EXISTS projects (
     metadata_json TEXT
 );
 
+CREATE TABLE IF NOT EXISTS ingest_queue (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    session_id INTEGER,
+    role TEXT NOT NULL,
+    content TEXT NOT NULL,
+    status TEXT NOT NULL DEFAULT 'pending',
+    attempts INTEGER DEFAULT 0,
+    next_attempt_at REAL DEFAULT 0,
+    last_error TEXT,
+    memory_id INTEGER,
+    created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+    FOREIGN KEY (session_id) REFERENCES sessions(id)
+);
+
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT
+);
+
 CREATE INDEX IF NOT EXISTS idx_memories_session ON memories(session_id);
 CREATE INDEX IF NOT EXISTS idx_memories_rank ON memories(rank);
 CREATE INDEX IF NOT EXISTS idx_memories_timestamp ON memories(timestamp);
@@ -118,41 +140,157 @@ CREATE INDEX IF NOT EXISTS idx_memory_tags_memory ON memory_tags(memory_id);
 CREATE INDEX IF NOT EXISTS idx_memory_tags_tag ON memory_tags(tag_id);
 CREATE INDEX IF NOT EXISTS idx_tags_name ON tags(name);
 CREATE INDEX IF NOT EXISTS idx_sessions_project ON sessions(project);
+CREATE INDEX IF NOT EXISTS idx_ingest_queue_status ON ingest_queue(status, next_attempt_at);
 """
 
+# Where an interrupted or failed queue item resumes: items whose memory was
+# already written only need embedding
+_RESUME_STATUS = "CASE WHEN memory_id IS NULL THEN 'pending' ELSE 'stored' END"
 
-class SQLiteStore:
-    """Async SQLite storage for structured data."""
 
-    def __init__(self, db_path: str):
+class SQLiteStore:
+    """Async SQLite storage for structured data.
+
+    Writes go through a single writer connection; reads borrow one of
+    ``read_pool_size`` read-only WAL connections, so REST reads are not
+    queued behind the memory pipeline's writes.
+
+    Every mutator runs inside ``transaction()``. Called on its own, a mutator
+    commits immediately; called inside an open ``transaction()`` block it joins
+    that unit of work, so a batch of inserts, updates and tag links costs a
+    single commit.
+    """
+
+    def __init__(
+        self,
+        db_path: str,
+        read_pool_size: int = 4,
+        acquire_timeout: float = 10.0,
+        mmap_size: int = 268435456,
+        cache_size_kb: int = 16384,
+    ):
         self.db_path = db_path
+        self.read_pool_size = read_pool_size
+        self.acquire_timeout = acquire_timeout
+        self.mmap_size = mmap_size
+        self.cache_size_kb = cache_size_kb
         self._db: Optional[aiosqlite.Connection] = None
+        # Read-only WAL connections; each runs on its own aiosqlite worker thread
+        self._readers: list[aiosqlite.Connection] = []
+        self._idle_readers: Optional[asyncio.Queue[aiosqlite.Connection]] = None
+        self._write_lock = asyncio.Lock()
+        # (name, category) -> tag ID; warmed at initialize(), filled as tags are created
+        self._tag_ids: dict[tuple[str, str], int] = {}
+        # Task running the open transaction; tasks it spawns are not part of it
+        self._transaction_owner: Optional[asyncio.Task] = None
 
     async def initialize(self):
-        """Open connection and create schema."""
+        """Open the writer and reader connections and create schema."""
         Path(self.db_path).parent.mkdir(parents=True, exist_ok=True)
         self._db = await aiosqlite.connect(self.db_path)
         self._db.row_factory = aiosqlite.Row
         await self._db.execute("PRAGMA foreign_keys = ON")
         await self._db.execute("PRAGMA journal_mode = WAL")
+        await self._apply_pragmas(self._db)
         await self._db.executescript(SCHEMA_SQL)
         await self._db.commit()
+        await self._load_tag_ids()
+
+        # An in-memory database is private to its connection, so reads stay on the writer
+        if self.db_path == ":memory:" or self.read_pool_size <= 0:
+            return
+
+        self._idle_readers = asyncio.Queue(maxsize=self.read_pool_size)
+        uri = f"{Path(self.db_path).resolve().as_uri()}?mode=ro"
+        for _ in range(self.read_pool_size):
+            reader = await aiosqlite.connect(uri, uri=True)
+            reader.row_factory = aiosqlite.Row
+            await reader.execute("PRAGMA query_only = ON")
+            await self._apply_pragmas(reader)
+            self._readers.append(reader)
+            self._idle_readers.put_nowait(reader)
+
+    async def _apply_pragmas(self, db: aiosqlite.Connection):
+        """Per-connection tuning shared by the writer and every reader."""
+        await db.execute(f"PRAGMA mmap_size = {int(self.mmap_size)}")
+        await db.execute(f"PRAGMA cache_size = -{int(self.cache_size_kb)}")
+        await db.execute("PRAGMA temp_store = MEMORY")
+        await db.execute("PRAGMA synchronous = NORMAL")
 
     async def close(self):
-        """Close the database connection."""
+        """Close the writer and all reader connections."""
+        for reader in self._readers:
+            await reader.close()
+        self._readers = []
+        self._idle_readers = None
         if self._db:
             await self._db.close()
             self._db = None
 
+    def _in_transaction(self) -> bool:
+        """Whether the current task owns the open transaction."""
+        return (
+            self._transaction_owner is not None
+            and self._transaction_owner is asyncio.current_task()
+        )
+
+    @asynccontextmanager
+    async def _read(self) -> AsyncIterator[aiosqlite.Connection]:
+        """Borrow a reader connection for one query.
+
+        Inside an open ``transaction()`` the writer is used instead so the
+        caller sees its own uncommitted rows. Raises ``TimeoutError`` if no
+        reader frees up within ``acquire_timeout`` seconds.
+        """
+        if self._idle_readers is None or self._in_transaction():
+            yield self._db
+            return
+
+        reader = await asyncio.wait_for(self._idle_readers.get(), self.acquire_timeout)
+        try:
+            yield reader
+        finally:
+            self._idle_readers.put_nowait(reader)
+
+    @asynccontextmanager
+    async def transaction(self) -> AsyncIterator["SQLiteStore"]:
+        """Group writes into one transaction with a single commit.
+
+        Usage:
+            async with sqlite.transaction():
+                memory_id = await sqlite.create_memory(memory)
+                await sqlite.tag_memory(memory_id, tags)
+
+        Nested blocks in the same task join the outermost one. Writers from
+        other tasks, including tasks spawned inside the block, wait until it
+        exits. The transaction is rolled back if the block raises.
+        """
+        if self._in_transaction():
+            yield self
+            return
+
+        async with self._write_lock:
+            self._transaction_owner = asyncio.current_task()
+            try:
+                yield self
+                await self._db.commit()
+            except BaseException:
+                await self._db.rollback()
+                # Tags created by the rolled-back block no longer exist
+                await self._load_tag_ids()
+                raise
+            finally:
+                self._transaction_owner = None
+
     # --- Sessions ---
 
     async def create_session(self, title: str = "New Session", project: Optional[str] = None) -> int:
         """Create a new session and return its ID."""
-        cursor = await self._db.execute(
-            "INSERT INTO sessions (title, project, created_at, last_active) VALUES (?, ?, ?, ?)",
-            (title, project, datetime.utcnow().isoformat(), datetime.utcnow().isoformat()),
-        )
-        await self._db.commit()
+        async with self.transaction():
+            cursor = await self._db.execute(
+                "INSERT INTO sessions (title, project, created_at, last_active) VALUES (?, ?, ?, ?)",
+                (title, project, datetime.utcnow().isoformat(), datetime.utcnow().isoformat()),
+            )
         return cursor.lastrowid
 
     async def update_session(self, session_id: int, **kwargs):
@@ -163,13 +301,14 @@ class SQLiteStore:
             return
         set_clause = ", ".join(f"{k} = ?" for k in fields)
         values = list(fields.values()) + [session_id]
-        await self._db.execute(f"UPDATE sessions SET {set_clause} WHERE id = ?", values)
-        await self._db.commit()
+        async with self.transaction():
+            await self._db.execute(f"UPDATE sessions SET {set_clause} WHERE id = ?", values)
 
     async def get_session(self, session_id: int) -> Optional[Session]:
         """Get a session by ID."""
-        cursor = await self._db.execute("SELECT * FROM sessions WHERE id = ?", (session_id,))
-        row = await cursor.fetchone()
+        async with self._read() as db:
+            cursor = await db.execute("SELECT * FROM sessions WHERE id = ?", (session_id,))
+            row = await cursor.fetchone()
         if not row:
             return None
         return Session(
@@ -186,10 +325,11 @@ class SQLiteStore:
 
     async def get_latest_session(self) -> Optional[Session]:
         """Get the most recent session."""
-        cursor = await self._db.execute(
-            "SELECT * FROM sessions ORDER BY last_active DESC LIMIT 1"
-        )
-        row = await cursor.fetchone()
+        async with self._read() as db:
+            cursor = await db.execute(
+                "SELECT * FROM sessions ORDER BY last_active DESC LIMIT 1"
+            )
+            row = await cursor.fetchone()
         if not row:
             return None
         return Session(
@@ -205,16 +345,17 @@ class SQLiteStore:
 
     async def list_sessions(self, limit: int = 50, project: Optional[str] = None) -> list[Session]:
         """List sessions, optionally filtered by project."""
-        if project:
-            cursor = await self._db.execute(
-                "SELECT * FROM sessions WHERE project = ? ORDER BY last_active DESC LIMIT ?",
-                (project, limit),
-            )
-        else:
-            cursor = await self._db.execute(
-                "SELECT * FROM sessions ORDER BY last_active DESC LIMIT ?", (limit,)
-            )
-        rows = await cursor.fetchall()
+        async with self._read() as db:
+            if project:
+                cursor = await db.execute(
+                    "SELECT * FROM sessions WHERE project = ? ORDER BY last_active DESC LIMIT ?",
+                    (project, limit),
+                )
+            else:
+                cursor = await db.execute(
+                    "SELECT * FROM sessions ORDER BY last_active DESC LIMIT ?", (limit,)
+                )
+            rows = await cursor.fetchall()
         return [
             Session(
                 id=r["id"],
@@ -233,24 +374,24 @@ class SQLiteStore:
 
     async def create_memory(self, memory: Memory) -> int:
         """Insert a memory and return its ID."""
-        cursor = await self._db.execute(
-            """INSERT INTO memories (session_id, role, content, summary, timestamp, rank,
-               importance, memory_type, is_archived, metadata_json)
-               VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)""",
-            (
-                memory.session_id,
-                memory.role,
-                memory.content,
-                memory.summary,
-                memory.timestamp.isoformat(),
-                memory.rank,
-                memory.importance,
-                memory.memory_type.value,
-                memory.is_archived,
-                memory.metadata_json,
-            ),
-        )
-        await self._db.commit()
+        async with self.transaction():
+            cursor = await self._db.execute(
+                """INSERT INTO memories (session_id, role, content, summary, timestamp, rank,
+                   importance, memory_type, is_archived, metadata_json)
+                   VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)""",
+                (
+                    memory.session_id,
+                    memory.role,
+                    memory.content,
+                    memory.summary,
+                    memory.timestamp.isoformat(),
+                    memory.rank,
+                    memory.importance,
+                    memory.memory_type.value,
+                    memory.is_archived,
+                    memory.metadata_json,
+                ),
+            )
         return cursor.lastrowid
 
     async def update_memory(self, memory_id: int, **kwargs):
@@ -261,25 +402,74 @@ class SQLiteStore:
             return
         set_clause = ", ".join(f"{k} = ?" for k in fields)
         values = list(fields.values()) + [memory_id]
-        await self._db.execute(f"UPDATE memories SET {set_clause} WHERE id = ?", values)
-        await self._db.commit()
+        async with self.transaction():
+            await self._db.execute(f"UPDATE memories SET {set_clause} WHERE id = ?", values)
 
     async def get_memories_by_session(self, session_id: int) -> list[Memory]:
         """Get all memories for a session."""
-        cursor = await self._db.execute(
-            "SELECT * FROM memories WHERE session_id = ? ORDER BY timestamp", (session_id,)
-        )
-        rows = await cursor.fetchall()
+        async with self._read() as db:
+            cursor = await db.execute(
+                "SELECT * FROM memories WHERE session_id = ? ORDER BY timestamp", (session_id,)
+            )
+            rows = await cursor.fetchall()
         return [self._row_to_memory(r) for r in rows]
 
     async def get_memory(self, memory_id: int) -> Optional[Memory]:
         """Get a single memory by ID."""
-        cursor = await self._db.execute("SELECT * FROM memories WHERE id = ?", (memory_id,))
-        row = await cursor.fetchone()
+        async with self._read() as db:
+            cursor = await db.execute("SELECT * FROM memories WHERE id = ?", (memory_id,))
+            row = await cursor.fetchone()
         if not row:
             return None
         return self._row_to_memory(row)
 
+    async def get_memories_by_ids(
+        self,
+        memory_ids: list[int],
+        min_rank: Optional[int] = None,
+        include_archived: bool = True,
+    ) -> dict[int, Memory]:
+        """Fetch many memories in one query, keyed by ID.
+
+        IDs that don't exist or fail the rank/archived filters are absent
+        from the result.
+        """
+        if not memory_ids:
+            return {}
+        placeholders = ", ".join("?" for _ in memory_ids)
+        sql = f"SELECT * FROM memories WHERE id IN ({placeholders})"
+        params: list = list(memory_ids)
+        if min_rank is not None:
+            sql += " AND rank >= ?"
+            params.append(min_rank)
+        if not include_archived:
+            sql += " AND is_archived = 0"
+        async with self._read() as db:
+            cursor = await db.execute(sql, params)
+            rows = await cursor.fetchall()
+        return {r["id"]: self._row_to_memory(r) for r in rows}
+
+    async def iter_memory_contents(
+        self, batch_size: int = 1000,
+    ) -> AsyncIterator[list[tuple[int, str]]]:
+        """Yield (id, content) pairs for every memory in ID order, a batch at a time.
+
+        Pages by primary key, so each batch is an index seek no matter how
+        far into the table it is and only one batch is held in memory.
+        """
+        last_id = 0
+        while True:
+            async with self._read() as db:
+                cursor = await db.execute(
+                    "SELECT id, content FROM memories WHERE id > ? ORDER BY id LIMIT ?",
+                    (last_id, batch_size),
+                )
+                rows = await cursor.fetchall()
+            if not rows:
+                return
+            yield [(r["id"], r["content"]) for r in rows]
+            last_id = rows[-1]["id"]
+
     def _row_to_memory(self, row) -> Memory:
         return Memory(
             id=row["id"],
@@ -299,26 +489,27 @@ class SQLiteStore:
 
     async def create_core_memory(self, core_memory: CoreMemory) -> int:
         """Insert a core memory and return its ID."""
-        cursor = await self._db.execute(
-            """INSERT INTO core_memories (content, category, timestamp, importance, source_session_id)
-               VALUES (?, ?, ?, ?, ?)""",
-            (
-                core_memory.content,
-                core_memory.category,
-                core_memory.timestamp.isoformat(),
-                core_memory.importance,
-                core_memory.source_session_id,
-            ),
-        )
-        await self._db.commit()
+        async with self.transaction():
+            cursor = await self._db.execute(
+                """INSERT INTO core_memories (content, category, timestamp, importance, source_session_id)
+                   VALUES (?, ?, ?, ?, ?)""",
+                (
+                    core_memory.content,
+                    core_memory.category,
+                    core_memory.timestamp.isoformat(),
+                    core_memory.importance,
+                    core_memory.source_session_id,
+                ),
+            )
         return cursor.lastrowid
 
     async def get_active_core_memories(self) -> list[CoreMemory]:
         """Get all active core memories."""
-        cursor = await self._db.execute(
-            "SELECT * FROM core_memories WHERE is_active = 1 ORDER BY importance DESC"
-        )
-        rows = await cursor.fetchall()
+        async with self._read() as db:
+            cursor = await db.execute(
+                "SELECT * FROM core_memories WHERE is_active = 1 ORDER BY importance DESC"
+            )
+            rows = await cursor.fetchall()
         return [
             CoreMemory(
                 id=r["id"],
@@ -333,36 +524,37 @@ class SQLiteStore:
 
     async def deactivate_core_memory(self, core_memory_id: int):
         """Deactivate a core memory."""
-        await self._db.execute(
-            "UPDATE core_memories SET is_active = 0 WHERE id = ?", (core_memory_id,)
-        )
-        await self._db.commit()
+        async with self.transaction():
+            await self._db.execute(
+                "UPDATE core_memories SET is_active = 0 WHERE id = ?", (core_memory_id,)
+            )
 
     # --- Lessons ---
 
     async def create_lesson(self, lesson: Lesson) -> int:
         """Insert a lesson and return its ID."""
-        cursor = await self._db.execute(
-            """INSERT INTO lessons (content, summary, timestamp, rank, importance,
-               source_session_id, added_by)
-               VALUES (?, ?, ?, ?, ?, ?, ?)""",
-            (
-                lesson.content,
-                lesson.summary,
-                lesson.timestamp.isoformat(),
-                lesson.rank,
-                lesson.importance,
-                lesson.source_session_id,
-                "system",
-            ),
-        )
-        await self._db.commit()
+        async with self.transaction():
+            cursor = await self._db.execute(
+                """INSERT INTO lessons (content, summary, timestamp, rank, importance,
+                   source_session_id, added_by)
+                   VALUES (?, ?, ?, ?, ?, ?, ?)""",
+                (
+                    lesson.content,
+                    lesson.summary,
+                    lesson.timestamp.isoformat(),
+                    lesson.rank,
+                    lesson.importance,
+                    lesson.source_session_id,
+                    "system",
+                ),
+            )
         return cursor.lastrowid
 
     async def get_all_lessons(self) -> list[Lesson]:
         """Get all lessons."""
-        cursor = await self._db.execute("SELECT * FROM lessons ORDER BY timestamp DESC")
-        rows = await cursor.fetchall()
+        async with self._read() as db:
+            cursor = await db.execute("SELECT * FROM lessons ORDER BY timestamp DESC")
+            rows = await cursor.fetchall()
         return [
             Lesson(
                 id=r["id"],
@@ -378,84 +570,250 @@ class SQLiteStore:
 
     # --- Tags ---
 
-    async def create_or_get_tag(self, name: str, category: str = "topic") -> int:
-        """Get existing tag ID or create a new one."""
-        cursor = await self._db.execute(
-            "SELECT id FROM tags WHERE name = ? AND category = ?", (name, category)
-        )
-        row = await cursor.fetchone()
-        if row:
-            return row["id"]
+    async def _load_tag_ids(self):
+        cursor = await self._db.execute("SELECT id, name, category FROM tags")
+        self._tag_ids = {(r["name"], r["category"]): r["id"] for r in await cursor.fetchall()}
+
+    async def _resolve_tags(self, names: Iterable[str], category: str = "topic") -> dict[str, int]:
+        """Map tag names to IDs, creating any that don't exist yet.
+
+        Names are answered from the in-memory cache; the misses are created
+        with one multi-row ``INSERT OR IGNORE ... RETURNING``. Must run
+        inside ``transaction()``.
+        """
+        names = list(dict.fromkeys(names))
+        ids = {n: self._tag_ids[(n, category)] for n in names if (n, category) in self._tag_ids}
+        missing = [n for n in names if n not in ids]
+        if not missing:
+            return ids
+
+        values = ", ".join("(?, ?)" for _ in missing)
+        params = [p for n in missing for p in (n, category)]
         cursor = await self._db.execute(
-            "INSERT INTO tags (name, category) VALUES (?, ?)", (name, category)
+            f"INSERT OR IGNORE INTO tags (name, category) VALUES {values} RETURNING id, name",
+            params,
         )
-        await self._db.commit()
-        return cursor.lastrowid
+        ids.update({r["name"]: r["id"] for r in await cursor.fetchall()})
+        # Rows that already existed (e.g. created by another process) return nothing
+        existing = [n for n in missing if n not in ids]
+        if existing:
+            placeholders = ", ".join("?" for _ in existing)
+            cursor = await self._db.execute(
+                f"SELECT id, name FROM tags WHERE category = ? AND name IN ({placeholders})",
+                [category, *existing],
+            )
+            ids.update({r["name"]: r["id"] for r in await cursor.fetchall()})
+
+        self._tag_ids.update({(n, category): ids[n] for n in missing})
+        return ids
+
+    async def _link_tags(self, table: str, column: str, items: list[tuple[int, list[str]]]):
+        """Insert (owner, tag) link rows for many owners with one executemany."""
+        async with self.transaction():
+            tag_ids = await self._resolve_tags(n for _, names in items for n in names)
+            await self._db.executemany(
+                f"INSERT OR IGNORE INTO {table} ({column}, tag_id) VALUES (?, ?)",
+                [(owner_id, tag_ids[n]) for owner_id, names in items for n in names],
+            )
+
+    async def create_or_get_tag(self, name: str, category: str = "topic") -> int:
+        """Get existing tag ID or create a new one."""
+        async with self.transaction():
+            return (await self._resolve_tags([name], category))[name]
+
+    async def tag_memories(self, items: list[tuple[int, list[str]]]):
+        """Associate tags with many memories: ``[(memory_id, [tag names]), ...]``."""
+        await self._link_tags("memory_tags", "memory_id", items)
 
     async def tag_memory(self, memory_id: int, tag_names: list[str]):
         """Associate tags with a memory."""
-        for tag_name in tag_names:
-            tag_id = await self.create_or_get_tag(tag_name)
-            await self._db.execute(
-                "INSERT OR IGNORE INTO memory_tags (memory_id, tag_id) VALUES (?, ?)",
-                (memory_id, tag_id),
+        await self.tag_memories([(memory_id, tag_names)])
+
+    async def replace_memory_tags(self, tags_by_memory: dict[int, list[str]]):
+        """Replace the tags of many memories in one transaction."""
+        if not tags_by_memory:
+            return
+        async with self.transaction():
+            await self._db.executemany(
+                "DELETE FROM memory_tags WHERE memory_id = ?",
+                [(memory_id,) for memory_id in tags_by_memory],
             )
-        await self._db.commit()
+            await self.tag_memories(list(tags_by_memory.items()))
 
     async def tag_core_memory(self, core_memory_id: int, tag_names: list[str]):
         """Associate tags with a core memory."""
-        for tag_name in tag_names:
-            tag_id = await self.create_or_get_tag(tag_name)
-            await self._db.execute(
-                "INSERT OR IGNORE INTO core_memory_tags (core_memory_id, tag_id) VALUES (?, ?)",
-                (core_memory_id, tag_id),
-            )
-        await self._db.commit()
+        await self._link_tags("core_memory_tags", "core_memory_id", [(core_memory_id, tag_names)])
 
     async def tag_lesson(self, lesson_id: int, tag_names: list[str]):
         """Associate tags with a lesson."""
-        for tag_name in tag_names:
-            tag_id = await self.create_or_get_tag(tag_name)
-            await self._db.execute(
-                "INSERT OR IGNORE INTO lesson_tags (lesson_id, tag_id) VALUES (?, ?)",
-                (lesson_id, tag_id),
-            )
-        await self._db.commit()
+        await self._link_tags("lesson_tags", "lesson_id", [(lesson_id, tag_names)])
 
     async def get_memory_tags(self, memory_id: int) -> list[str]:
         """Get tag names for a memory."""
-        cursor = await self._db.execute(
-            """SELECT t.name FROM tags t
-               INNER JOIN memory_tags mt ON mt.tag_id = t.id
-               WHERE mt.memory_id = ?""",
-            (memory_id,),
-        )
-        rows = await cursor.fetchall()
+        async with self._read() as db:
+            cursor = await db.execute(
+                """SELECT t.name FROM tags t
+                   INNER JOIN memory_tags mt ON mt.tag_id = t.id
+                   WHERE mt.memory_id = ?""",
+                (memory_id,),
+            )
+            rows = await cursor.fetchall()
         return [r["name"] for r in rows]
 
     async def get_tag_count_for_memory(self, memory_id: int) -> int:
         """Get number of tags for a memory (used in importance calculation)."""
-        cursor = await self._db.execute(
-            "SELECT COUNT(*) as cnt FROM memory_tags WHERE memory_id = ?", (memory_id,)
-        )
-        row = await cursor.fetchone()
+        async with self._read() as db:
+            cursor = await db.execute(
+                "SELECT COUNT(*) as cnt FROM memory_tags WHERE memory_id = ?", (memory_id,)
+            )
+            row = await cursor.fetchone()
         return row["cnt"]
 
     # --- Projects ---
 
     async def create_project(self, name: str, description: str = "") -> int:
         """Create a named project."""
-        cursor = await self._db.execute(
-            "INSERT OR IGNORE INTO projects (name, description) VALUES (?, ?)",
-            (name, description),
-        )
-        await self._db.commit()
+        async with self.transaction():
+            cursor = await self._db.execute(
+                "INSERT OR IGNORE INTO projects (name, description) VALUES (?, ?)",
+                (name, description),
+            )
         return cursor.lastrowid
 
     async def list_projects(self) -> list[dict]:
         """List all projects."""
-        cursor = await self._db.execute(
-            "SELECT * FROM projects ORDER BY last_active DESC"
-        )
-        rows = await cursor.fetchall()
+        async with self._read() as db:
+            cursor = await db.execute(
+                "SELECT * FROM projects ORDER BY last_active DESC"
+            )
+            rows = await cursor.fetchall()
         return [dict(r) for r in rows]
+
+    # --- Meta ---
+
+    async def get_meta(self, key: str) -> Optional[str]:
+        """Read a store-level flag or value (e.g. completed one-time migrations)."""
+        async with self._read() as db:
+            cursor = await db.execute("SELECT value FROM meta WHERE key = ?", (key,))
+            row = await cursor.fetchone()
+        return row["value"] if row else None
+
+    async def set_meta(self, key: str, value: str):
+        """Write a store-level flag or value."""
+        async with self.transaction():
+            await self._db.execute(
+                "INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)", (key, value)
+            )
+
+    # --- Ingest queue ---
+
+    async def enqueue_ingest(self, session_id: Optional[int], role: str, content: str) -> int:
+        """Persist a message awaiting memory processing and return its queue ID."""
+        async with self.transaction():
+            cursor = await self._db.execute(
+                "INSERT INTO ingest_queue (session_id, role, content) VALUES (?, ?, ?)",
+                (session_id, role, content),
+            )
+        return cursor.lastrowid
+
+    async def claim_ingest(
+        self, limit: int, ingest_ids: Optional[list[int]] = None,
+    ) -> list[dict]:
+        """Mark up to ``limit`` due items in-flight and return them.
+
+        Due items are pending ones and stored ones whose embedding is
+        outstanding (``memory_id`` set). ``ingest_ids`` restricts the claim
+        to those items.
+        """
+        sql = """SELECT id, session_id, role, content, attempts, memory_id FROM ingest_queue
+                 WHERE status IN ('pending', 'stored') AND next_attempt_at <= ?"""
+        params: list = [time.time()]
+        if ingest_ids is not None:
+            if not ingest_ids:
+                return []
+            sql += f" AND id IN ({', '.join('?' for _ in ingest_ids)})"
+            params.extend(ingest_ids)
+        sql += " ORDER BY id LIMIT ?"
+        params.append(limit)
+
+        async with self.transaction():
+            cursor = await self._db.execute(sql, params)
+            rows = [dict(r) for r in await cursor.fetchall()]
+            if rows:
+                placeholders = ", ".join("?" for _ in rows)
+                await self._db.execute(
+                    f"""UPDATE ingest_queue SET status = 'in_flight', attempts = attempts + 1
+                        WHERE id IN ({placeholders})""",
+                    [r["id"] for r in rows],
+                )
+        return rows
+
+    async def set_ingest_memories(self, memory_ids: dict[int, int]):
+        """Record the memory stored for each queue item (ingest ID -> memory ID)."""
+        async with self.transaction():
+            await self._db.executemany(
+                "UPDATE ingest_queue SET memory_id = ? WHERE id = ?",
+                [(memory_id, ingest_id) for ingest_id, memory_id in memory_ids.items()],
+            )
+
+    async def complete_ingest(self, ingest_ids: list[int]):
+        """Remove finished items from the queue."""
+        if not ingest_ids:
+            return
+        placeholders = ", ".join("?" for _ in ingest_ids)
+        async with self.transaction():
+            await self._db.execute(
+                f"DELETE FROM ingest_queue WHERE id IN ({placeholders})",
+                ingest_ids,
+            )
+
+    async def fail_ingest(self, ingest_id: int, error: str, retry_at: Optional[float]):
+        """Return a queue item for retry at ``retry_at``, or mark it failed if None.
+
+        Items whose memory was already written resume at the embed step.
+        """
+        async with self.transaction():
+            if retry_at is None:
+                await self._db.execute(
+                    "UPDATE ingest_queue SET status = 'failed', last_error = ? WHERE id = ?",
+                    (error, ingest_id),
+                )
+            else:
+                await self._db.execute(
+                    f"""UPDATE ingest_queue SET status = {_RESUME_STATUS}, last_error = ?,
+                        next_attempt_at = ? WHERE id = ?""",
+                    (error, retry_at, ingest_id),
+                )
+
+    async def requeue_in_flight_ingest(self) -> int:
+        """Return items left in-flight by a previous process to pending or stored."""
+        async with self.transaction():
+            cursor = await self._db.execute(
+                f"UPDATE ingest_queue SET status = {_RESUME_STATUS} WHERE status = 'in_flight'"
+            )
+        return cursor.rowcount
+
+    async def count_active_ingest(self, ingest_ids: list[int]) -> int:
+        """How many of the given queue items are in-flight or due for processing."""
+        if not ingest_ids:
+            return 0
+        placeholders = ", ".join("?" for _ in ingest_ids)
+        async with self._read() as db:
+            cursor = await db.execute(
+                f"""SELECT COUNT(*) AS cnt FROM ingest_queue
+                    WHERE id IN ({placeholders})
+                    AND (status = 'in_flight'
+                         OR (status IN ('pending', 'stored') AND next_attempt_at <= ?))""",
+                [*ingest_ids, time.time()],
+            )
+            row = await cursor.fetchone()
+        return row["cnt"]
+
+    async def get_ingest_counts(self) -> dict[str, int]:
+        """Number of queue items per status."""
+        async with self._read() as db:
+            cursor = await db.execute(
+                "SELECT status, COUNT(*) as cnt FROM ingest_queue GROUP BY status"
+            )
+            rows = await cursor.fetchall()
+        return {r["status"]: r["cnt"] for r in rows}
@@ -3,7 +3,11 @@
 Extracts topic tags, behavior tags, and background triggers from messages.
 """
 
+import os
 import re
+from concurrent.futures import Executor, Future, ProcessPoolExecutor
+from itertools import islice
+from typing import Iterable, Iterator, NamedTuple, Optional
 
 # Topic patterns: tag_name -> list of regex patterns
 TOPIC_PATTERNS: dict[str, list[str]] = {
@@ -152,15 +156,39 @@ BACKGROUND_TRIGGER_PATTERNS: dict[str, list[str]] = {
 }
 
 
+class MessageTags(NamedTuple):
+    """Everything the tagger extracts from one message."""
+    topics: list[str]
+    behavior: list[str]
+    background: list[str]
+
+
+# Matchers compiled once at import; each topic's patterns form one alternation
+_TOPIC_MATCHERS: list[tuple[str, re.Pattern]] = [
+    (tag_name, re.compile("|".join(f"(?:{p})" for p in patterns), re.IGNORECASE))
+    for tag_name, patterns in TOPIC_PATTERNS.items()
+]
+_BEHAVIOR_MATCHERS: list[tuple[str, list[str], list[re.Pattern]]] = [
+    (
+        tag_name,
+        [trigger.lower() for trigger in strong],
+        [re.compile(rf"\b{re.escape(trigger)}\b", re.IGNORECASE) for trigger in soft],
+    )
+    for tag_name, (strong, soft) in BEHAVIOR_PATTERNS.items()
+]
+_BACKGROUND_MATCHERS: list[tuple[str, list[str]]] = [
+    (tag_name, [phrase.lower() for phrase in phrases])
+    for tag_name, phrases in BACKGROUND_TRIGGER_PATTERNS.items()
+]
+
+
 def tag_topics(message: str) -> list[str]:
-    """Extract topic tags from a message using regex patterns."""
-    tags = set()
-    for tag_name, patterns in TOPIC_PATTERNS.items():
-        for pattern in patterns:
-            if re.search(pattern, message, re.IGNORECASE):
-                tags.add(tag_name)
-                break
-    return list(tags)
+    """Extract topic tags from a message using regex patterns.
+
+    Tags come back in TOPIC_PATTERNS order, so results (and which topics
+    survive the max_tags cap) are the same in every process.
+    """
+    return [tag_name for tag_name, matcher in _TOPIC_MATCHERS if matcher.search(message)]
 
 
 def tag_behavior(message: str, confidence_threshold: int = 1) -> list[str]:
@@ -169,16 +197,18 @@ def tag_behavior(message: str, confidence_threshold: int = 1) -> list[str]:
     Strong triggers add +2 to score, soft triggers add +1.
     Tags with score >= confidence_threshold are included.
     """
-    scores: dict[str, int] = {}
+    return _tag_behavior(message, message.lower(), confidence_threshold)
+
 
-    for tag_name, (strong, soft) in BEHAVIOR_PATTERNS.items():
+def _tag_behavior(message: str, lowered: str, confidence_threshold: int) -> list[str]:
+    scores: dict[str, int] = {}
+    for tag_name, strong, soft in _BEHAVIOR_MATCHERS:
         for trigger in strong:
-            if trigger.lower() in message.lower():
+            if trigger in lowered:
                 scores[tag_name] = scores.get(tag_name, 0) + 2
 
-        for trigger in soft:
-            pattern = rf"\b{re.escape(trigger)}\b"
-            if re.search(pattern, message, re.IGNORECASE):
+        for matcher in soft:
+            if matcher.search(message):
                 scores[tag_name] = scores.get(tag_name, 0) + 1
 
     result = [tag for tag, score in scores.items() if score >= confidence_threshold]
@@ -187,13 +217,28 @@ def tag_behavior(message: str, confidence_threshold: int = 1) -> list[str]:
 
 def detect_background_triggers(message: str) -> list[str]:
     """Detect background actionable triggers in a message."""
-    triggers = set()
-    for tag_name, phrases in BACKGROUND_TRIGGER_PATTERNS.items():
-        for phrase in phrases:
-            if phrase.lower() in message.lower():
-                triggers.add(tag_name)
-                break
-    return list(triggers)
+    return _detect_background_triggers(message.lower())
+
+
+def _detect_background_triggers(lowered: str) -> list[str]:
+    return [
+        tag_name for tag_name, phrases in _BACKGROUND_MATCHERS
+        if any(phrase in lowered for phrase in phrases)
+    ]
+
+
+def scan_message(message: str, confidence_threshold: int = 1) -> MessageTags:
+    """Topic, behavior and background tags of a message in one call.
+
+    Same results as tag_topics(), tag_behavior() and
+    detect_background_triggers(), with the message lowercased once.
+    """
+    lowered = message.lower()
+    return MessageTags(
+        tag_topics(message),
+        _tag_behavior(message, lowered, confidence_threshold),
+        _detect_background_triggers(lowered),
+    )
 
 
 def tag_message(message: str, max_tags: int = 7) -> list[str]:
@@ -219,3 +264,47 @@ def tag_message(message: str, max_tags: int = 7) -> list[str]:
         all_tags = (behavior_tags + topic_only)[:max_tags]
 
     return all_tags
+
+
+def _tag_chunk(messages: list[str], max_tags: int) -> list[list[str]]:
+    return [tag_message(message, max_tags) for message in messages]
+
+
+def tag_messages(
+    messages: Iterable[str],
+    max_tags: int = 7,
+    chunk_size: int = 256,
+    executor: Optional[Executor] = None,
+    workers: Optional[int] = None,
+) -> Iterator[list[str]]:
+    """Tag a stream of messages in parallel, yielding tags in input order.
+
+    Messages are consumed lazily in chunks of ``chunk_size`` and tagged in
+    a process pool (``executor``, or a pool created for the call).
+    ``workers`` is the pool's size, default the CPU count; at most two
+    chunks per worker are in flight, so memory stays bounded however long
+    the stream is. Results match tag_message().
+    """
+    workers = workers or os.cpu_count() or 1
+    own_executor = executor is None
+    if own_executor:
+        executor = ProcessPoolExecutor(max_workers=workers)
+    max_in_flight = 2 * workers
+
+    it = iter(messages)
+    pending: list[Future] = []
+    try:
+        while True:
+            while len(pending) < max_in_flight:
+                chunk = list(islice(it, chunk_size))
+                if not chunk:
+                    break
+                pending.append(executor.submit(_tag_chunk, chunk, max_tags))
+            if not pending:
+                return
+            yield from pending.pop(0).result()
+    finally:
+        for future in pending:
+            future.cancel()
+        if own_executor:
+            executor.shutdown()
@@ -0,0 +1,172 @@
+"""Token counting for context budgeting (replaces TokenEstimator.cs).
+
+Counts come from a tiktoken encoding chosen by model family and are cached
+by text hash, since the same memories and session messages are counted
+over and over. Ollama's models don't ship tiktoken vocabularies, so these
+are close proxies rather than exact counts.
+
+tiktoken downloads an encoding's BPE file on first use and keeps it in
+``TIKTOKEN_CACHE_DIR`` (default: ``<tmp>/data-gym-cache``). For offline
+machines, copy the file there or point ``cache_dir`` at a populated
+directory. When tiktoken or the encoding is unavailable, or loading takes
+longer than ``load_timeout``, counting falls back to the chars / 4
+approximation.
+"""
+
+import hashlib
+import logging
+import os
+import threading
+from collections import OrderedDict
+from typing import Any, Optional
+
+logger = logging.getLogger(__name__)
+
+APPROXIMATE = "approx"
+
+# Model family (name prefix before the tag) -> tiktoken encoding
+DEFAULT_ENCODINGS = {
+    "qwen": "cl100k_base",
+    "llama": "cl100k_base",
+    "gemma": "o200k_base",
+    "mistral": "cl100k_base",
+    "phi": "cl100k_base",
+    "deepseek": "cl100k_base",
+}
+
+
+def approximate_tokens(text: str) -> int:
+    """Rough token estimate (text.length / 4). Port of TokenEstimator.cs."""
+    if not text:
+        return 0
+    return len(text) // 4
+
+
+def encoding_for_model(model: str, encodings: Optional[dict[str, str]] = None) -> str:
+    """Encoding for a model name like ``qwen3:14b``, or APPROXIMATE if its family is unknown."""
+    family = model.split("/")[-1].split(":")[0].lower()
+    for prefix, encoding in (encodings or DEFAULT_ENCODINGS).items():
+        if family.startswith(prefix.lower()):
+            return encoding
+    return APPROXIMATE
+
+
+class TokenCounter:
+    """Counts tokens with one tiktoken encoding, behind an LRU keyed by text hash.
+
+    The encoding is loaded on first use (or by ``load()``); if that fails
+    or takes longer than ``load_timeout`` seconds the counter logs once and
+    uses approximate_tokens from then on. ``cache_dir`` sets where tiktoken
+    looks for (and stores) BPE files.
+    """
+
+    def __init__(
+        self,
+        encoding: str = APPROXIMATE,
+        cache_size: int = 4096,
+        load_timeout: float = 10.0,
+        cache_dir: Optional[str] = None,
+    ):
+        self.encoding_name = encoding
+        self.cache_size = cache_size
+        self.load_timeout = load_timeout
+        self.cache_dir = cache_dir
+        self._encoding: Any = None
+        self._loaded = encoding == APPROXIMATE
+        self._cache: OrderedDict[bytes, int] = OrderedDict()
+        self._lock = threading.Lock()
+
+    @classmethod
+    def for_model(
+        cls,
+        model: str,
+        encodings: Optional[dict[str, str]] = None,
+        **kwargs,
+    ) -> "TokenCounter":
+        return cls(encoding_for_model(model, encodings), **kwargs)
+
+    @property
+    def exact(self) -> bool:
+        """Whether counts come from a real tokenizer."""
+        self.load()
+        return self._encoding is not None
+
+    def load(self):
+        """Load the encoding now rather than on the first count.
+
+        Blocks for at most ``load_timeout`` seconds. A download still running
+        then is left to finish in the background, but its result is unused.
+        """
+        if self._loaded:
+            return
+        with self._lock:
+            if self._loaded:
+                return
+            result: dict[str, Any] = {}
+            loader = threading.Thread(
+                target=self._load_encoding, args=(result,), daemon=True,
+                name=f"tiktoken-{self.encoding_name}",
+            )
+            loader.start()
+            loader.join(self.load_timeout)
+            if loader.is_alive():
+                result["error"] = f"timed out after {self.load_timeout}s"
+            if "encoding" in result:
+                self._encoding = result["encoding"]
+            else:
+                logger.warning(
+                    "Tokenizer %s unavailable, approximating token counts: %s",
+                    self.encoding_name, result.get("error"),
+                )
+            self._loaded = True
+
+    def _load_encoding(self, result: dict[str, Any]):
+        try:
+            import tiktoken
+            if self.cache_dir:
+                # tiktoken reads its cache location from the environment
+                os.environ["TIKTOKEN_CACHE_DIR"] = self.cache_dir
+            result["encoding"] = tiktoken.get_encoding(self.encoding_name)
+        except Exception as e:
+            result["error"] = e
+
+    def count(self, text: str) -> int:
+        """Number of tokens in text."""
+        if not text:
+            return 0
+        self.load()
+        if self._encoding is None:
+            return approximate_tokens(text)
+
+        key = hashlib.blake2b(text.encode("utf-8"), digest_size=16).digest()
+        with self._lock:
+            cached = self._cache.get(key)
+            if cached is not None:
+                self._cache.move_to_end(key)
+                return cached
+
+        tokens = len(self._encoding.encode(text, disallowed_special=()))
+        with self._lock:
+            self._cache[key] = tokens
+            if len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+        return tokens
+
+
+_counter = TokenCounter()
+
+
+def get_token_counter() -> TokenCounter:
+    """The process-wide counter used by estimate_tokens()."""
+    return _counter
+
+
+def set_token_counter(counter: TokenCounter):
+    """Replace the process-wide counter (the agent sets one for its chat model)."""
+    global _counter
+    _counter = counter
+
+
+def count_tokens(text: str) -> int:
+    """Count tokens with the process-wide counter."""
+    return _counter.count(text)
@@ -51,6 +51,17 @@ class MemoryConfig(BaseModel):
     min_rank_threshold: int = 3
     importance_recency_bonus: float = 0.1
     importance_tag_bonus: float = 0.05
+    processing_concurrency: int = 4
+    combined_analysis: bool = True
+    ingest_workers: int = 2
+    ingest_batch_size: int = 8
+    ingest_max_attempts: int = 5
+    ingest_backoff_base: float = 2.0
+    # Model family prefix -> tiktoken encoding ("approx" = chars / 4); empty uses built-in defaults
+    tokenizer_encodings: dict[str, str] = Field(default_factory=dict)
+    token_cache_size: int = 4096
+    tokenizer_load_timeout: float = 10.0  # seconds before falling back to chars / 4
+    tokenizer_cache_dir: Optional[str] = None  # tiktoken BPE files; pre-populate when offline
 
 
 class SessionConfig(BaseModel):
@@ -71,6 +82,8 @@ class AgentConfig(BaseModel):
         "Be concise and helpful. Use your memory to provide personalized assistance."
     )
     stream: bool = True
+    job_aging_rate: float = 1.0
+    overflow_summary_timeout: float = 120.0
 
 
 class ShellToolConfig(BaseModel):
@@ -93,6 +106,10 @@ class WebToolConfig(BaseModel):
     """Web tool configuration."""
     max_fetch_size: int = 524288
     timeout: int = 15
+    max_connections: int = 10
+    http2: bool = True
+    cache_path: Optional[str] = "data/web_cache.db"
+    cache_max_entries: int = 500
 
 
 class ToolsConfig(BaseModel):
@@ -117,6 +134,31 @@ class DatabaseConfig(BaseModel):
     """Database paths configuration."""
     path: str = "data/blipshell.db"
     chroma_path: str = "data/chroma"
+    embedding_cache_path: str = "data/embedding_cache.db"
+    embedding_cache_max_entries: int = 100000
+    embed_batch_size: int = 64
+    chroma_host: Optional[str] = None
+    chroma_port: int = 8000
+    chroma_query_workers: int = 4
+    chroma_write_workers: int = 1
+    read_pool_size: int = 4
+    acquire_timeout: float = 10.0
+    mmap_size: int = 268435456
+    cache_size_kb: int = 16384
+
+
+class LLMCacheConfig(BaseModel):
+    """LLM response cache configuration."""
+    path: Optional[str] = "data/llm_cache.db"
+    memory_max_bytes: int = 4194304
+    disk_max_bytes: int = 67108864
+    ttls: dict[str, Optional[float]] = Field(default_factory=lambda: {
+        "reasoning": 3600,
+        "tool_calling": 0,
+        "coding": 3600,
+        "summarization": 2592000,
+        "ranking": 2592000,
+    })
 
 
 class WebUIConfig(BaseModel):
@@ -144,4 +186,5 @@ class BlipShellConfig(BaseModel):
     noise: NoiseConfig = NoiseConfig()
     tagging: TaggingConfig = TaggingConfig()
     database: DatabaseConfig = DatabaseConfig()
+    llm_cache: LLMCacheConfig = LLMCacheConfig()
     web_ui: WebUIConfig = WebUIConfig()
@@ -38,6 +38,14 @@ class Memory(BaseModel):
     metadata_json: Optional[str] = None
 
 
+class MemoryAnalysis(BaseModel):
+    """Structured output of the combined memory-analysis prompt."""
+    summary: str = Field(min_length=1)
+    rank: int = Field(ge=1, le=5)
+    importance: float = Field(ge=0.0, le=1.0)
+    lesson_candidate: Optional[str] = None
+
+
 class CoreMemory(BaseModel):
     """A persistent core memory (user preferences, facts, personality traits)."""
     id: Optional[int] = None
@@ -37,6 +37,21 @@ class SessionMessage(BaseModel):
         return msg
 
 
+class ChatEventType(str, Enum):
+    """Kinds of event produced while the agent answers a message."""
+    TOKEN = "token"
+    TOOL_START = "tool_start"
+    TOOL_RESULT = "tool_result"
+    DONE = "done"
+
+
+class ChatEvent(BaseModel):
+    """A single event from Agent.chat_stream."""
+    type: ChatEventType
+    content: str = ""
+    tool_name: Optional[str] = None
+
+
 class Session(BaseModel):
     """A conversation session (port of C# ConversationMemory)."""
     id: Optional[int] = None
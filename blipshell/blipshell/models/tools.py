@@ -77,6 +77,7 @@ class ToolResult(BaseModel):
     result: str
     success: bool = True
     execution_time_ms: float = 0.0
+    cached: bool = False  # served from the tool result cache
     timestamp: datetime = Field(default_factory=datetime.utcnow)
 
     def to_ollama_message(self) -> dict:
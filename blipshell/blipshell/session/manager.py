@@ -9,12 +9,14 @@ import re
 from datetime import datetime
 from typing import Optional
 
+from blipshell.llm.job_queue import PRIORITY_BACKGROUND
 from blipshell.llm.prompts import (
     generate_session_title,
     summarize_session_conversation,
     summarize_session_summaries,
 )
 from blipshell.llm.router import LLMRouter, TaskType
+from blipshell.memory.ingest import IngestQueue
 from blipshell.memory.manager import MemoryManager, PoolItem, estimate_tokens
 from blipshell.memory.processor import MemoryProcessor
 from blipshell.memory.sqlite_store import SQLiteStore
@@ -29,7 +31,7 @@ class SessionManager:
     Port of SessionManager.cs with enhancements:
     - In-memory message tracking
     - Text cleaning
-    - Dump-to-memory lifecycle
+    - Dump-to-memory lifecycle (via the durable ingest queue)
     - Session summary generation (chunk 20 → summarize → meta-summarize → title)
     - Named projects
     - Session resume
@@ -41,19 +43,21 @@ class SessionManager:
         memory_manager: MemoryManager,
         processor: MemoryProcessor,
         router: LLMRouter,
+        ingest: IngestQueue,
         summary_chunk_size: int = 20,
     ):
         self.sqlite = sqlite
         self.memory_manager = memory_manager
         self.processor = processor
         self.router = router
+        self.ingest = ingest
         self.summary_chunk_size = summary_chunk_size
 
         self.session_id: Optional[int] = None
         self.project: Optional[str] = None
         self._messages: list[SessionMessage] = []
         self._dumped_indices: set[int] = set()
-        self._currently_saving = False
+        self._ingest_ids: list[int] = []
 
     async def start_session(
         self, project: Optional[str] = None, resume_session_id: Optional[int] = None
@@ -84,6 +88,7 @@ class SessionManager:
         )
         self._messages.clear()
         self._dumped_indices.clear()
+        self._ingest_ids.clear()
         logger.info("Started new session %d (project=%s)", self.session_id, project)
         return self.session_id
 
@@ -123,46 +128,49 @@ class SessionManager:
         ]
 
     async def dump_to_memory(self):
-        """Dump undumped messages to persistent memory.
+        """Queue undumped messages for memory processing.
 
-        Port of MemoryDB.DumpConversationToMemory().
+        Port of MemoryDB.DumpConversationToMemory(). Messages are written to
+        the durable ingest queue and processed by its workers, so this only
+        costs a few small writes and nothing is lost on restart.
         """
-        if self._currently_saving or not self.session_id:
+        if not self.session_id:
             return
 
-        self._currently_saving = True
-        try:
-            undumped = [
-                (i, msg) for i, msg in enumerate(self._messages)
-                if i not in self._dumped_indices
-            ]
-
-            for idx, msg in undumped:
-                if msg.role in (MessageRole.USER, MessageRole.ASSISTANT):
-                    await self.processor.process_message(
-                        text=msg.content,
-                        role=msg.role.value,
-                        session_id=self.session_id,
-                    )
-                    self._dumped_indices.add(idx)
+        undumped = [
+            (i, msg) for i, msg in enumerate(self._messages)
+            if i not in self._dumped_indices
+            and msg.role in (MessageRole.USER, MessageRole.ASSISTANT)
+        ]
+        # Claim before awaiting so an overlapping call doesn't queue them twice
+        self._dumped_indices.update(idx for idx, _ in undumped)
+        queued = len(self._ingest_ids)
 
-            await self.sqlite.update_session(
-                self.session_id,
-                last_active=datetime.utcnow().isoformat(),
-                message_count=len(self._messages),
-            )
+        try:
+            async with self.sqlite.transaction():
+                for _, msg in undumped:
+                    self._ingest_ids.append(await self.ingest.enqueue(
+                        self.session_id, msg.role.value, msg.content
+                    ))
+                await self.sqlite.update_session(
+                    self.session_id,
+                    last_active=datetime.utcnow().isoformat(),
+                    message_count=len(self._messages),
+                )
         except Exception as e:
-            logger.error("Failed to dump session to memory: %s", e)
-        finally:
-            self._currently_saving = False
+            self._dumped_indices.difference_update(idx for idx, _ in undumped)
+            del self._ingest_ids[queued:]
+            logger.error("Failed to queue session messages for memory: %s", e)
 
     async def end_session(self):
         """End the current session: dump remaining messages, generate summary."""
         if not self.session_id:
             return
 
-        # Dump any remaining messages
+        # Dump any remaining messages and wait for this session's to be processed
         await self.dump_to_memory()
+        await self.ingest.drain(self._ingest_ids)
+        self._ingest_ids.clear()
 
         # Generate session summary
         await self._create_session_summary()
@@ -197,6 +205,7 @@ class SessionManager:
                     chunk_summary = await self.router.generate(
                         TaskType.SUMMARIZATION,
                         summarize_session_summaries(chunk_text),
+                        priority=PRIORITY_BACKGROUND,
                     )
                     chunk_summaries.append(chunk_summary)
                 except Exception as e:
@@ -208,6 +217,7 @@ class SessionManager:
                 summary = await self.router.generate(
                     TaskType.SUMMARIZATION,
                     summarize_session_summaries("\n".join(chunk_summaries)),
+                    priority=PRIORITY_BACKGROUND,
                 )
             except Exception as e:
                 logger.error("Meta-summarization failed: %s", e)
@@ -219,6 +229,7 @@ class SessionManager:
                 summary = await self.router.generate(
                     TaskType.SUMMARIZATION,
                     summarize_session_conversation(all_text),
+                    priority=PRIORITY_BACKGROUND,
                 )
             except Exception as e:
                 logger.error("Session summarization failed: %s", e)
@@ -229,6 +240,7 @@ class SessionManager:
             title = await self.router.generate(
                 TaskType.SUMMARIZATION,
                 generate_session_title(summary),
+                priority=PRIORITY_BACKGROUND,
             )
         except Exception as e:
             logger.error("Title generation failed: %s", e)
@@ -8,11 +8,13 @@ Usage:
     blipshell config                 # view/edit config
     blipshell memories search "query"  # search memories
     blipshell sessions               # list sessions
+    blipshell retag                  # re-tag all memories
     blipshell web                    # launch web UI
 """
 
 import asyncio
 import logging
+import os
 import sys
 
 import click
@@ -166,6 +168,19 @@ def _print_status(agent: Agent):
     table.add_row("Messages", str(status["message_count"]))
     table.add_row("Tools", ", ".join(status["tools"]))
     table.add_row("Queue Pending", str(status["job_queue_pending"]))
+    cache = status["llm_cache"]
+    if cache:
+        table.add_row(
+            "LLM Cache",
+            f"{cache['hits']} hits / {cache['misses']} misses / {cache['evictions']} evictions",
+        )
+    prompt = status["prompt_cache"]
+    if prompt.get("turns"):
+        table.add_row(
+            "Prompt Reuse",
+            f"{prompt['reused_tokens']}/{prompt['prompt_tokens']} tokens last turn, "
+            f"{prompt['total_reused_tokens']}/{prompt['total_prompt_tokens']} overall",
+        )
 
     console.print(table)
 
@@ -263,8 +278,10 @@ def search(ctx, query, limit):
         cfg = config_manager.load()
         agent = Agent(cfg, config_manager)
         await agent.initialize()
-
-        results = await agent.search.search(query=query, n_results=limit)
+        try:
+            results = await agent.search.search(query=query, n_results=limit)
+        finally:
+            await agent.close()
         if not results:
             console.print("[yellow]No results found.[/yellow]")
             return
@@ -289,7 +306,8 @@ def sessions(ctx, limit, project):
         config_manager = ConfigManager(ctx.obj.get("config_path"))
         cfg = config_manager.load()
 
-        sqlite = SQLiteStore(cfg.database.path)
+        # One-off listing: a single reader is enough
+        sqlite = SQLiteStore(cfg.database.path, read_pool_size=1)
         await sqlite.initialize()
 
         session_list = await sqlite.list_sessions(limit=limit, project=project)
@@ -321,6 +339,47 @@ def sessions(ctx, limit, project):
     asyncio.run(_list())
 
 
+@main.command()
+@click.option("--batch-size", default=5000, help="Memories read and written per batch")
+@click.option("--chunk-size", default=256, help="Messages per tagging job")
+@click.option("--workers", type=int, help="Tagging processes (default: CPU count)")
+@click.pass_context
+def retag(ctx, batch_size, chunk_size, workers):
+    """Re-tag every memory with the current tag patterns."""
+    async def _retag():
+        config_manager = ConfigManager(ctx.obj.get("config_path"))
+        cfg = config_manager.load()
+
+        sqlite = SQLiteStore(cfg.database.path, read_pool_size=1)
+        await sqlite.initialize()
+
+        total = 0
+        pool_size = workers or os.cpu_count() or 1
+        try:
+            with ProcessPoolExecutor(max_workers=pool_size) as pool:
+                async for batch in sqlite.iter_memory_contents(batch_size):
+                    texts = [content for _, content in batch]
+                    tags = await asyncio.to_thread(lambda: list(tag_messages(
+                        texts, max_tags=cfg.tagging.max_tags,
+                        chunk_size=chunk_size, executor=pool, workers=pool_size,
+                    )))
+                    await sqlite.replace_memory_tags(
+                        {memory_id: t for (memory_id, _), t in zip(batch, tags)}
+                    )
+                    total += len(batch)
+                    console.print(f"[dim]Re-tagged {total} memories...[/dim]")
+        finally:
+            await sqlite.close()
+
+        console.print(f"[green]Re-tagged {total} memories.[/green]")
+
+    from concurrent.futures import ProcessPoolExecutor
+
+    from blipshell.memory.sqlite_store import SQLiteStore
+    from blipshell.memory.tagger import tag_messages
+    asyncio.run(_retag())
+
+
 @main.command()
 @click.pass_context
 def web(ctx):
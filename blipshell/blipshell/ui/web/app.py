@@ -14,13 +14,14 @@ from fastapi.responses import HTMLResponse
 from fastapi.staticfiles import StaticFiles
 
 from blipshell.core.agent import Agent
+from blipshell.core.chat_session import ChatSession
 from blipshell.core.config import ConfigManager
 
 logger = logging.getLogger(__name__)
 
 STATIC_DIR = Path(__file__).parent / "static"
 
-# Global agent instance (created on startup)
+# Global agent instance (created on startup); each websocket gets its own ChatSession
 _agent: Optional[Agent] = None
 _config_manager: Optional[ConfigManager] = None
 
@@ -35,7 +36,7 @@ def create_app(config_path: str | None = None) -> FastAPI:
 
     @app.on_event("startup")
     async def startup():
-        nonlocal _agent, _config_manager
+        global _agent, _config_manager
         _config_manager = ConfigManager(config_path)
         config = _config_manager.load()
         _agent = Agent(config, _config_manager)
@@ -45,7 +46,7 @@ def create_app(config_path: str | None = None) -> FastAPI:
     @app.on_event("shutdown")
     async def shutdown():
         if _agent:
-            await _agent.end_session()
+            await _agent.close()
 
     # --- HTML ---
 
@@ -61,6 +62,8 @@ def create_app(config_path: str | None = None) -> FastAPI:
     @app.websocket("/ws/chat")
     async def websocket_chat(ws: WebSocket):
         await ws.accept()
+        chat: Optional[ChatSession] = None
+        reply_task: Optional[asyncio.Task] = None
 
         try:
             # Receive initial config (optional)
@@ -71,11 +74,11 @@ def create_app(config_path: str | None = None) -> FastAPI:
 
             # Start session
             rid = session_id if resume else None
-            sid = await _agent.start_session(project=project, resume_session_id=rid)
+            chat = await _agent.create_session(project=project, resume_session_id=rid)
 
-            await ws.send_json({"type": "session_started", "session_id": sid})
+            await ws.send_json({"type": "session_started", "session_id": chat.session_id})
 
-            # Chat loop
+            # Chat loop: replies stream from a task so a cancel can arrive mid-reply
             while True:
                 data = await ws.receive_json()
                 msg_type = data.get("type", "message")
@@ -84,32 +87,19 @@ def create_app(config_path: str | None = None) -> FastAPI:
                     user_msg = data.get("content", "")
                     if not user_msg:
                         continue
+                    if reply_task and not reply_task.done():
+                        await ws.send_json({"type": "error", "message": "A reply is already in progress"})
+                        continue
 
                     await ws.send_json({"type": "thinking"})
+                    reply_task = asyncio.create_task(_stream_reply(ws, chat, user_msg))
 
-                    # Stream response via WebSocket
-                    async def send_token(token: str):
-                        await ws.send_json({"type": "token", "content": token})
-
-                    # Use a wrapper since on_token needs to be sync
-                    tokens = []
-
-                    def collect_token(token: str):
-                        tokens.append(token)
-
-                    response = await _agent.chat(user_msg, on_token=collect_token)
-
-                    # Send collected tokens
-                    for token in tokens:
-                        await ws.send_json({"type": "token", "content": token})
-
-                    await ws.send_json({
-                        "type": "response_complete",
-                        "content": response,
-                    })
+                elif msg_type == "cancel":
+                    if reply_task and not reply_task.done():
+                        reply_task.cancel()
 
                 elif msg_type == "status":
-                    status = _agent.get_status()
+                    status = _agent.get_status(chat)
                     await ws.send_json({"type": "status", "data": status})
 
         except WebSocketDisconnect:
@@ -120,6 +110,36 @@ def create_app(config_path: str | None = None) -> FastAPI:
                 await ws.send_json({"type": "error", "message": str(e)})
             except Exception:
                 pass
+        finally:
+            if reply_task and not reply_task.done():
+                reply_task.cancel()
+                await asyncio.gather(reply_task, return_exceptions=True)
+            if chat:
+                try:
+                    await chat.end()
+                except Exception as e:
+                    logger.error("Failed to end session %s: %s", chat.session_id, e)
+
+    async def _stream_reply(ws: WebSocket, chat: ChatSession, user_msg: str):
+        """Forward chat events as they are produced.
+
+        Each send is awaited before the next event is pulled, so a slow
+        client slows generation instead of buffering tokens.
+        """
+        try:
+            async for event in chat.chat_stream(user_msg):
+                await ws.send_json(event.model_dump(mode="json"))
+        except asyncio.CancelledError:
+            try:
+                await ws.send_json({"type": "cancelled"})
+            except Exception:
+                pass
+        except Exception as e:
+            logger.error("Chat stream error: %s", e)
+            try:
+                await ws.send_json({"type": "error", "message": str(e)})
+            except Exception:
+                pass
 
     # --- REST Endpoints ---
 
@@ -254,6 +274,11 @@ def _default_html() -> str:
         }
         #sendBtn:hover { background: #00b8d4; }
         #sendBtn:disabled { opacity: 0.5; cursor: not-allowed; }
+        #stopBtn {
+            padding: 12px 24px; background: #f44336; color: #fff;
+            border: none; border-radius: 8px; cursor: pointer;
+            font-weight: bold; font-size: 14px;
+        }
     </style>
 </head>
 <body>
@@ -272,6 +297,7 @@ def _default_html() -> str:
             <textarea id="userInput" rows="1" placeholder="Type a message..."
                       onkeydown="if(event.key==='Enter'&&!event.shiftKey){event.preventDefault();sendMessage()}"></textarea>
             <button id="sendBtn" onclick="sendMessage()">Send</button>
+            <button id="stopBtn" onclick="cancelReply()" style="display:none">Stop</button>
         </div>
     </div>
 
@@ -315,13 +341,25 @@ def _default_html() -> str:
                     currentResponse += data.content;
                     updateLastAssistant(currentResponse);
                     break;
-                case 'response_complete':
+                case 'tool_start':
+                    addSystemMessage(`Tool: ${data.tool_name}`);
+                    break;
+                case 'tool_result':
+                    addSystemMessage(`Result: ${data.content.slice(0, 200)}`);
+                    currentResponse = '';
+                    addAssistantMessage('');
+                    break;
+                case 'done':
                     updateLastAssistant(data.content);
-                    document.getElementById('sendBtn').disabled = false;
+                    setBusy(false);
+                    break;
+                case 'cancelled':
+                    addSystemMessage('Reply cancelled');
+                    setBusy(false);
                     break;
                 case 'error':
                     addSystemMessage('Error: ' + data.message);
-                    document.getElementById('sendBtn').disabled = false;
+                    setBusy(false);
                     break;
             }
         }
@@ -334,7 +372,16 @@ def _default_html() -> str:
             addUserMessage(msg);
             ws.send(JSON.stringify({type: 'message', content: msg}));
             input.value = '';
-            document.getElementById('sendBtn').disabled = true;
+            setBusy(true);
+        }
+
+        function cancelReply() {
+            if (ws && ws.readyState === 1) ws.send(JSON.stringify({type: 'cancel'}));
+        }
+
+        function setBusy(busy) {
+            document.getElementById('sendBtn').disabled = busy;
+            document.getElementById('stopBtn').style.display = busy ? '' : 'none';
         }
 
         function addUserMessage(text) {
@@ -346,6 +393,8 @@ def _default_html() -> str:
         }
 
         function addAssistantMessage(text) {
+            const prev = document.getElementById('lastAssistant');
+            if (prev) prev.removeAttribute('id');
             const div = document.createElement('div');
             div.className = 'message assistant';
             div.id = 'lastAssistant';
@@ -18,15 +18,35 @@ from pathlib import Path
 logging.basicConfig(level=logging.INFO, format="%(asctime)s %(message)s")
 logger = logging.getLogger(__name__)
 
+# Rows written per SQLite transaction
+DEFAULT_BATCH_SIZE = 500
+
 
 def dequantize(blob: bytes) -> list[float]:
     """Dequantize byte blob back to float array (port of C# Dequantize)."""
     return [(b - 128.0) / 127.0 for b in blob]
 
 
+def iter_batches(cursor: sqlite3.Cursor, batch_size: int):
+    """Yield lists of rows from a cursor, batch_size at a time."""
+    while True:
+        rows = cursor.fetchmany(batch_size)
+        if not rows:
+            break
+        yield rows
+
+
 async def migrate(source_db: str, target_db: str = "data/blipshell.db",
-                  chroma_path: str = "data/chroma"):
-    """Run the migration."""
+                  chroma_path: str = "data/chroma", batch_size: int = DEFAULT_BATCH_SIZE,
+                  embedding_cache: str | None = "data/embedding_cache.db",
+                  embed_batch_size: int = 64):
+    """Run the migration.
+
+    Target writes are grouped into one SQLite transaction per batch_size rows;
+    ChromaDB embeds run after each batch has been committed. Embeddings go
+    through the on-disk embedding cache, so re-running a migration does not
+    re-embed texts it has already seen.
+    """
     from blipshell.memory.chroma_store import ChromaStore
     from blipshell.memory.sqlite_store import SQLiteStore
     from blipshell.memory.tagger import tag_message
@@ -41,20 +61,24 @@ async def migrate(source_db: str, target_db: str = "data/blipshell.db",
     target = SQLiteStore(target_db)
     await target.initialize()
 
-    chroma = ChromaStore(chroma_path)
+    chroma = ChromaStore(chroma_path, cache_path=embedding_cache,
+                         embed_batch_size=embed_batch_size)
     chroma.initialize()
 
     # --- Migrate Sessions ---
     logger.info("Migrating sessions...")
     session_map = {}  # old_id -> new_id
     try:
-        for row in src.execute("SELECT * FROM Sessions ORDER BY ID"):
-            new_id = await target.create_session(
-                title=row["Title"] or "Imported Session",
-            )
-            session_map[row["ID"]] = new_id
-            if row["Summary"]:
-                await target.update_session(new_id, summary=row["Summary"])
+        cursor = src.execute("SELECT * FROM Sessions ORDER BY ID")
+        for rows in iter_batches(cursor, batch_size):
+            async with target.transaction():
+                for row in rows:
+                    new_id = await target.create_session(
+                        title=row["Title"] or "Imported Session",
+                    )
+                    session_map[row["ID"]] = new_id
+                    if row["Summary"]:
+                        await target.update_session(new_id, summary=row["Summary"])
         logger.info("  Migrated %d sessions", len(session_map))
     except Exception as e:
         logger.warning("  Session migration failed: %s", e)
@@ -62,65 +86,79 @@ async def migrate(source_db: str, target_db: str = "data/blipshell.db",
     # --- Migrate Memories ---
     logger.info("Migrating memories...")
     mem_count = 0
-    for row in src.execute("SELECT * FROM Memories ORDER BY ID"):
-        session_id = session_map.get(row["SessionID"])
-        memory = Memory(
-            session_id=session_id,
-            role=row["Speaker"] or "user",
-            content=row["Text"],
-            summary=row["SummaryText"] or row["Text"],
-            timestamp=row["TimeStamp"] or datetime.utcnow().isoformat(),
-            rank=int(row["Rank"]) if row["Rank"] else 3,
-            importance=float(row["Importance"]) if row["Importance"] else 0.3,
-            memory_type=MemoryType.CONVERSATION,
-        )
-        new_id = await target.create_memory(memory)
-
-        # Embed in ChromaDB (use summary for better search)
-        summary = row["SummaryText"] or row["Text"]
+    cursor = src.execute("SELECT * FROM Memories ORDER BY ID")
+    for rows in iter_batches(cursor, batch_size):
+        memories = []
+        async with target.transaction():
+            for row in rows:
+                session_id = session_map.get(row["SessionID"])
+                memory = Memory(
+                    session_id=session_id,
+                    role=row["Speaker"] or "user",
+                    content=row["Text"],
+                    summary=row["SummaryText"] or row["Text"],
+                    timestamp=row["TimeStamp"] or datetime.utcnow().isoformat(),
+                    rank=int(row["Rank"]) if row["Rank"] else 3,
+                    importance=float(row["Importance"]) if row["Importance"] else 0.3,
+                    memory_type=MemoryType.CONVERSATION,
+                )
+                memory.id = await target.create_memory(memory)
+                memories.append(memory)
+
+                # Migrate tags
+                try:
+                    tags = tag_message(row["Text"])
+                    await target.tag_memory(memory.id, tags)
+                except Exception:
+                    pass
+
+        # Embed in ChromaDB once the batch is committed (use summary for better search)
         try:
-            chroma.add_memory(new_id, summary, {
-                "session_id": str(session_id or 0),
-                "role": row["Speaker"] or "user",
-            })
+            chroma.add_memories(
+                [m.id for m in memories],
+                [m.summary for m in memories],
+                [chroma.memory_metadata(m) for m in memories],
+            )
         except Exception as e:
-            logger.warning("  ChromaDB embed failed for memory %d: %s", new_id, e)
+            logger.warning("  ChromaDB embed failed for memories %d-%d: %s",
+                           memories[0].id, memories[-1].id, e)
 
-        # Migrate tags
-        try:
-            tags = tag_message(row["Text"])
-            await target.tag_memory(new_id, tags)
-        except Exception:
-            pass
-
-        mem_count += 1
+        mem_count += len(memories)
     logger.info("  Migrated %d memories", mem_count)
 
     # --- Migrate Core Memories ---
     logger.info("Migrating core memories...")
     core_count = 0
     try:
-        for row in src.execute("SELECT * FROM CoreMemory WHERE IsActive = 1"):
-            cm = CoreMemory(
-                content=row["Content"],
-                category=row["Type"] or "general",
-                timestamp=row["Created"] or datetime.utcnow().isoformat(),
-                importance=float(row["Priority"]) if row["Priority"] else 0.5,
-            )
-            new_id = await target.create_core_memory(cm)
+        cursor = src.execute("SELECT * FROM CoreMemory WHERE IsActive = 1")
+        for rows in iter_batches(cursor, batch_size):
+            migrated = []
+            async with target.transaction():
+                for row in rows:
+                    cm = CoreMemory(
+                        content=row["Content"],
+                        category=row["Type"] or "general",
+                        timestamp=row["Created"] or datetime.utcnow().isoformat(),
+                        importance=float(row["Priority"]) if row["Priority"] else 0.5,
+                    )
+                    new_id = await target.create_core_memory(cm)
+                    migrated.append((new_id, row["Content"]))
+
+                    try:
+                        tags = tag_message(row["Content"])
+                        await target.tag_core_memory(new_id, tags)
+                    except Exception:
+                        pass
 
             try:
-                chroma.add_core_memory(new_id, row["Content"])
+                chroma.add_core_memories(
+                    [new_id for new_id, _ in migrated],
+                    [content for _, content in migrated],
+                )
             except Exception:
                 pass
 
-            try:
-                tags = tag_message(row["Content"])
-                await target.tag_core_memory(new_id, tags)
-            except Exception:
-                pass
-
-            core_count += 1
+            core_count += len(migrated)
         logger.info("  Migrated %d core memories", core_count)
     except Exception as e:
         logger.warning("  Core memory migration failed: %s", e)
@@ -129,25 +167,33 @@ async def migrate(source_db: str, target_db: str = "data/blipshell.db",
     logger.info("Migrating lessons...")
     lesson_count = 0
     try:
-        for row in src.execute("SELECT * FROM Lessons"):
-            lesson = Lesson(
-                content=row["Text"],
-                timestamp=row["TimeStamp"] or datetime.utcnow().isoformat(),
-            )
-            new_id = await target.create_lesson(lesson)
-
-            try:
-                chroma.add_lesson(new_id, row["Text"])
-            except Exception:
-                pass
+        cursor = src.execute("SELECT * FROM Lessons")
+        for rows in iter_batches(cursor, batch_size):
+            migrated = []
+            async with target.transaction():
+                for row in rows:
+                    lesson = Lesson(
+                        content=row["Text"],
+                        timestamp=row["TimeStamp"] or datetime.utcnow().isoformat(),
+                    )
+                    new_id = await target.create_lesson(lesson)
+                    migrated.append((new_id, row["Text"]))
+
+                    try:
+                        tags = tag_message(row["Text"])
+                        await target.tag_lesson(new_id, tags)
+                    except Exception:
+                        pass
 
             try:
-                tags = tag_message(row["Text"])
-                await target.tag_lesson(new_id, tags)
+                chroma.add_lessons(
+                    [new_id for new_id, _ in migrated],
+                    [text for _, text in migrated],
+                )
             except Exception:
                 pass
 
-            lesson_count += 1
+            lesson_count += len(migrated)
         logger.info("  Migrated %d lessons", lesson_count)
     except Exception as e:
         logger.warning("  Lesson migration failed: %s", e)
@@ -155,6 +201,7 @@ async def migrate(source_db: str, target_db: str = "data/blipshell.db",
     # Done
     src.close()
     await target.close()
+    chroma.close()
     logger.info("Migration complete!")
     logger.info("  Sessions: %d, Memories: %d, Core: %d, Lessons: %d",
                 len(session_map), mem_count, core_count, lesson_count)
@@ -165,9 +212,16 @@ def main():
     parser.add_argument("--source", required=True, help="Path to MemoryDatabase.db")
     parser.add_argument("--target", default="data/blipshell.db", help="Target SQLite path")
     parser.add_argument("--chroma", default="data/chroma", help="ChromaDB persist path")
+    parser.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE,
+                        help="Rows written per SQLite transaction")
+    parser.add_argument("--embed-batch-size", type=int, default=64,
+                        help="Texts per Ollama embed request")
+    parser.add_argument("--embedding-cache", default="data/embedding_cache.db",
+                        help="Embedding cache path (empty string to disable)")
     args = parser.parse_args()
 
-    asyncio.run(migrate(args.source, args.target, args.chroma))
+    asyncio.run(migrate(args.source, args.target, args.chroma, args.batch_size,
+                        args.embedding_cache or None, args.embed_batch_size))
 
 
 if __name__ == "__main__":
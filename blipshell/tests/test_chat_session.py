@@ -0,0 +1,74 @@
+"""Tests for ChatSession's prefix-stable prompt layout."""
+
+from types import SimpleNamespace
+
+import pytest
+
+from blipshell.core.chat_session import ChatSession
+from blipshell.core.tools.base import ToolRegistry
+from blipshell.memory.manager import PoolItem
+from blipshell.models.config import BlipShellConfig
+from blipshell.models.session import MessageRole
+
+
+@pytest.fixture
+def session():
+    agent = SimpleNamespace(
+        config=BlipShellConfig(), sqlite=None, router=None, endpoint_manager=None,
+        processor=None, search=None, ingest=None, tool_registry=ToolRegistry(),
+    )
+    session = ChatSession(agent)
+    memory = session.memory_manager
+    memory.add_memory("Core", PoolItem(text="user likes rust", session_role="system"))
+    memory.add_memory("RecentHistory", PoolItem(text="we fixed the build", session_role="system"))
+    return session
+
+
+def _turn(session: ChatSession, turn: int) -> list[dict]:
+    """Add a user message with fresh recall and build its prompt."""
+    session.session_manager.add_message(MessageRole.USER, f"question {turn}")
+    recall = session.memory_manager.get_pool("Recall")
+    recall.clear()
+    recall.add(PoolItem(text=f"recall for {turn}", session_role="system"))
+    messages = session._build_messages(f"question {turn}")
+    session.session_manager.add_message(MessageRole.ASSISTANT, f"answer {turn}")
+    return messages
+
+
+def test_stable_memory_leads_and_recall_sits_next_to_the_question(session):
+    messages = _turn(session, 0)
+    assert messages[0] == {"role": "system", "content": session.config.agent.system_prompt}
+    assert "CoreFoundation" in messages[1]["content"]
+    assert "RecentHistory" in messages[1]["content"]
+    assert "recall for 0" not in messages[1]["content"]
+    assert "RelevantMemory" in messages[-2]["content"]
+    assert messages[-1] == {"role": "user", "content": "question 0"}
+
+
+def test_prompt_prefix_is_stable_until_the_window_steps(session):
+    previous = None
+    window_starts = []
+    for turn in range(40):
+        messages = _turn(session, turn)
+        history = [m for m in messages[2:-2] if m["role"] in ("user", "assistant")]
+        window_starts.append(history[0]["content"] if history else None)
+        if previous is not None and window_starts[-1] == window_starts[-2]:
+            # Everything before last turn's recall block is sent again unchanged
+            stable = previous[:-2]
+            assert messages[:len(stable)] == stable
+            assert session._prompt_stats["reused_tokens"] > 0
+        previous = messages
+
+    # The window start only moves in HISTORY_STEP-message jumps (two messages per turn)
+    starts = [int(s.split()[1]) for s in window_starts if s]
+    moves = [b - a for a, b in zip(starts, starts[1:]) if b != a]
+    assert moves and all(m == ChatSession.HISTORY_STEP // 2 for m in moves)
+
+
+def test_turns_outside_the_window_move_into_the_memory_block(session):
+    for turn in range(30):
+        messages = _turn(session, turn)
+    replayed = {m["content"] for m in messages if m["role"] in ("user", "assistant")}
+    assert "question 0" not in replayed
+    assert "user: question 0" in messages[1]["content"]
+    assert "user: question 29" not in messages[1]["content"]
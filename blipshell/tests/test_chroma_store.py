@@ -0,0 +1,143 @@
+"""Tests for ChromaStore metadata filtering and the metadata backfill."""
+
+import itertools
+import time
+from datetime import datetime
+from types import SimpleNamespace
+
+import pytest
+
+from blipshell.memory.chroma_store import AsyncChromaStore, ChromaStore
+from blipshell.memory.embedding_cache import EmbeddingCache
+from blipshell.memory.processor import MemoryProcessor
+from blipshell.memory.sqlite_store import SQLiteStore
+from blipshell.models.memory import Memory
+
+
+class FakeEmbedder:
+    """Stands in for ollama.Client: every text maps to the same direction."""
+
+    def __init__(self):
+        self.calls: list[list[str]] = []
+
+    def embed(self, model, input):
+        self.calls.append(list(input))
+        return {"embeddings": [[1.0, float(len(text) % 3)] for text in input]}
+
+
+@pytest.fixture
+def chroma(tmp_path):
+    store = ChromaStore(str(tmp_path / "chroma"), cache_path=str(tmp_path / "emb.db"))
+    store.initialize()
+    store._embedder = FakeEmbedder()
+    yield store
+    store.close()
+
+
+@pytest.fixture
+async def sqlite(tmp_path):
+    store = SQLiteStore(str(tmp_path / "test.db"), read_pool_size=1)
+    await store.initialize()
+    yield store
+    await store.close()
+
+
+def _memory(memory_id: int, rank: int, archived: bool = False, session_id: int = 1) -> Memory:
+    return Memory(
+        id=memory_id, session_id=session_id, role="user", content=f"memory {memory_id}",
+        rank=rank, timestamp=datetime(2024, 1, 1), is_archived=archived,
+    )
+
+
+def test_search_filters_rank_archive_and_session_in_index(chroma):
+    memories = [
+        _memory(1, rank=4),
+        _memory(2, rank=1),
+        _memory(3, rank=5, archived=True),
+        _memory(4, rank=5, session_id=2),
+    ]
+    chroma.add_memories(
+        [m.id for m in memories], [m.content for m in memories],
+        [ChromaStore.memory_metadata(m) for m in memories],
+    )
+
+    where = {"$and": [
+        {"rank": {"$gte": 3}},
+        {"is_archived": False},
+        {"session_id": {"$ne": "2"}},
+    ]}
+    results = chroma.search_memories("query", n_results=10, where=where)
+    assert [r["id"] for r in results] == [1]
+
+
+async def test_backfill_mirrors_sqlite_state_onto_old_vectors(chroma, sqlite):
+    await sqlite.create_session()
+    old_id = await sqlite.create_memory(_memory(None, rank=4))
+    archived_id = await sqlite.create_memory(_memory(None, rank=5, archived=True))
+    # Vectors as written before the metadata was mirrored
+    chroma.add_memories([old_id, archived_id], ["old", "archived"])
+    where = {"$and": [{"rank": {"$gte": 3}}, {"is_archived": False}]}
+    assert chroma.search_memories("query", where=where) == []
+
+    async_chroma = AsyncChromaStore(chroma)
+    processor = MemoryProcessor(sqlite, async_chroma, router=None)
+    assert await processor.backfill_chroma_metadata() == 2
+    assert chroma.memory_ids_missing_metadata() == []
+    assert [r["id"] for r in chroma.search_memories("query", where=where)] == [old_id]
+
+
+@pytest.fixture
+def non_utc_host(monkeypatch):
+    monkeypatch.setenv("TZ", "America/New_York")
+    time.tzset()
+    yield
+    monkeypatch.undo()
+    time.tzset()
+
+
+async def test_mirrored_timestamp_is_utc_epoch(non_utc_host, sqlite):
+    # Read as local time, the naive timestamp would be 5 hours off here
+    assert datetime(2024, 1, 1).timestamp() != 1704067200.0
+    assert ChromaStore.memory_metadata(_memory(1, rank=3))["timestamp"] == 1704067200.0
+
+    await sqlite.create_session()
+    memory_id = await sqlite.create_memory(_memory(None, rank=3))
+    stored = await sqlite.get_memory(memory_id)
+    assert ChromaStore.memory_metadata(stored)["timestamp"] == 1704067200.0
+
+def test_embedding_cache_serves_repeats(chroma):
+    chroma.add_memories([1, 2], ["same text", "same text"])
+    chroma.add_memories([3], ["same text"])
+    chroma.add_memories([4], ["other text"])
+    assert chroma._embedder.calls == [["same text"], ["other text"]]
+
+
+def test_embedding_cache_evicts_least_recently_used(tmp_path, monkeypatch):
+    clock = itertools.count(1)
+    monkeypatch.setattr(
+        "blipshell.memory.embedding_cache.time", SimpleNamespace(time=lambda: next(clock))
+    )
+    cache = EmbeddingCache(str(tmp_path / "emb.db"), max_entries=2)
+    cache.initialize()
+    cache.put_many("m", ["a", "b"], [[1.0], [2.0]])
+    assert cache.get_many("m", ["a"]) == [[1.0]]  # "b" is now least recently used
+    cache.put_many("m", ["c"], [[3.0]])
+    assert cache.get_many("m", ["a", "b", "c"]) == [[1.0], None, [3.0]]
+    cache.close()
+
+
+def test_embedding_cache_survives_reopening(tmp_path):
+    path = str(tmp_path / "emb.db")
+    cache = EmbeddingCache(path, max_entries=2)
+    cache.initialize()
+    cache.put_many("m", ["a", "b"], [[0.5, -1.0], [2.0, 0.25]])
+    cache.close()
+
+    reopened = EmbeddingCache(path, max_entries=2)
+    reopened.initialize()
+    assert reopened.get_many("m", ["b", "a"]) == [[2.0, 0.25], [0.5, -1.0]]
+    assert reopened.get_many("other-model", ["a"]) == [None]
+    # The reopened cache knows it is full and still evicts
+    reopened.put_many("m", ["c"], [[3.0]])
+    assert reopened.get_many("m", ["a", "b", "c"]).count(None) == 1
+    reopened.close()
@@ -0,0 +1,120 @@
+"""Tests for LLMClient single-flight generate."""
+
+import asyncio
+
+import pytest
+
+from blipshell.llm import client as client_module
+from blipshell.llm.client import LLMClient
+from blipshell.llm.endpoints import EndpointManager
+from blipshell.llm.response_cache import ResponseCache
+from blipshell.llm.router import LLMRouter
+from blipshell.models.config import EndpointConfig, ModelsConfig
+
+
+class FakeOllama:
+    """Stands in for ollama.AsyncClient; chat blocks until ``release`` is set."""
+
+    def __init__(self, error: Exception | None = None):
+        self.calls = 0
+        self.cancelled = 0
+        self.error = error
+        self.release = asyncio.Event()
+
+    async def chat(self, model, messages, stream, **kwargs):
+        self.calls += 1
+        try:
+            await self.release.wait()
+        except asyncio.CancelledError:
+            self.cancelled += 1
+            raise
+        if self.error:
+            raise self.error
+        return {"message": {"content": "answer"}}
+
+
+@pytest.fixture
+def client():
+    llm = LLMClient(cache=ResponseCache())
+    llm._client = FakeOllama()
+    yield llm
+    assert client_module._in_flight == {}
+
+
+async def test_identical_calls_share_one_request(client):
+    released: list[str] = []
+    first = asyncio.create_task(
+        client.generate("p", "m", on_request_done=lambda ok: released.append("first"))
+    )
+    await asyncio.sleep(0)
+    second = asyncio.create_task(
+        client.generate("p", "m", on_request_done=lambda ok: released.append("second"))
+    )
+    await asyncio.sleep(0)
+    # The joiner started no request of its own
+    assert released == ["second"]
+
+    client._client.release.set()
+    assert await asyncio.gather(first, second) == ["answer", "answer"]
+    assert client._client.calls == 1
+    assert released == ["second", "first"]
+
+
+async def test_request_survives_while_any_caller_waits(client):
+    released: list[str] = []
+    first = asyncio.create_task(
+        client.generate("p", "m", on_request_done=lambda ok: released.append("first"))
+    )
+    await asyncio.sleep(0)
+    second = asyncio.create_task(client.generate("p", "m"))
+    await asyncio.sleep(0)
+
+    first.cancel()
+    await asyncio.sleep(0)
+    # Its caller left, but the request it started is still running for the other
+    assert released == [] and client._client.cancelled == 0
+
+    client._client.release.set()
+    assert await second == "answer"
+    assert released == ["first"]
+
+
+async def test_last_caller_leaving_cancels_the_request(client):
+    released: list[str] = []
+    first = asyncio.create_task(
+        client.generate("p", "m", on_request_done=lambda ok: released.append("first"))
+    )
+    await asyncio.sleep(0)
+    second = asyncio.create_task(client.generate("p", "m"))
+    await asyncio.sleep(0)
+
+    first.cancel()
+    second.cancel()
+    await asyncio.gather(first, second, return_exceptions=True)
+    await asyncio.sleep(0)
+    assert client._client.cancelled == 1
+    assert released == ["first"]
+
+
+async def test_shared_failure_counts_once_against_the_serving_endpoint():
+    manager = EndpointManager([
+        EndpointConfig(name="main", priority=2, max_concurrent=2),
+        EndpointConfig(name="spare", priority=1, max_concurrent=1),
+    ])
+    main, spare = manager._endpoints
+    for ep in manager._endpoints:
+        ep.client._client = FakeOllama(error=RuntimeError("server error"))
+    router = LLMRouter(ModelsConfig(), manager)
+
+    calls = [asyncio.create_task(router.generate("reasoning", "p")) for _ in range(3)]
+    await asyncio.sleep(0.01)
+    # Two callers joined the first one's request, one of them on the other endpoint
+    assert (main.active_requests, spare.active_requests) == (1, 0)
+    assert main.client._client.calls == 1 and spare.client._client.calls == 0
+
+    main.client._client.release.set()
+    results = await asyncio.gather(*calls, return_exceptions=True)
+    assert all(isinstance(r, RuntimeError) for r in results)
+    assert (main.failure_count, spare.failure_count) == (1, 0)
+    assert main.enabled and spare.enabled
+    assert main.active_requests == 0
@@ -0,0 +1,98 @@
+"""Tests for EndpointManager role routing and slot acquisition."""
+
+import asyncio
+
+from blipshell.llm.endpoints import EndpointManager
+from blipshell.models.config import EndpointConfig
+
+
+def _manager(*configs: EndpointConfig) -> EndpointManager:
+    return EndpointManager(list(configs))
+
+
+def test_busy_role_does_not_spill_onto_other_endpoints():
+    manager = _manager(
+        EndpointConfig(name="chat", roles=["reasoning"], max_concurrent=2),
+        EndpointConfig(name="bg", roles=["summarization"], max_concurrent=1),
+    )
+    bg = manager.get_endpoint_for_role("summarization")
+    assert bg.name == "bg"
+    bg.start_request()
+    assert manager.get_endpoint_for_role("summarization") is None
+
+
+def test_role_without_enabled_endpoint_falls_back_to_any():
+    manager = _manager(
+        EndpointConfig(name="chat", roles=["reasoning"], max_concurrent=2),
+        EndpointConfig(name="bg", roles=["summarization"], enabled=False),
+    )
+    assert manager.get_endpoint_for_role("summarization").name == "chat"
+    assert manager.capacity_for_role("summarization") == 2
+
+
+async def test_acquire_waits_for_a_slot_on_a_serving_endpoint():
+    manager = _manager(
+        EndpointConfig(name="chat", roles=["reasoning"], max_concurrent=1),
+        EndpointConfig(name="bg", roles=["summarization"], max_concurrent=1),
+    )
+    held = await manager.acquire_endpoint_for_role("summarization")
+    waiter = asyncio.create_task(manager.acquire_endpoint_for_role("summarization"))
+    await asyncio.sleep(0.01)
+    assert not waiter.done()
+
+    held.complete_request()
+    assert (await asyncio.wait_for(waiter, 1)).name == "bg"
+
+
+async def test_acquire_returns_none_without_enabled_endpoints():
+    manager = _manager(EndpointConfig(name="chat", enabled=False))
+    assert await manager.acquire_endpoint_for_role("reasoning") is None
+
+
+async def test_freed_slot_goes_to_the_highest_priority_waiter():
+    manager = _manager(EndpointConfig(name="chat", roles=["reasoning"], max_concurrent=1))
+    held = await manager.acquire_endpoint_for_role("reasoning")
+    background = asyncio.create_task(manager.acquire_endpoint_for_role("reasoning", 50))
+    await asyncio.sleep(0)
+    interactive = asyncio.create_task(manager.acquire_endpoint_for_role("reasoning", 0))
+    await asyncio.sleep(0)
+
+    held.complete_request()
+    await asyncio.sleep(0)
+    assert interactive.done() and not background.done()
+
+    interactive.result().complete_request()
+    assert (await asyncio.wait_for(background, 1)).name == "chat"
+
+
+async def test_cancelled_waiter_does_not_hold_a_slot():
+    manager = _manager(EndpointConfig(name="chat", roles=["reasoning"], max_concurrent=1))
+    held = await manager.acquire_endpoint_for_role("reasoning")
+    cancelled = asyncio.create_task(manager.acquire_endpoint_for_role("reasoning", 0))
+    waiter = asyncio.create_task(manager.acquire_endpoint_for_role("reasoning", 50))
+    await asyncio.sleep(0)
+    cancelled.cancel()
+    await asyncio.sleep(0)
+
+    held.complete_request()
+    assert (await asyncio.wait_for(waiter, 1)).active_requests == 1
+
+
+async def test_long_waiting_background_caller_ages_ahead_of_interactive():
+    manager = EndpointManager(
+        [EndpointConfig(name="chat", roles=["reasoning"], max_concurrent=1)],
+        aging_rate=10_000.0,
+    )
+    held = await manager.acquire_endpoint_for_role("reasoning")
+    background = asyncio.create_task(manager.acquire_endpoint_for_role("reasoning", 50))
+    # 20ms at 10k points/s is worth more than the 50-point priority gap
+    await asyncio.sleep(0.02)
+    interactive = asyncio.create_task(manager.acquire_endpoint_for_role("reasoning", 0))
+    await asyncio.sleep(0)
+
+    held.complete_request()
+    await asyncio.sleep(0)
+    assert background.done() and not interactive.done()
+
+    background.result().complete_request()
+    assert (await asyncio.wait_for(interactive, 1)).name == "chat"
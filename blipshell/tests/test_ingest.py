@@ -0,0 +1,145 @@
+"""Tests for the durable ingest queue."""
+
+import sqlite3
+import time
+
+import pytest
+
+from blipshell.memory.chroma_store import ChromaStore
+from blipshell.memory.ingest import IngestQueue
+from blipshell.memory.processor import MemoryProcessor
+from blipshell.memory.sqlite_store import SQLiteStore
+from blipshell.models.memory import Memory
+
+
+class FakeChroma:
+    """Records embedded memory IDs; fails while ``failures`` is positive."""
+
+    memory_metadata = staticmethod(ChromaStore.memory_metadata)
+
+    def __init__(self):
+        self.embedded: list[int] = []
+        self.failures = 0
+
+    async def add_memories(self, ids, texts, metadatas=None):
+        if self.failures:
+            self.failures -= 1
+            raise RuntimeError("chroma down")
+        self.embedded.extend(ids)
+
+
+class FakeProcessor(MemoryProcessor):
+    """Skips the LLM steps; "noise" messages are filtered out."""
+
+    def __init__(self, sqlite, chroma):
+        super().__init__(sqlite, chroma, router=None)
+        self.prepared: list[str] = []
+
+    async def prepare_memories(self, messages, session_id):
+        self.prepared.extend(text for text, _ in messages)
+        return [
+            None if text == "noise" else Memory(session_id=session_id, role=role, content=text)
+            for text, role in messages
+        ]
+
+
+@pytest.fixture
+async def sqlite(tmp_path):
+    store = SQLiteStore(str(tmp_path / "test.db"), read_pool_size=1)
+    await store.initialize()
+    yield store
+    await store.close()
+
+
+@pytest.fixture
+def chroma():
+    return FakeChroma()
+
+
+@pytest.fixture
+async def queue(sqlite, chroma):
+    session_id = await sqlite.create_session()
+    queue = IngestQueue(sqlite, FakeProcessor(sqlite, chroma), backoff_base=60.0)
+    queue.session_id = session_id
+    return queue
+
+
+def _queue_rows(sqlite: SQLiteStore) -> list[tuple]:
+    conn = sqlite3.connect(sqlite.db_path)
+    try:
+        return conn.execute(
+            "SELECT id, status, attempts, memory_id FROM ingest_queue ORDER BY id"
+        ).fetchall()
+    finally:
+        conn.close()
+
+
+async def test_processed_items_are_removed(queue, sqlite, chroma):
+    ids = [
+        await queue.enqueue(queue.session_id, "user", "hello"),
+        await queue.enqueue(queue.session_id, "user", "noise"),
+    ]
+    await queue.drain(ids)
+    assert _queue_rows(sqlite) == []
+    assert len(chroma.embedded) == 1
+    assert (await sqlite.get_memory(chroma.embedded[0])).content == "hello"
+
+
+async def test_embed_failure_retries_only_the_embed(queue, sqlite, chroma):
+    chroma.failures = 1
+    ingest_id = await queue.enqueue(queue.session_id, "user", "hello")
+    before = time.time()
+    await queue.drain([ingest_id])
+
+    [(_, status, attempts, memory_id)] = _queue_rows(sqlite)
+    assert (status, attempts) == ("stored", 1)
+    assert memory_id is not None and chroma.embedded == []
+    # Backed off, so drain doesn't wait for it
+    assert await sqlite.count_active_ingest([ingest_id]) == 0
+    conn = sqlite3.connect(sqlite.db_path)
+    [next_attempt_at] = conn.execute("SELECT next_attempt_at FROM ingest_queue").fetchone()
+    conn.close()
+    assert next_attempt_at >= before + 60
+
+    await sqlite._db.execute("UPDATE ingest_queue SET next_attempt_at = 0")
+    await sqlite._db.commit()
+    await queue.drain([ingest_id])
+    assert chroma.embedded == [memory_id]
+    assert queue.processor.prepared == ["hello"]
+    assert _queue_rows(sqlite) == []
+
+
+async def test_item_fails_after_max_attempts(queue, sqlite, chroma):
+    queue.max_attempts = 1
+    chroma.failures = 1
+    ingest_id = await queue.enqueue(queue.session_id, "user", "hello")
+    await queue.drain([ingest_id])
+    [(_, status, attempts, _)] = _queue_rows(sqlite)
+    assert (status, attempts) == ("failed", 1)
+
+
+async def test_crash_recovery_resumes_at_the_right_stage(queue, sqlite, chroma):
+    new_id = await queue.enqueue(queue.session_id, "user", "fresh")
+    stored_id = await queue.enqueue(queue.session_id, "user", "stored")
+    memory_id = await sqlite.create_memory(
+        Memory(session_id=queue.session_id, role="user", content="stored")
+    )
+    # Both claimed, one got as far as storing its memory, then the process died
+    await sqlite.claim_ingest(10)
+    await sqlite.set_ingest_memories({stored_id: memory_id})
+
+    assert await sqlite.requeue_in_flight_ingest() == 2
+    assert [row[1] for row in _queue_rows(sqlite)] == ["pending", "stored"]
+
+    await queue.drain([new_id, stored_id])
+    assert queue.processor.prepared == ["fresh"]
+    assert memory_id in chroma.embedded and len(chroma.embedded) == 2
+    assert _queue_rows(sqlite) == []
+
+
+async def test_drain_only_waits_for_the_given_items(queue, sqlite, chroma):
+    mine = await queue.enqueue(queue.session_id, "user", "mine")
+    other = await queue.enqueue(queue.session_id, "user", "other")
+    await queue.drain([mine])
+    assert queue.processor.prepared == ["mine"]
+    assert [row[0] for row in _queue_rows(sqlite)] == [other]
@@ -0,0 +1,86 @@
+"""Tests for LLMJobQueue ordering, aging, deadlines and cancellation."""
+
+import asyncio
+
+import pytest
+
+from blipshell.llm.endpoints import EndpointManager
+from blipshell.llm.job_queue import (
+    PRIORITY_BACKGROUND,
+    PRIORITY_INTERACTIVE,
+    JobExpiredError,
+    LLMJobQueue,
+)
+from blipshell.models.config import EndpointConfig
+
+
+@pytest.fixture
+async def queue():
+    manager = EndpointManager([EndpointConfig(name="chat", roles=["reasoning"], max_concurrent=1)])
+    queue = LLMJobQueue(manager, ["reasoning"], aging_rate=0.0)
+    yield queue
+    await queue.stop()
+
+
+def _recorder(order: list[str], name: str):
+    async def job():
+        order.append(name)
+        return name
+    return job
+
+
+async def test_jobs_run_by_priority_then_fifo(queue):
+    order: list[str] = []
+    futures = [
+        queue.enqueue_fire_and_forget(_recorder(order, "bg"), PRIORITY_BACKGROUND),
+        queue.enqueue_fire_and_forget(_recorder(order, "a"), PRIORITY_INTERACTIVE),
+        queue.enqueue_fire_and_forget(_recorder(order, "b"), PRIORITY_INTERACTIVE),
+    ]
+    queue.start()
+    await asyncio.gather(*futures)
+    assert order == ["a", "b", "bg"]
+    assert queue.get_metrics()["interactive"] == {"pending": 0, "completed": 2}
+
+
+async def test_old_background_job_ages_ahead_of_new_interactive_one(queue):
+    queue.aging_rate = 1000.0
+    order: list[str] = []
+    background = queue.enqueue_fire_and_forget(_recorder(order, "bg"), PRIORITY_BACKGROUND)
+    await asyncio.sleep(0.1)  # 100 aged priority points, more than the 50 gap
+    interactive = queue.enqueue_fire_and_forget(_recorder(order, "ui"), PRIORITY_INTERACTIVE)
+    queue.start()
+    await asyncio.gather(background, interactive)
+    assert order == ["bg", "ui"]
+
+
+async def test_expired_job_is_not_run(queue):
+    order: list[str] = []
+    future = queue.enqueue_fire_and_forget(_recorder(order, "late"), expires_in=0.01)
+    await asyncio.sleep(0.05)
+    queue.start()
+    with pytest.raises(JobExpiredError):
+        await future
+    assert order == []
+    assert queue.get_metrics()["background"]["expired"] == 1
+
+
+async def test_cancelling_a_running_job_aborts_it(queue):
+    started = asyncio.Event()
+    finished = False
+
+    async def slow():
+        nonlocal finished
+        started.set()
+        await asyncio.sleep(10)
+        finished = True
+
+    queue.start()
+    future = queue.enqueue_fire_and_forget(slow)
+    await started.wait()
+    future.cancel()
+    # The worker moves on to the next job instead of finishing the slow one
+    assert await asyncio.wait_for(
+        queue.enqueue_and_wait(_recorder([], "next")), 1
+    ) == "next"
+    assert not finished
+    assert queue.get_metrics()["background"]["cancelled"] == 1
@@ -0,0 +1,65 @@
+"""Tests for the indexed token-budget Pool."""
+
+import random
+from datetime import datetime, timedelta
+
+from blipshell.memory.manager import Pool, PoolItem
+
+T0 = datetime(2024, 1, 1)
+
+
+def _item(text: str, priority: float = 0.5, age: int = 0, tokens: int = 10) -> PoolItem:
+    return PoolItem(
+        text=text, estimated_tokens=tokens, priority_score=priority,
+        timestamp=T0 + timedelta(seconds=age),
+    )
+
+
+def test_top_entries_by_priority_with_ties_in_insertion_order():
+    pool = Pool("p", max_tokens=100)
+    for item in [_item("a", 0.5), _item("b", 0.9), _item("c", 0.5), _item("d", 0.1)]:
+        pool.add(item)
+    assert [i.text for i in pool.get_top_entries(30)] == ["b", "a", "c"]
+
+
+def test_duplicate_text_is_ignored():
+    pool = Pool("p", max_tokens=100)
+    pool.add(_item("a", tokens=10))
+    pool.add(_item("a", tokens=50))
+    assert (pool.item_count, pool.used_tokens) == (1, 10)
+
+
+def test_remove_takes_out_exactly_the_given_item():
+    pool = Pool("p", max_tokens=100)
+    same = [_item(text) for text in "abc"]  # identical priority and timestamp
+    for item in same:
+        pool.add(item)
+    pool.remove_items([same[1], _item("a")])  # a lookalike of "a" is not in the pool
+
+    assert [i.text for i in pool.get_oldest_items(10)] == ["a", "c"]
+    assert [i.text for i in pool.get_top_entries(100)] == ["a", "c"]
+    assert pool.used_tokens == 20
+
+
+def test_indexes_match_a_naive_model_under_random_operations():
+    rng = random.Random(3)
+    pool = Pool("p", max_tokens=10_000)
+    model: list[PoolItem] = []
+    for step in range(500):
+        if model and rng.random() < 0.4:
+            victims = rng.sample(model, rng.randint(1, min(3, len(model))))
+            pool.remove_items(victims)
+            model = [i for i in model if i not in victims]
+        else:
+            item = _item(
+                f"t{rng.randint(0, 300)}", priority=rng.choice([0.1, 0.5, 0.9]),
+                age=rng.randint(0, 20), tokens=rng.randint(1, 50),
+            )
+            if all(i.text != item.text for i in model):
+                model.append(item)
+            pool.add(item)
+
+        assert pool.used_tokens == sum(i.estimated_tokens for i in model)
+        by_priority = sorted(model, key=lambda i: -i.priority_score)
+        assert pool.get_top_entries(10_000) == by_priority[:len(pool.get_top_entries(10_000))]
+        assert pool.get_oldest_items(5) == sorted(model, key=lambda i: i.timestamp)[:5]
@@ -0,0 +1,78 @@
+"""Tests for the two-tier ResponseCache."""
+
+import pytest
+
+from blipshell.llm import response_cache
+from blipshell.llm.response_cache import ResponseCache
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(response_cache.time, "time", clock)
+    return clock
+
+
+@pytest.fixture
+def cache(tmp_path):
+    cache = ResponseCache(str(tmp_path / "responses.db"))
+    cache.initialize()
+    yield cache
+    cache.close()
+
+
+async def test_entries_expire_after_their_ttl(cache, clock):
+    await cache.put("short", "a", ttl=10)
+    await cache.put("forever", "b")
+    clock.now += 5
+    assert await cache.get("short") == "a"
+
+    clock.now += 10
+    assert await cache.get("short") is None
+    assert await cache.get("forever") == "b"
+    assert cache.get_stats()["disk_bytes"] == ResponseCache._size("forever", "b")
+
+
+async def test_disk_tier_serves_after_memory_eviction(cache):
+    cache.memory_max_bytes = ResponseCache._size("k1", "x" * 10)
+    await cache.put("k1", "x" * 10)
+    await cache.put("k2", "y" * 10)
+    assert list(cache._memory) == ["k2"]
+
+    assert await cache.get("k1") == "x" * 10
+    stats = cache.get_stats()
+    assert (stats["disk_hits"], stats["memory_entries"]) == (1, 1)
+
+
+async def test_memory_tier_evicts_least_recently_used():
+    entry = ResponseCache._size("k1", "x" * 10)
+    cache = ResponseCache(memory_max_bytes=2 * entry)
+    await cache.put("k1", "x" * 10)
+    await cache.put("k2", "x" * 10)
+    assert await cache.get("k1") is not None
+    await cache.put("k3", "x" * 10)
+
+    assert await cache.get("k2") is None
+    assert await cache.get("k1") is not None
+    assert cache.get_stats()["memory_bytes"] == 2 * entry
+
+
+async def test_disk_tier_stays_within_its_byte_bound(cache, clock):
+    entry = ResponseCache._size("k1", "x" * 10)
+    cache.disk_max_bytes = 2 * entry
+    cache.memory_max_bytes = 0
+    for key in ("k1", "k2", "k3"):
+        clock.now += 1
+        await cache.put(key, "x" * 10)
+
+    assert cache.get_stats()["disk_bytes"] == 2 * entry
+    assert await cache.get("k1") is None
+    assert await cache.get("k3") is not None
@@ -0,0 +1,117 @@
+"""Tests for SQLiteStore."""
+
+import asyncio
+import sqlite3
+
+import pytest
+
+from blipshell.memory.sqlite_store import SQLiteStore
+from blipshell.models.memory import Memory
+
+
+@pytest.fixture
+async def store(tmp_path):
+    sqlite = SQLiteStore(str(tmp_path / "test.db"), read_pool_size=2)
+    await sqlite.initialize()
+    yield sqlite
+    await sqlite.close()
+
+
+def _count_rows(store: SQLiteStore, table: str) -> int:
+    """Count rows through a fresh connection, i.e. only committed data."""
+    conn = sqlite3.connect(store.db_path)
+    try:
+        return conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+    finally:
+        conn.close()
+
+
+async def test_transaction_commits_once_at_exit(store):
+    async with store.transaction():
+        await store.create_memory(Memory(role="user", content="a"))
+        await store.create_memory(Memory(role="user", content="b"))
+        assert _count_rows(store, "memories") == 0
+    assert _count_rows(store, "memories") == 2
+
+
+async def test_transaction_rolls_back_on_error(store):
+    with pytest.raises(RuntimeError):
+        async with store.transaction():
+            await store.create_memory(Memory(role="user", content="a"))
+            raise RuntimeError
+    assert _count_rows(store, "memories") == 0
+
+
+async def test_nested_transactions_join_the_outer_one(store):
+    with pytest.raises(RuntimeError):
+        async with store.transaction():
+            async with store.transaction():
+                await store.create_memory(Memory(role="user", content="a"))
+            raise RuntimeError
+    assert _count_rows(store, "memories") == 0
+
+
+async def test_reads_inside_transaction_see_uncommitted_rows(store):
+    async with store.transaction():
+        memory_id = await store.create_memory(Memory(role="user", content="a"))
+        assert (await store.get_memory(memory_id)).content == "a"
+
+
+async def test_task_spawned_in_transaction_writes_after_it(store):
+    async with store.transaction():
+        task = asyncio.create_task(store.create_memory(Memory(role="user", content="a")))
+        await asyncio.sleep(0)
+        # The spawned task is not part of the block, so it waits for the lock
+        assert not task.done()
+    await task
+    assert _count_rows(store, "memories") == 1
+
+
+async def test_readers_are_read_only(store):
+    assert len(store._readers) == 2
+    async with store._read() as reader:
+        assert reader is not store._db
+        with pytest.raises(sqlite3.OperationalError):
+            await reader.execute("INSERT INTO projects (name) VALUES ('x')")
+
+
+async def test_readers_see_committed_writes(store):
+    memory_id = await store.create_memory(Memory(role="user", content="a"))
+    assert (await store.get_memory(memory_id)).content == "a"
+
+
+async def test_tag_cache_forgets_tags_created_in_a_rolled_back_transaction(store):
+    with pytest.raises(RuntimeError):
+        async with store.transaction():
+            await store.create_or_get_tag("ghost")
+            raise RuntimeError
+    assert ("ghost", "topic") not in store._tag_ids
+
+    memory_id = await store.create_memory(Memory(role="user", content="a"))
+    await store.tag_memory(memory_id, ["ghost"])
+    assert await store.get_memory_tags(memory_id) == ["ghost"]
+
+
+async def test_tags_created_by_another_connection_are_reused(store):
+    conn = sqlite3.connect(store.db_path)
+    external_id = conn.execute(
+        "INSERT INTO tags (name, category) VALUES ('shared', 'topic') RETURNING id"
+    ).fetchone()[0]
+    conn.commit()
+    conn.close()
+
+    assert await store.create_or_get_tag("shared") == external_id
+    assert _count_rows(store, "tags") == 1
+
+
+async def test_tag_memories_links_many_memories_at_once(store):
+    first = await store.create_memory(Memory(role="user", content="a"))
+    second = await store.create_memory(Memory(role="user", content="b"))
+    await store.tag_memories([(first, ["x", "y", "x"]), (second, ["y"])])
+
+    assert sorted(await store.get_memory_tags(first)) == ["x", "y"]
+    assert await store.get_memory_tags(second) == ["y"]
+    assert _count_rows(store, "tags") == 2
+
+    await store.replace_memory_tags({first: ["z"]})
+    assert await store.get_memory_tags(first) == ["z"]
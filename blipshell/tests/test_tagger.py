@@ -0,0 +1,102 @@
+"""Tests for the tagger against a pattern-by-pattern reference."""
+
+import random
+import re
+from concurrent.futures import ThreadPoolExecutor
+
+from blipshell.memory.tagger import (
+    BACKGROUND_TRIGGER_PATTERNS,
+    BEHAVIOR_PATTERNS,
+    TOPIC_PATTERNS,
+    scan_message,
+    tag_message,
+    tag_messages,
+)
+
+
+def _reference(message: str) -> tuple[list[str], list[str], list[str]]:
+    """The original tagger: every pattern and trigger searched on its own."""
+    topics = [
+        tag for tag, patterns in TOPIC_PATTERNS.items()
+        if any(re.search(p, message, re.IGNORECASE) for p in patterns)
+    ]
+    lowered = message.lower()
+    scores: dict[str, int] = {}
+    for tag, (strong, soft) in BEHAVIOR_PATTERNS.items():
+        for trigger in strong:
+            if trigger.lower() in lowered:
+                scores[tag] = scores.get(tag, 0) + 2
+        for trigger in soft:
+            if re.search(rf"\b{re.escape(trigger)}\b", message, re.IGNORECASE):
+                scores[tag] = scores.get(tag, 0) + 1
+    behavior = list(scores) or ["neutral"]
+    background = [
+        tag for tag, phrases in BACKGROUND_TRIGGER_PATTERNS.items()
+        if any(phrase in lowered for phrase in phrases)
+    ]
+    return topics, behavior, background
+
+
+def _corpus(count: int = 300) -> list[str]:
+    """Messages stitched from trigger phrases, including overlapping ones."""
+    rng = random.Random(7)
+    phrases = [
+        "asp.net razor pages", "sqlite", "SELECT * FROM memories", "we should look into",
+        "lesson here", "note to self", "i am", "self-reflection", "to-do", "```",
+        "javascript", "node.js", "identity framework", "I feel", "Who I am",
+        "off-track", "core memory", "cloudflare quick tunnel", "fine-tuning",
+        "the log", "logging", "performance", "hello", "there", "design doc",
+    ]
+    words = phrases + ["and", "the", "a", ",", ".", "selfish", "sqlites", "razors"]
+    return [
+        " ".join(rng.choice(words) for _ in range(rng.randint(0, 12)))
+        for _ in range(count)
+    ] + ["", "nothing to see", "WE SHOULD LOOK INTO SQLITE", "we shoulder it"]
+
+
+def test_scan_matches_the_reference():
+    for message in _corpus():
+        assert tuple(scan_message(message)) == _reference(message), message
+
+
+def test_every_trigger_is_found_on_its_own():
+    for patterns in TOPIC_PATTERNS.values():
+        for pattern in patterns:
+            literal = pattern.replace("\\b", "").replace("\\", "")
+            if re.fullmatch(r"[\w .#+-]+", literal):
+                assert tuple(scan_message(literal)) == _reference(literal)
+    for strong, soft in BEHAVIOR_PATTERNS.values():
+        for trigger in strong + soft:
+            assert tuple(scan_message(trigger)) == _reference(trigger)
+    for phrases in BACKGROUND_TRIGGER_PATTERNS.values():
+        for phrase in phrases:
+            assert tuple(scan_message(phrase)) == _reference(phrase)
+
+
+def test_overlapping_triggers_are_all_found():
+    # "sql"/"sqlite" and "we should"/"we should look into" share a start
+    scan = scan_message("we should look into sqlite")
+    assert {"sql", "sqlite"} <= set(scan.topics)
+    assert scan.background == ["research-idea", "task-candidate"]
+
+
+def test_tag_messages_matches_tag_message_in_order():
+    messages = _corpus(50)
+    with ThreadPoolExecutor(max_workers=2) as pool:
+        tags = list(tag_messages(messages, chunk_size=7, executor=pool, workers=2))
+    assert tags == [tag_message(m) for m in messages]
+
+
+def test_tag_messages_bounds_in_flight_chunks_by_workers():
+    submitted: list[int] = []
+
+    class CountingPool(ThreadPoolExecutor):
+        def submit(self, fn, *args):
+            submitted.append(len(args[0]))
+            return super().submit(fn, *args)
+
+    with CountingPool(max_workers=1) as pool:
+        results = tag_messages(iter(["x"] * 100), chunk_size=10, executor=pool, workers=1)
+        next(results)
+        assert len(submitted) == 2
+        results.close()
@@ -0,0 +1,76 @@
+"""Tests for TokenCounter encoding choice, caching and offline fallback."""
+
+import os
+import threading
+import time
+
+import pytest
+import tiktoken
+
+from blipshell.memory.tokens import APPROXIMATE, TokenCounter, encoding_for_model
+
+
+class FakeEncoding:
+    """One token per word; counts encode() calls."""
+
+    def __init__(self):
+        self.calls = 0
+
+    def encode(self, text, disallowed_special=()):
+        self.calls += 1
+        return text.split()
+
+
+@pytest.fixture
+def fake_encoding(monkeypatch):
+    encoding = FakeEncoding()
+    monkeypatch.setattr(tiktoken, "get_encoding", lambda name: encoding)
+    return encoding
+
+
+def test_encoding_follows_the_model_family():
+    assert encoding_for_model("llama3.1:8b") == "cl100k_base"
+    assert encoding_for_model("library/qwen3:14b") == "cl100k_base"
+    assert encoding_for_model("gemma2") == "o200k_base"
+    assert encoding_for_model("unknown-model") == APPROXIMATE
+    assert encoding_for_model("llama3", {"llama": "approx"}) == APPROXIMATE
+
+
+def test_counts_are_cached_by_text(fake_encoding):
+    counter = TokenCounter("cl100k_base", cache_size=1)
+    assert counter.count("one two three") == 3
+    assert counter.count("one two three") == 3
+    assert fake_encoding.calls == 1
+
+    counter.count("other")
+    counter.count("one two three")  # evicted by "other"
+    assert fake_encoding.calls == 3
+
+
+def test_unavailable_encoding_falls_back_to_approximation(monkeypatch):
+    def offline(name):
+        raise ConnectionError("no network")
+
+    monkeypatch.setattr(tiktoken, "get_encoding", offline)
+    counter = TokenCounter("cl100k_base")
+    assert counter.count("x" * 40) == 10
+    assert not counter.exact
+
+
+def test_slow_load_gives_up_after_the_timeout(monkeypatch):
+    release = threading.Event()
+    monkeypatch.setattr(tiktoken, "get_encoding", lambda name: release.wait(5) and FakeEncoding())
+    counter = TokenCounter("cl100k_base", load_timeout=0.05)
+
+    start = time.monotonic()
+    assert counter.count("x" * 40) == 10
+    assert time.monotonic() - start < 1
+    release.set()
+    # A late result doesn't switch counting modes mid-session
+    assert not counter.exact
+
+
+def test_cache_dir_is_passed_to_tiktoken(monkeypatch, tmp_path, fake_encoding):
+    monkeypatch.delenv("TIKTOKEN_CACHE_DIR", raising=False)
+    TokenCounter("cl100k_base", cache_dir=str(tmp_path)).load()
+    assert os.environ["TIKTOKEN_CACHE_DIR"] == str(tmp_path)
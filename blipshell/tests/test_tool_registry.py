@@ -0,0 +1,104 @@
+"""Tests for ToolRegistry scheduling and the tool result cache."""
+
+import asyncio
+import os
+
+from blipshell.core.tools.base import Tool, ToolError, ToolRegistry
+from blipshell.core.tools.filesystem import ReadFileTool
+from blipshell.models.tools import ToolCall, ToolDefinition
+
+
+class RecordingTool(Tool):
+    """Logs start/end of each call; yields in between so calls can overlap."""
+
+    def __init__(self, name: str, log: list[str], side_effects: bool = False):
+        self.name = name
+        self.log = log
+        self.side_effects = side_effects
+
+    def definition(self) -> ToolDefinition:
+        return ToolDefinition(name=self.name, description=self.name)
+
+    async def execute(self, tag: str = "", **kwargs) -> str:
+        self.log.append(f"start {tag}")
+        await asyncio.sleep(0.01)
+        self.log.append(f"end {tag}")
+        return tag
+
+
+class FlakyTool(Tool):
+    cache_ttl = 60.0
+
+    def __init__(self):
+        self.calls = 0
+
+    def definition(self) -> ToolDefinition:
+        return ToolDefinition(name="flaky", description="flaky")
+
+    async def execute(self, **kwargs) -> str:
+        self.calls += 1
+        if self.calls == 1:
+            raise ToolError("Error: not yet")
+        return "error-free result mentioning error"
+
+
+async def test_side_effect_call_is_a_barrier():
+    log: list[str] = []
+    registry = ToolRegistry()
+    registry.register(RecordingTool("read", log))
+    registry.register(RecordingTool("write", log, side_effects=True))
+
+    results = await registry.execute_tool_calls([
+        ToolCall(name="read", arguments={"tag": "r1"}),
+        ToolCall(name="read", arguments={"tag": "r2"}),
+        ToolCall(name="write", arguments={"tag": "w"}),
+        ToolCall(name="read", arguments={"tag": "r3"}),
+    ])
+
+    assert [r.result for r in results] == ["r1", "r2", "w", "r3"]
+    # r1 and r2 overlap; w runs alone between them and r3
+    assert log == ["start r1", "start r2", "end r1", "end r2",
+                   "start w", "end w", "start r3", "end r3"]
+
+
+async def test_failures_are_reported_and_not_cached():
+    registry = ToolRegistry()
+    tool = FlakyTool()
+    registry.register(tool)
+
+    failed = await registry.execute_tool_call(ToolCall(name="flaky"))
+    assert (failed.success, failed.result) == (False, "Error: not yet")
+
+    ok = await registry.execute_tool_call(ToolCall(name="flaky"))
+    again = await registry.execute_tool_call(ToolCall(name="flaky"))
+    assert ok.success and not ok.cached
+    # Cached on success, whatever the text says
+    assert again.cached and again.result == ok.result
+    assert tool.calls == 2
+
+
+async def test_cached_read_is_invalidated_when_the_file_changes(tmp_path):
+    path = tmp_path / "notes.txt"
+    path.write_text("v1")
+    registry = ToolRegistry()
+    registry.register(ReadFileTool())
+    call = ToolCall(name="read_file", arguments={"path": str(path)})
+
+    assert (await registry.execute_tool_call(call)).result == "v1"
+    assert (await registry.execute_tool_call(call)).cached
+
+    path.write_text("v2")
+    stat = path.stat()
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+    result = await registry.execute_tool_call(call)
+    assert (result.result, result.cached) == ("v2", False)
+
+
+async def test_missing_file_is_a_failure(tmp_path):
+    registry = ToolRegistry()
+    registry.register(ReadFileTool())
+    result = await registry.execute_tool_call(
+        ToolCall(name="read_file", arguments={"path": str(tmp_path / "nope")})
+    )
+    assert not result.success and result.result.startswith("Error: File")
+    assert registry.get_cache_stats()["entries"] == 0
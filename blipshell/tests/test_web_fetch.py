@@ -0,0 +1,82 @@
+"""Tests for WebFetchTool conditional requests and truncation."""
+
+import httpx
+import pytest
+
+from blipshell.core.tools.base import ToolError
+from blipshell.core.tools.fetch_cache import FetchCache
+from blipshell.core.tools.web import WebFetchTool
+
+URL = "https://example.com/page"
+
+
+@pytest.fixture
+def cache(tmp_path):
+    cache = FetchCache(str(tmp_path / "fetch.db"))
+    cache.initialize()
+    yield cache
+    cache.close()
+
+
+def _tool(handler, cache=None, **kwargs) -> WebFetchTool:
+    client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    return WebFetchTool(client=client, cache=cache, **kwargs)
+
+
+async def test_not_modified_reuses_the_cached_page(cache):
+    requests: list[httpx.Request] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(request)
+        if request.headers.get("if-none-match") == '"v1"':
+            return httpx.Response(304)
+        return httpx.Response(
+            200, content=b"<p>hello</p>",
+            headers={"content-type": "text/html", "etag": '"v1"'},
+        )
+
+    tool = _tool(handler, cache)
+    assert await tool.execute(URL) == "hello"
+    assert await tool.execute(URL) == "hello"
+    assert "if-none-match" not in requests[0].headers
+    assert requests[1].headers["if-none-match"] == '"v1"'
+
+
+async def test_changed_page_replaces_the_cached_one(cache):
+    versions = iter([(b"one", '"v1"'), (b"two", '"v2"')])
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        body, etag = next(versions)
+        return httpx.Response(200, content=body, headers={"etag": etag})
+
+    tool = _tool(handler, cache)
+    assert await tool.execute(URL) == "one"
+    assert await tool.execute(URL) == "two"
+    assert cache.get(URL)["etag"] == '"v2"'
+
+
+async def test_body_is_truncated_at_max_size():
+    tool = _tool(lambda request: httpx.Response(200, content=b"x" * 100), max_size=10)
+    assert await tool.execute(URL) == "x" * 10 + "\n\n[Content truncated]"
+
+
+async def test_http_errors_are_tool_failures():
+    tool = _tool(lambda request: httpx.Response(500))
+    with pytest.raises(ToolError, match="Fetch error"):
+        await tool.execute(URL)
+
+
+async def test_standalone_tool_closes_its_per_call_client(monkeypatch):
+    clients: list[httpx.AsyncClient] = []
+
+    def create_client(timeout):
+        transport = httpx.MockTransport(lambda request: httpx.Response(200, content=b"hi"))
+        clients.append(httpx.AsyncClient(transport=transport))
+        return clients[-1]
+
+    monkeypatch.setattr("blipshell.core.tools.web.create_http_client", create_client)
+    tool = WebFetchTool()
+    assert await tool.execute(URL) == "hi"
+    assert await tool.execute(URL) == "hi"
+    assert tool.client is None
+    assert len(clients) == 2 and all(c.is_closed for c in clients)